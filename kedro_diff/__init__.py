@@ -17,4 +17,17 @@ __license__ = "MIT"
 
 __all__ = ["KedroDiff"]
 
-from kedro_diff.diff import KedroDiff
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from kedro_diff.diff import KedroDiff
+
+
+def __getattr__(name: str) -> Any:
+    # kedro imports kedro_diff.cli for every command, KedroDiff is only
+    # imported once it is used
+    if name == "KedroDiff":
+        from kedro_diff.diff import KedroDiff
+
+        return KedroDiff
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,407 @@
+"""Binary Snapshot.
+
+A compact, memory mapped alternative to the json snapshot format.  Every
+string is stored once in a string table, node attributes are stored as
+columns of string ids and each pipeline as an array of node ids.  Scalar
+columns hold one string id per node, MISSING when a node has no such
+attribute, list columns hold node_count + 1 offsets followed by the values.  A json
+index at the start of the file holds the offset of every section, so loading
+a snapshot only decodes the pipelines, nodes and columns that are accessed.
+
+    MAGIC | index length (uint32) | index (json) | sections ...
+
+Each section may be compressed with zlib on its own, a compressed section is
+decompressed the first time it is accessed.
+
+The node hashes of `kedro_diff.fingerprint` are stored as raw digests in a
+section of their own, the pipeline and namespace hashes in the index.  The
+catalog entries and the parameters are json sections, each decoded the first
+time it is read.
+"""
+import json
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+from kedro_diff.model import (
+    LIST_FIELDS,
+    NODE_FIELDS,
+    SCALAR_FIELDS,
+    NodeRecord,
+    StringTable,
+)
+
+MAGIC = b"KDSNAP1\n"
+COLUMNS = NODE_FIELDS
+SCALAR_COLUMNS = SCALAR_FIELDS
+LIST_COLUMNS = LIST_FIELDS
+MISSING = 0xFFFFFFFF
+COMPRESSIONS = (None, "zlib")
+
+# parts of a snapshot that are stored as json
+JSON_SECTIONS = ("catalog", "parameters")
+
+# typecode of a 4 byte unsigned int, all sections are little endian uint32s
+UINT32 = "I" if array("I").itemsize == 4 else "L"
+
+
+def _uint32s(values: Sequence[int]) -> bytes:
+    arr = array(UINT32, values)
+    if sys.byteorder == "big":  # pragma: no cover
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _read_uint32s(data: Union[bytes, memoryview]) -> Sequence[int]:
+    if sys.byteorder == "big":  # pragma: no cover
+        arr = array(UINT32, bytes(data))
+        arr.byteswap()
+        return arr
+    values: Sequence[int] = memoryview(data).cast(UINT32)  # type: ignore
+    return values
+
+
+def dumps(snapshot: Mapping, compression: Optional[str] = None) -> bytes:
+    """
+    Encode a normalized snapshot.
+
+    Parameters
+    --------
+        snapshot : dict
+            normalized snapshot, see `kedro_diff.snapshot.normalize`
+        compression : str
+            one of COMPRESSIONS
+
+    Returns
+    --------
+        bytes
+            the encoded snapshot
+
+    """
+    if compression not in COMPRESSIONS:
+        raise ValueError(f"compression must be one of {COMPRESSIONS}")
+
+    strings: Dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if value not in strings:
+            strings[value] = len(strings)
+        return strings[value]
+
+    nodes = snapshot["nodes"]
+    sections: Dict[str, bytes] = {}
+    for column in SCALAR_COLUMNS:
+        sections[f"column:{column}"] = _uint32s(
+            [
+                MISSING if node.get(column) is None else intern(node[column])
+                for node in nodes
+            ]
+        )
+    for column in LIST_COLUMNS:
+        offsets = [0]
+        values: List[int] = []
+        for node in nodes:
+            values.extend(intern(value) for value in node.get(column) or [])
+            offsets.append(len(values))
+        sections[f"column:{column}"] = _uint32s(offsets) + _uint32s(values)
+    for pipeline_name, node_ids in snapshot["pipelines"].items():
+        sections[f"pipeline:{pipeline_name}"] = _uint32s(node_ids)
+    hashes = snapshot.get("hashes")
+    if hashes is not None:
+        sections["hashes"] = bytes.fromhex("".join(hashes["nodes"]))
+    for name in JSON_SECTIONS:
+        if name in snapshot:
+            sections[name] = json.dumps(snapshot[name]).encode("utf-8")
+
+    encoded = [value.encode("utf-8") for value in strings]
+    string_offsets = [0]
+    for value in encoded:
+        string_offsets.append(string_offsets[-1] + len(value))
+    sections["strings"] = _uint32s(string_offsets) + b"".join(encoded)
+
+    index: Dict[str, Any] = {
+        "kedro_version": snapshot["kedro_version"],
+        "compression": compression,
+        "node_count": len(nodes),
+        "string_count": len(strings),
+        "pipelines": list(snapshot["pipelines"]),
+        "sections": {},
+    }
+    if hashes is not None:
+        index["hashes"] = {
+            "pipelines": hashes["pipelines"],
+            "namespaces": hashes["namespaces"],
+        }
+    body = []
+    offset = 0
+    for name, data in sections.items():
+        if compression == "zlib":
+            data = zlib.compress(data)
+        index["sections"][name] = [offset, len(data)]
+        body.append(data)
+        offset += len(data)
+    header = json.dumps(index).encode("utf-8")
+    return b"".join([MAGIC, struct.pack("<I", len(header)), header, *body])
+
+
+def write(
+    snapshot: Mapping, path: Union[str, Path], compression: Optional[str] = None
+) -> Path:
+    """Write a normalized snapshot to path in the binary format."""
+    path = Path(path)
+    path.write_bytes(dumps(snapshot, compression=compression))
+    return path
+
+
+class _Pipelines(Mapping):
+    """Node ids of each pipeline, decoded on access."""
+
+    def __init__(self, snapshot: "BinarySnapshot") -> None:
+        self._snapshot = snapshot
+
+    def __getitem__(self, pipeline_name: str) -> Sequence[int]:
+        return _read_uint32s(self._snapshot.section(f"pipeline:{pipeline_name}"))
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._snapshot.index["pipelines"])
+
+    def __len__(self) -> int:
+        return len(self._snapshot.index["pipelines"])
+
+
+class _Nodes(Sequence):
+    """Node records, each node is decoded on first access."""
+
+    def __init__(self, snapshot: "BinarySnapshot") -> None:
+        self._snapshot = snapshot
+        self._cache: Dict[int, NodeRecord] = {}
+
+    def __len__(self) -> int:
+        return int(self._snapshot.index["node_count"])
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if i not in self._cache:
+            self._cache[i] = self._snapshot.node(i)
+        return self._cache[i]
+
+
+class _NodeHashes(Sequence):
+    """Hex hash of each node, sliced out of the hashes section on access."""
+
+    def __init__(self, snapshot: "BinarySnapshot") -> None:
+        self._snapshot = snapshot
+
+    def __len__(self) -> int:
+        return int(self._snapshot.index["node_count"])
+
+    def __getitem__(self, i: Any) -> Any:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        data = self._snapshot.section("hashes")
+        size = len(data) // len(self)
+        return bytes(data[i * size : (i + 1) * size]).hex()
+
+
+class _JsonSection(Mapping):
+    """A json section, decoded on first access."""
+
+    def __init__(self, snapshot: "BinarySnapshot", name: str) -> None:
+        self._snapshot = snapshot
+        self._name = name
+        self._entries: Optional[Dict[str, Any]] = None
+
+    @property
+    def entries(self) -> Dict[str, Any]:
+        if self._entries is None:
+            self._entries = json.loads(bytes(self._snapshot.section(self._name)))
+        return self._entries
+
+    def __getitem__(self, name: str) -> Any:
+        return self.entries[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class BinarySnapshot(Mapping):
+    """BinarySnapshot.
+
+    Read only, memory mapped view of a binary snapshot.  It behaves like a
+    normalized snapshot dict, so `kedro_diff.snapshot.denormalize` and
+    `KedroDiff.from_snapshots` can consume it directly.
+
+    Parameters
+    --------
+        path : str
+            binary snapshot file
+        columns : Tuple[str, ...]
+            node attributes to decode, defaults to every column
+        strings : StringTable
+            table the decoded strings are interned in, share it between
+            snapshots that are diffed together
+
+    Examples
+    --------
+        >>> snapshot = BinarySnapshot(".kedro-diff/<key>/snapshot.kds", columns=("name",))
+        >>> [node["name"] for node in denormalize(snapshot, "data_science")["pipeline"]]
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        columns: Tuple[str, ...] = COLUMNS,
+        strings: Optional[StringTable] = None,
+    ) -> None:
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"unknown columns {sorted(unknown)}")
+        self.path = Path(path)
+        self.columns = columns
+        self.strings = StringTable() if strings is None else strings
+        with open(str(self.path), "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a binary kedro-diff snapshot")
+        (header_length,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        self.index = json.loads(
+            self._mmap[header_start : header_start + header_length].decode("utf-8")
+        )
+        self._body_start = header_start + header_length
+        self._sections: Dict[str, Union[bytes, memoryview]] = {}
+        self._columns: Dict[str, Tuple[Sequence[int], Sequence[int]]] = {}
+        self._strings: Dict[int, str] = {}
+        self._values = {
+            "kedro_version": self.index["kedro_version"],
+            "nodes": _Nodes(self),
+            "pipelines": _Pipelines(self),
+        }
+        if "hashes" in self.index:
+            self._values["hashes"] = {
+                "nodes": _NodeHashes(self),
+                **self.index["hashes"],
+            }
+        for name in JSON_SECTIONS:
+            if name in self.index["sections"]:
+                self._values[name] = _JsonSection(self, name)
+
+    def section(self, name: str) -> Union[bytes, memoryview]:
+        """Raw bytes of a section, decompressed when needed."""
+        if name not in self._sections:
+            offset, length = self.index["sections"][name]
+            start = self._body_start + offset
+            if self.index["compression"] == "zlib":
+                self._sections[name] = zlib.decompress(
+                    self._mmap[start : start + length]
+                )
+            else:
+                self._sections[name] = memoryview(self._mmap)[start : start + length]
+        return self._sections[name]
+
+    def string(self, string_id: int) -> str:
+        """Decode a single string of the string table."""
+        if string_id not in self._strings:
+            offsets, blob = self._column("strings")
+            self._strings[string_id] = self.strings.intern(
+                bytes(blob[offsets[string_id] : offsets[string_id + 1]]).decode("utf-8")
+            )
+        return self._strings[string_id]
+
+    def _column(self, column: str) -> Tuple[Sequence[int], Sequence[int]]:
+        """
+        Offsets and values of a column, or of the string table.  A column
+        that is missing from the file, as func in files written before it was
+        extracted, has no values.
+        """
+        if column not in self._columns:
+            if column == "strings":
+                data = self.section("strings")
+                split = (self.index["string_count"] + 1) * 4
+                self._columns[column] = (_read_uint32s(data[:split]), data[split:])
+            elif f"column:{column}" not in self.index["sections"]:
+                self._columns[column] = ((), ())
+            elif column in SCALAR_COLUMNS:
+                data = self.section(f"column:{column}")
+                self._columns[column] = ((), _read_uint32s(data))
+            else:
+                data = self.section(f"column:{column}")
+                split = (self.index["node_count"] + 1) * 4
+                self._columns[column] = (
+                    _read_uint32s(data[:split]),
+                    _read_uint32s(data[split:]),
+                )
+        return self._columns[column]
+
+    def node(self, node_id: int) -> NodeRecord:
+        """Decode the requested columns of a single node."""
+        fields: Dict[str, Any] = {}
+        for column in self.columns:
+            offsets, values = self._column(column)
+            if column in SCALAR_COLUMNS:
+                if values and values[node_id] != MISSING:
+                    fields[column] = self.string(values[node_id])
+            elif offsets:
+                fields[column] = tuple(
+                    self.string(value)
+                    for value in values[offsets[node_id] : offsets[node_id + 1]]
+                )
+        return NodeRecord(**fields)
+
+    def to_dict(self) -> Dict:
+        """Decode the whole snapshot into a normalized snapshot dict."""
+        snapshot = {
+            "kedro_version": self["kedro_version"],
+            "nodes": [node.to_dict() for node in self["nodes"]],
+            "pipelines": {name: list(ids) for name, ids in self["pipelines"].items()},
+        }
+        if "hashes" in self:
+            snapshot["hashes"] = {
+                **self["hashes"],
+                "nodes": list(self["hashes"]["nodes"]),
+            }
+        for name in JSON_SECTIONS:
+            if name in self:
+                snapshot[name] = dict(self[name])
+        return snapshot
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self._columns.clear()
+        self._sections.clear()
+        try:
+            self._mmap.close()
+        except BufferError:  # pragma: no cover
+            # node ids handed out still point into the map, it is closed
+            # once they are garbage collected
+            pass
+
+    def __getitem__(self, key: str) -> Any:
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __enter__(self) -> "BinarySnapshot":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -0,0 +1,188 @@
+"""Bisection.
+
+Find the commit of a range that changed whether a node matches a predicate,
+such as "node exists" or "node has input X".  Only the commits that the
+binary search probes are extracted, so a range of n commits takes about
+log2(n) extractions, and probes that hit an already cached snapshot take
+none.  Commits whose extraction failed are skipped, never probed as if they
+had no nodes.
+"""
+from typing import (
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from kedro_diff.errors import KedroDiffError
+from kedro_diff.snapshot import denormalize
+
+
+class NodePredicate(NamedTuple):
+    """NodePredicate.
+
+    Checks a node of a snapshot, with no attributes given it only checks that
+    the node exists.
+
+    Parameters
+    --------
+        node : str
+            name of the node
+        inputs : Tuple[str, ...]
+            inputs the node must have
+        outputs : Tuple[str, ...]
+            outputs the node must have
+        tags : Tuple[str, ...]
+            tags the node must have
+        pipeline : str
+            only look for the node in this pipeline, defaults to every node of
+            the snapshot
+
+    Examples
+    --------
+        >>> from kedro_diff.snapshot import normalize
+        >>> snapshot = normalize({"__default__": [{"name": "split", "inputs": ["raw"]}]})
+        >>> NodePredicate("split", inputs=("raw",))(snapshot)
+        True
+        >>> NodePredicate("split", inputs=("clean",)).describe()
+        'node split has input clean'
+    """
+
+    node: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+    tags: Tuple[str, ...] = ()
+    pipeline: Optional[str] = None
+
+    def find(self, snapshot: Mapping) -> Optional[Dict]:
+        """The node dict of the snapshot, None when it does not exist."""
+        if self.pipeline is None:
+            nodes = snapshot["nodes"]
+        else:
+            nodes = denormalize(snapshot, self.pipeline)["pipeline"]
+        for node in nodes:
+            if node["name"] == self.node:
+                return dict(node)
+        return None
+
+    def __call__(self, snapshot: Mapping) -> bool:
+        node = self.find(snapshot)
+        if node is None:
+            return False
+        return (
+            set(self.inputs) <= set(node.get("inputs") or [])
+            and set(self.outputs) <= set(node.get("outputs") or [])
+            and set(self.tags) <= set(node.get("tags") or [])
+        )
+
+    def describe(self) -> str:
+        conditions = [
+            f"has {attr} {value}"
+            for attr, values in (
+                ("input", self.inputs),
+                ("output", self.outputs),
+                ("tag", self.tags),
+            )
+            for value in values
+        ]
+        description = f"node {self.node} " + (" and ".join(conditions) or "exists")
+        if self.pipeline is not None:
+            description += f" in pipeline {self.pipeline}"
+        return description
+
+
+def _nearest(middle: int, good: int, bad: int, skipped: Set[int]) -> Optional[int]:
+    """Untested index between good and bad closest to middle, as `git bisect skip`."""
+    for offset in range(bad - good):
+        for index in (middle - offset, middle + offset):
+            if good < index < bad and index not in skipped:
+                return index
+    return None
+
+
+def first_change(
+    commits: Sequence[str],
+    evaluate: Callable[[str], Optional[bool]],
+    prefetch: Optional[Callable[[List[str]], None]] = None,
+) -> Optional[int]:
+    """
+    Binary search for the first commit whose result differs from the first
+    commit.
+
+    The result is assumed to change only once along commits, as in
+    `git bisect`.  A commit that can not be evaluated is skipped, as
+    `git bisect skip` does, and the next probe is the closest commit to it.
+
+    Parameters
+    --------
+        commits : Sequence[str]
+            commits oldest first, the first one is the known good commit
+        evaluate : Callable[[str], Optional[bool]]
+            predicate of a single commit, None when the commit can not be
+            evaluated, called about log2(len(commits)) times
+        prefetch : Callable[[List[str]], None]
+            called with the commits that are about to be probed, the probe
+            and both commits that may be probed after it, so they can be
+            extracted concurrently
+
+    Returns
+    --------
+        int
+            index of the first changed commit, None when the first and last
+            commits agree
+
+    Raises
+    --------
+        KedroDiffError
+            when the first or the last commit can not be evaluated, or only
+            skipped commits are left between the last good and the first bad
+            commit
+
+    Examples
+    --------
+        >>> first_change(["a", "b", "c", "d"], lambda commit: commit >= "c")
+        2
+        >>> first_change(["a", "b", "c", "d"], lambda c: None if c == "b" else c >= "b")
+        Traceback (most recent call last):
+        ...
+        kedro_diff.errors.KedroDiffError: only skipped commits are left, the first change is one of b c
+    """
+    if len(commits) < 2:
+        return None
+    if prefetch is not None:
+        prefetch([commits[0], commits[-1]])
+    before = evaluate(commits[0])
+    after = evaluate(commits[-1])
+    for commit, result in ((commits[0], before), (commits[-1], after)):
+        if result is None:
+            raise KedroDiffError(f"{commit} can not be evaluated, nothing to bisect")
+    if after == before:
+        return None
+    # evaluate(commits[good]) == before, evaluate(commits[bad]) != before
+    good, bad = 0, len(commits) - 1
+    skipped: Set[int] = set()
+    while True:
+        mid = _nearest((good + bad) // 2, good, bad, skipped)
+        if mid is None:
+            break
+        if prefetch is not None:
+            prefetch([commits[i] for i in (mid, (good + mid) // 2, (mid + bad) // 2)])
+        result = evaluate(commits[mid])
+        if result is None:
+            skipped.add(mid)
+        elif result == before:
+            good = mid
+        else:
+            bad = mid
+    candidates = [commits[i] for i in sorted(skipped) if good < i < bad]
+    if candidates:
+        raise KedroDiffError(
+            "only skipped commits are left, the first change is one of "
+            + " ".join([*candidates, commits[bad]])
+        )
+    return bad
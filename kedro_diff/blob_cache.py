@@ -0,0 +1,122 @@
+"""Blob Cache.
+
+Values computed from the files of a project, cached under the git blob id of
+those files.  A blob id only depends on the content of a file, so a file that
+did not change between two commits is looked up instead of being read by kedro
+again, whichever checkout mode materialized it.
+
+    .kedro-diff/blobs/<SNAPSHOT_SCHEMA>/<namespace>/<key>.json
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence, Tuple, Union
+
+from kedro_diff.snapshot import SNAPSHOT_DIR, SNAPSHOT_SCHEMA
+
+if TYPE_CHECKING:
+    from kedro.framework.context import KedroContext
+
+BLOB_DIR = "blobs"
+
+
+def data_blob_id(data: bytes) -> str:
+    """Git blob id of the content of a file."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def blob_id(path: Union[str, Path]) -> str:
+    """Git blob id of a file, the id `git hash-object` prints for it."""
+    return data_blob_id(Path(path).read_bytes())
+
+
+def blobs_key(paths: Iterable[Path], root: Path, salt: str = "") -> str:
+    """
+    Key of a set of files, it changes when any file is added, removed, moved
+    or edited.  Paths are taken relative to root, salt is mixed into the key.
+    """
+    lines = sorted(
+        f"{Path(path).relative_to(root).as_posix()} {blob_id(path)}" for path in paths
+    )
+    return hashlib.sha1("\n".join([salt, *lines]).encode("utf-8")).hexdigest()
+
+
+def conf_root(context: "KedroContext") -> Path:
+    """
+    Conf directory of a loaded project, the conf_source of its config loader,
+    or the CONF_SOURCE (CONF_ROOT in kedro 0.17) setting of the project.
+    """
+    conf_source: Optional[str] = getattr(context.config_loader, "conf_source", None)
+    if conf_source is None:
+        from kedro.framework.project import settings
+
+        conf_source = getattr(settings, "CONF_SOURCE", None) or getattr(
+            settings, "CONF_ROOT", "conf"
+        )
+    return Path(context.project_path) / str(conf_source)
+
+
+def conf_files(
+    conf_root: Union[str, Path],
+    prefixes: Tuple[str, ...],
+    envs: Optional[Sequence[str]] = None,
+) -> List[Path]:
+    """
+    Files of a kedro conf directory that kedro loads for config patterns
+    such as `catalog*`, `catalog*/**` and `**/catalog*`: the name of the
+    file, or of a directory it is in, starts with one of prefixes.  Files of
+    every environment are returned unless envs are given, in their order.
+    """
+    conf_root = Path(conf_root)
+    env_dirs = [conf_root] if envs is None else [conf_root / env for env in envs]
+    return [
+        path
+        for env_dir in env_dirs
+        for path in sorted(env_dir.rglob("*"))
+        if path.is_file()
+        and any(
+            part.startswith(prefixes) for part in path.relative_to(conf_root).parts[1:]
+        )
+    ]
+
+
+class BlobCache:
+    """BlobCache.
+
+    Json values stored by key under the .kedro-diff directory.  Entries are
+    never invalidated, a key has to change whenever its value could.
+
+    Parameters
+    --------
+        root_dir : str
+            directory containing the .kedro-diff directory
+        namespace : str
+            kind of value that is cached, each kind has its own directory
+    """
+
+    def __init__(self, root_dir: Union[str, Path], namespace: str) -> None:
+        self.path = (
+            Path(root_dir) / SNAPSHOT_DIR / BLOB_DIR / str(SNAPSHOT_SCHEMA) / namespace
+        ).absolute()
+
+    def file(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value of key, None when it is missing or unreadable."""
+        try:
+            return json.loads(self.file(key).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Cache the json of value under key.  The file is replaced atomically,
+        so concurrent extractions never read a partial value.
+        """
+        path = self.file(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(value))
+        os.replace(str(tmp_path), str(path))
@@ -0,0 +1,128 @@
+"""Catalog.
+
+Catalog entries of a kedro project, read from its resolved config without
+creating a single dataset, so extracting them never opens a database
+connection or a cloud filesystem client.  Only the fields that tell where and
+how a dataset is stored are kept, credentials never end up in a snapshot.
+
+    "catalog": {
+        "cars": {"type": "pandas.CSVDataSet", "filepath": "data/01_raw/cars.csv"},
+        "model": {"type": "pickle.PickleDataSet", "filepath": "...", "versioned": true}
+    }
+
+The entries of a commit are cached under the blob ids of its catalog files,
+a commit that only changed src resolves no config at all.
+"""
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Union
+
+from kedro_diff.blob_cache import BlobCache, blobs_key, conf_files, conf_root
+
+if TYPE_CHECKING:
+    from kedro.framework.context import KedroContext
+
+CATALOG_FIELDS = ("type", "filepath", "sql", "versioned", "layer")
+
+# config patterns kedro 0.17 loads the catalog from
+CATALOG_PATTERNS = ("catalog*", "catalog*/**", "**/catalog*")
+
+# files whose content can change the resolved catalog, globals feed the
+# TemplatedConfigLoader
+CONF_FILE_PREFIXES = ("catalog", "globals")
+
+
+def catalog_entry(config: Mapping) -> Dict[str, Any]:
+    """
+    CATALOG_FIELDS of the config of a dataset, fields that are not set are
+    left out.
+
+    Examples
+    --------
+        >>> catalog_entry(
+        ...     {
+        ...         "type": "pandas.CSVDataSet",
+        ...         "filepath": "cars.csv",
+        ...         "credentials": "s3",
+        ...         "versioned": False,
+        ...     }
+        ... )
+        {'type': 'pandas.CSVDataSet', 'filepath': 'cars.csv'}
+    """
+    entry = {
+        "type": config.get("type"),
+        # folder datasets such as PartitionedDataSet take a path
+        "filepath": config.get("filepath", config.get("path")),
+        "sql": config.get("sql"),
+        "versioned": config.get("versioned") or None,
+        # kedro-viz moved the layer under metadata
+        "layer": config.get("layer")
+        or (config.get("metadata") or {}).get("kedro-viz", {}).get("layer"),
+    }
+    return {field: value for field, value in entry.items() if value is not None}
+
+
+def catalog_entries(config: Mapping) -> Dict[str, Dict]:
+    """
+    Entry of every dataset of a resolved catalog config, sorted by name.
+    Keys starting with an underscore hold yaml anchors, not datasets.
+    """
+    return {
+        name: catalog_entry(dataset)
+        for name, dataset in sorted(config.items())
+        if not name.startswith("_") and isinstance(dataset, Mapping)
+    }
+
+
+def catalog_config(config_loader: Any) -> Dict[str, Any]:
+    """
+    Resolved catalog config.  Config loaders are mappings of config names
+    since kedro 0.18, older ones are given the patterns of the files to load.
+    """
+    if isinstance(config_loader, Mapping):
+        return dict(config_loader["catalog"])
+    return dict(config_loader.get(*CATALOG_PATTERNS))
+
+
+def catalog_files(conf_dir: Union[str, Path]) -> List[Path]:
+    """Config files of every environment that the catalog may be read from."""
+    return conf_files(conf_dir, CONF_FILE_PREFIXES)
+
+
+def load_catalog(context: "KedroContext", root_dir: Union[str, Path]) -> Dict:
+    """
+    Catalog entries of a loaded project, the config is only resolved when
+    no commit with the same catalog files was extracted before.
+
+    Parameters
+    --------
+        context : KedroContext
+            context of the session that serializes the pipelines
+        root_dir : str
+            directory containing the .kedro-diff directory
+
+    Returns
+    --------
+        dict
+            entry of each dataset by name, see `catalog_entry`
+
+    """
+    conf_dir = conf_root(context)
+    files = catalog_files(conf_dir)
+    if not files:
+        return {}
+    cache = BlobCache(root_dir, "catalog")
+    key = blobs_key(files, conf_dir, salt=str(context.env))
+    entries = cache.get(key)
+    if entries is None:
+        entries = catalog_entries(catalog_config(context.config_loader))
+        cache.put(key, entries)
+    return dict(entries)
+
+
+def catalog_nodes(snapshot: Mapping) -> List[Dict]:
+    """
+    Entries of the catalog of a snapshot as node like dicts, named after
+    their dataset, so they are diffed like the nodes of a pipeline.
+    """
+    catalog = snapshot.get("catalog") or {}
+    return [{"name": name, **entry} for name, entry in sorted(catalog.items())]
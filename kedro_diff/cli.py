@@ -1,17 +1,45 @@
-"""kedro_diff cli module."""
-import json
+"""kedro_diff cli module.
+
+kedro imports this module for every command it runs, `kedro run` included, to
+register the plugin commands.  Only click and the small modules that define
+options are imported here, kedro sessions, rich and the diff machinery are
+imported by the commands that use them.
+"""
 import logging
+import os
 import subprocess
+import sys
+from itertools import chain
 from pathlib import Path
-from typing import IO, TYPE_CHECKING, Any, Tuple
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
 import click
-from kedro.framework.session import KedroSession
-from rich import print
 
-from kedro_diff.diff import KedroDiff
+from kedro_diff.errors import KedroDiffError
+from kedro_diff.filters import DiffFilter
+from kedro_diff.get_pipelines import CHECKOUT_MODES, snapshot_key
 from kedro_diff.logger import get_logger, silent_loggers
-from kedro_diff.sample_data import create_simple_sample
+from kedro_diff.model import StringTable
+from kedro_diff.render import OUTPUT_FORMATS
+from kedro_diff.snapshot import (
+    SNAPSHOT_FORMATS,
+    SnapshotOptions,
+    denormalize,
+    empty_snapshot,
+    is_valid,
+    load_snapshot,
+)
 
 if TYPE_CHECKING:
     from kedro.framework.startup import ProjectMetadata
@@ -37,6 +65,26 @@ def cli() -> None:
 @click.option("-q", "--quiet", is_flag=True, help="runs completely quiet")
 @click.option("-p", "--pipeline-name", help="name of pipeline")
 @click.option("-c", "--commit", help="name of commit")
+@click.option("--sha", help="resolved sha of commit, defaults to HEAD of the project")
+@click.option("--key", help="snapshot key of commit, defaults to the key of sha")
+@click.option(
+    "--format",
+    "snapshot_format",
+    type=click.Choice(SNAPSHOT_FORMATS),
+    default="json",
+    help="file format of the snapshot",
+)
+@click.option(
+    "--compression",
+    type=click.Choice(["zlib"]),
+    help="compress each section of a binary snapshot",
+)
+@click.option(
+    "--pipeline",
+    "pipeline_patterns",
+    multiple=True,
+    help="glob of the pipelines to serialize, may be repeated, defaults to all",
+)
 @click.pass_obj
 def get_json(
     metadata: "ProjectMetadata",
@@ -45,8 +93,19 @@ def get_json(
     quiet: bool,
     pipeline_name: str = "__default__",
     commit: str = "HEAD",
+    sha: Optional[str] = None,
+    key: Optional[str] = None,
+    snapshot_format: str = "json",
+    compression: Optional[str] = None,
+    pipeline_patterns: Tuple[str, ...] = (),
 ) -> None:
     """Get pipeline json from project context."""
+    from rich import print
+
+    from kedro_diff.catalog import load_catalog
+    from kedro_diff.extract import create_session, project_pipelines, write_snapshot
+    from kedro_diff.parameters import load_parameters
+
     if quiet:
         verbose = -1
     logger = get_logger(verbose=verbose)
@@ -58,64 +117,214 @@ def get_json(
     if verbose < 2:
         silent_loggers()
 
-    session = KedroSession.create(metadata.package_name)
+    session = create_session(metadata.package_name, Path(metadata.project_path))
     context = session.load_context()
 
-    meta_path = (
-        Path(output.name)
-        / (commit.replace("/", "_").replace(" ", "_") + "-commit-metadata.json")
-    ).absolute()
+    if sha is None:
+        sha = (
+            subprocess.check_output(["git", "rev-parse", "HEAD"])
+            .strip()
+            .decode("utf-8")
+        )
+    if key is None:
+        key = snapshot_key(Path.cwd(), sha, pipeline_patterns)
+
+    # output is the .kedro-diff directory itself
+    root_dir = Path(output.name).absolute().parent
+    write_snapshot(
+        project_pipelines(context),
+        root_dir,
+        commit=commit,
+        sha=sha,
+        key=key,
+        echo=print if verbose >= 0 else None,
+        snapshot_format=snapshot_format,
+        compression=compression,
+        pipeline_patterns=pipeline_patterns,
+        catalog=load_catalog(context, root_dir),
+        parameters=load_parameters(context, root_dir),
+    )
+    return
 
-    if not meta_path.parent.exists():
-        meta_path.parent.mkdir()
 
-    sha = subprocess.check_output(["git", "rev-parse", "HEAD"]).strip().decode("utf-8")
+class DefaultGroup(click.Group):
+    """Group that runs default_command when no subcommand is named.
 
-    diffmeta = {
-        "commit": commit,
-        "sha": sha,
-        "pipelines": list(context.pipelines.keys()),
-    }
-    meta_path.write_text(json.dumps(diffmeta))
+    Keeps `kedro diff main..develop` working next to subcommands such as
+    `kedro diff log main..develop`.
+    """
 
-    for pipeline_name, pipeline in context.pipelines.items():
-        output_file = Path(output.name) / (
-            "_".join([commit, pipeline_name]).replace("/", "_").replace(" ", "_")
-            + ".json"
-        )
-        pipeline = pipeline.to_json()
-        if verbose >= 0:
-            print(pipeline)
-        output_file.write_text(pipeline)
-    return
+    def __init__(self, *args: Any, default_command: str, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.default_command = default_command
+
+    def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
+        if not args or (
+            args[0] not in self.commands and args[0] not in ctx.help_option_names
+        ):
+            args = [self.default_command, *args]
+        return super().parse_args(ctx, args)
+
+
+def extraction_options(func: Callable) -> Callable:
+    """Options shared by every command that extracts commits."""
+    options = [
+        click.option(
+            "-v",
+            "--verbose",
+            count=True,
+            help="verbosity level, -v enables diff related logs, -vv enables all logs",
+        ),
+        click.option("-q", "--quiet", is_flag=True, help="runs completely quiet"),
+        click.option(
+            "--checkout",
+            type=click.Choice(CHECKOUT_MODES),
+            default="worktree",
+            show_default=True,
+            help="how each commit is materialized, a pooled git worktree, "
+            "a sparse export of src and conf, or a full copy of the project",
+        ),
+        click.option(
+            "-j",
+            "--jobs",
+            type=click.IntRange(min=1),
+            help="number of commits extracted concurrently, "
+            "defaults to the number of cpus",
+        ),
+        click.option(
+            "--warm",
+            is_flag=True,
+            help="extract through long lived workers that import kedro only once",
+        ),
+        click.option(
+            "--preload",
+            multiple=True,
+            help="module each warm worker imports once when it starts, "
+            "may be repeated",
+        ),
+        click.option(
+            "--snapshot-format",
+            type=click.Choice(SNAPSHOT_FORMATS),
+            default="json",
+            show_default=True,
+            help="file format of new snapshots, binary snapshots load lazily",
+        ),
+        click.option(
+            "--compression",
+            type=click.Choice(["zlib"]),
+            help="compress each section of new binary snapshots",
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+def filter_options(func: Callable) -> Callable:
+    """Pipeline and node filters of the commands that diff commits."""
+    options = [
+        click.option(
+            "--pipeline",
+            "pipelines",
+            multiple=True,
+            help="glob of the pipelines to diff, may be repeated, "
+            "only these are extracted",
+        ),
+        click.option(
+            "--tag", "tags", multiple=True, help="glob of the node tags to diff"
+        ),
+        click.option(
+            "--namespace",
+            "namespaces",
+            multiple=True,
+            help="glob of the node namespaces to diff",
+        ),
+        click.option(
+            "--node", "nodes", multiple=True, help="glob of the node names to diff"
+        ),
+    ]
+    for option in reversed(options):
+        func = option(func)
+    return func
+
+
+@cli.group(cls=DefaultGroup, default_command="commits")
+def diff() -> None:
+    """Diff the pipelines of two commits, or of each commit of a range.
+
+    `kedro diff develop..master` diffs two commits, see
+    `kedro diff commits --help` for its options.
+    """
+    pass
 
 
-@cli.command()
-@click.option(
-    "-v",
-    "--verbose",
-    count=True,
-    help="verbosity level, -v enables diff related logs, -vv enables all logs",
-)
-@click.option("-q", "--quiet", is_flag=True, help="runs completely quiet")
+@diff.command(name="commits", hidden=True)
 @click.argument("commit", nargs=-1)
 @click.option("--stat", is_flag=True, help="generate short stats only")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(OUTPUT_FORMATS),
+    default=None,
+    help="rich text, plain unified text, or one json record per pipeline and "
+    "per changed node streamed as a json array or as json lines.  Defaults to "
+    "rich on a terminal and plain otherwise",
+)
+@click.option(
+    "--max-lines",
+    type=click.IntRange(min=1),
+    default=None,
+    help="stop after this many lines and summarize the rest",
+)
+@click.option(
+    "-M",
+    "--find-renames",
+    is_flag=True,
+    help="report dropped and new nodes that were renamed or moved as renames",
+)
+@extraction_options
+@filter_options
 @click.pass_obj
-def diff(
+def diff_commits(
     metadata: "ProjectMetadata",
     verbose: int,
     quiet: bool,
     commit: Tuple[str, ...],
     stat: bool,
+    output_format: Optional[str],
+    max_lines: Optional[int],
+    find_renames: bool,
+    checkout: str,
+    jobs: Optional[int],
+    warm: bool,
+    preload: Tuple[str, ...],
+    snapshot_format: str,
+    compression: Optional[str],
+    pipelines: Tuple[str, ...],
+    tags: Tuple[str, ...],
+    namespaces: Tuple[str, ...],
+    nodes: Tuple[str, ...],
 ) -> None:
-    """Diff two commits."""
-    from kedro_diff.commit_parser import load_commit_metadata, parse_commit
-    from kedro_diff.get_pipelines import to_json
+    """
+    Diff two commits.
 
-    try:
-        project_path = metadata.project_path
-    except AttributeError:
-        project_path = Path.cwd()
+    The catalog entries and the parameters of both commits are compared after
+    the pipelines, unless pipelines or nodes are filtered.
+    """
+    from rich import print
+
+    from kedro_diff.commit_parser import parse_commit
+    from kedro_diff.diff import KedroDiff
+    from kedro_diff.engine import NodeComparisons
+    from kedro_diff.get_pipelines import extract, resolve_sha
+    from kedro_diff.render import (
+        diff_records,
+        get_renderer,
+        get_writer,
+        section_records,
+    )
+
+    project_path = get_project_path(metadata)
 
     if quiet:
         verbose = -1
@@ -123,32 +332,548 @@ def diff(
     logger = get_logger(verbose=verbose)
     logger.info(f"project path is set to {project_path}")
 
+    diff_filter = DiffFilter(pipelines, tags, namespaces, nodes)
     commit1, commit2 = parse_commit(commit, verbose=verbose)
-    to_json(project_path, commit1)
-    to_json(project_path, commit2)
+    key1, key2 = (
+        snapshot_key(project_path, resolve_sha(project_path, c), pipelines)
+        for c in (commit1, commit2)
+    )
+    if output_format is None:
+        output_format = "rich" if sys.stdout.isatty() else "plain"
+    writer = get_writer(output_format, sys.stdout)
+    if key1 == key2:
+        # src and conf are identical, there is no need to start kedro at all
+        if writer is not None:
+            writer.close()
+        elif verbose >= 0:
+            print(f"no pipeline changes between {commit1} and {commit2}")
+        return
+
+    extract(
+        project_path,
+        [commit1, commit2],
+        jobs=jobs,
+        verbose=verbose,
+        mode=checkout,
+        warm=warm,
+        preload=list(preload),
+        options=SnapshotOptions(snapshot_format, compression, pipelines),
+    )
+    check_extracted([commit1, commit2], [key1, key2])
 
     logger.info(f"Converted pipelines to json")
 
-    meta1, meta2 = load_commit_metadata(commit)
-    all_pipelines = sorted({*meta1["pipelines"], *meta2["pipelines"]})
-    for pipeline in all_pipelines:
-        pipe1 = load_json(commit1, pipeline)
-        pipe2 = load_json(commit2, pipeline)
-        diff = KedroDiff(pipe1, pipe2, name=pipeline)
-        if stat:
+    # both snapshots share their dataset, tag and node names
+    strings = StringTable()
+    snapshot1 = load_snapshot(key1, strings=strings)
+    snapshot2 = load_snapshot(key2, strings=strings)
+    # one renderer draws every pipeline of the run
+    renderer = get_renderer(output_format, sys.stdout, max_lines=max_lines)
+    # nodes shared by several pipelines are compared once
+    comparisons = NodeComparisons()
+    all_pipelines = diff_filter.select_pipelines(
+        sorted({*snapshot1["pipelines"], *snapshot2["pipelines"]})
+    )
+    diffs = (
+        KedroDiff.from_snapshots(
+            snapshot1,
+            snapshot2,
+            name=pipeline,
+            diff_filter=diff_filter,
+            find_renames=find_renames,
+            renderer=renderer,
+            comparisons=comparisons,
+        )
+        for pipeline in all_pipelines
+    )
+    sections: List[KedroDiff] = []
+    if not diff_filter.pipelines and not diff_filter.filters_nodes:
+        sections = [
+            section
+            for section in (
+                KedroDiff.from_catalogs(snapshot1, snapshot2, renderer=renderer),
+                KedroDiff.from_parameters(snapshot1, snapshot2, renderer=renderer),
+            )
+            if section.pipe1 or section.pipe2
+        ]
+    if writer is not None:
+        # records are written while the remaining pipelines are diffed
+        records = chain(
+            diff_records((diff.result for diff in diffs), stat=stat),
+            *(section_records(section.result, stat=stat) for section in sections),
+        )
+        writer.write_all(records)
+    else:
+        for diff in chain(diffs, sections):
+            if stat:
+                diff.stat()
+            else:
+                diff.diff()
+        if renderer is not None:
+            renderer.close()
+    logger.info(
+        f"compared {comparisons.compared} nodes, "
+        f"reused {comparisons.reused} comparisons across pipelines"
+    )
+
+
+@diff.command(name="log")
+@click.argument("commit", nargs=-1)
+@click.option(
+    "--first-parent", is_flag=True, help="only follow the first parent of merges"
+)
+@click.option(
+    "-M",
+    "--find-renames",
+    is_flag=True,
+    help="report dropped and new nodes that were renamed or moved as renames",
+)
+@extraction_options
+@filter_options
+@click.pass_obj
+def diff_log(
+    metadata: "ProjectMetadata",
+    verbose: int,
+    quiet: bool,
+    commit: Tuple[str, ...],
+    first_parent: bool,
+    find_renames: bool,
+    checkout: str,
+    jobs: Optional[int],
+    warm: bool,
+    preload: Tuple[str, ...],
+    snapshot_format: str,
+    compression: Optional[str],
+    pipelines: Tuple[str, ...],
+    tags: Tuple[str, ...],
+    namespaces: Tuple[str, ...],
+    nodes: Tuple[str, ...],
+) -> None:
+    """Summarize the pipeline changes of each commit of a range."""
+    from rich import print
+    from rich.markup import escape
+
+    from kedro_diff.diff import KedroDiff
+    from kedro_diff.engine import NodeComparisons
+    from kedro_diff.get_pipelines import extract
+    from kedro_diff.history import commits_to_extract, log_entries
+
+    project_path = get_project_path(metadata)
+
+    if quiet:
+        verbose = -1
+
+    logger = get_logger(verbose=verbose)
+    diff_filter = DiffFilter(pipelines, tags, namespaces, nodes)
+    entries = log_entries(
+        project_path, commit, first_parent=first_parent, pipeline_patterns=pipelines
+    )
+    changed = [entry for entry in entries if entry.changes_pipelines]
+    logger.info(
+        f"{len(changed)} of {len(entries)} commits change src or conf, "
+        "extracting the ones that are not cached yet"
+    )
+    extract(
+        project_path,
+        list(commits_to_extract(entries)),
+        jobs=jobs,
+        verbose=verbose,
+        mode=checkout,
+        warm=warm,
+        preload=list(preload),
+        options=SnapshotOptions(snapshot_format, compression, pipelines),
+    )
+
+    snapshots: Dict[str, Mapping] = {}
+    strings = StringTable()
+
+    def snapshot(key: Optional[str]) -> Mapping:
+        if key is None:
+            return empty_snapshot()
+        if key not in snapshots:
+            snapshots[key] = load_snapshot(key, strings=strings)
+        return snapshots[key]
+
+    for entry in changed:
+        # a commit that failed to extract would read as dropping every node
+        # and the commit after it as adding them back, both are skipped
+        failed = [
+            sha
+            for sha, key in [(entry.parent, entry.parent_key), (entry.sha, entry.key)]
+            if sha is not None and key is not None and not is_valid(key)
+        ]
+        if failed:
+            if verbose >= 0:
+                print(
+                    f"[yellow]{entry.sha[:7]}[/yellow] {escape(entry.subject)}\n"
+                    f"could not extract {', '.join(sha[:7] for sha in failed)}, "
+                    "skipped\n"
+                )
+            continue
+        snapshot1, snapshot2 = snapshot(entry.parent_key), snapshot(entry.key)
+        comparisons = NodeComparisons()
+        diffs = [
+            KedroDiff.from_snapshots(
+                snapshot1,
+                snapshot2,
+                name=pipeline,
+                diff_filter=diff_filter,
+                find_renames=find_renames,
+                comparisons=comparisons,
+            )
+            for pipeline in diff_filter.select_pipelines(
+                sorted({*snapshot1["pipelines"], *snapshot2["pipelines"]})
+            )
+        ]
+        diffs = [diff for diff in diffs if diff.num_changes]
+        if not diffs or verbose < 0:
+            continue
+        print(f"[yellow]{entry.sha[:7]}[/yellow] {escape(entry.subject)}")
+        for diff in diffs:
             diff.stat()
-        else:
-            diff.diff()
+        print()
 
 
-def load_json(commit: str, pipeline_name: str) -> Any:
+@diff.command(name="bisect")
+@click.argument("commit", nargs=-1)
+@click.option("--node", required=True, help="name of the node to look for")
+@click.option(
+    "--input", "inputs", multiple=True, help="input the node must have, may be repeated"
+)
+@click.option(
+    "--output",
+    "outputs",
+    multiple=True,
+    help="output the node must have, may be repeated",
+)
+@click.option(
+    "--tag", "tags", multiple=True, help="tag the node must have, may be repeated"
+)
+@click.option(
+    "--pipeline", help="only look for the node in this pipeline, and only extract it"
+)
+@extraction_options
+@click.pass_obj
+def diff_bisect(
+    metadata: "ProjectMetadata",
+    verbose: int,
+    quiet: bool,
+    commit: Tuple[str, ...],
+    node: str,
+    inputs: Tuple[str, ...],
+    outputs: Tuple[str, ...],
+    tags: Tuple[str, ...],
+    pipeline: Optional[str],
+    checkout: str,
+    jobs: Optional[int],
+    warm: bool,
+    preload: Tuple[str, ...],
+    snapshot_format: str,
+    compression: Optional[str],
+) -> None:
+    """
+    Find the commit of a range that changed a node.
+
+    With only --node it finds the commit that added or removed the node,
+    --input, --output and --tag look for the commit that changed whether the
+    node has them.  Commits are probed by binary search along the first
+    parents of the range, up to three at a time with --jobs, and commits that
+    fail to extract are skipped.
+    """
+    from concurrent.futures import Future
+
+    from rich import print
+    from rich.markup import escape
+
+    from kedro_diff.bisection import NodePredicate, first_change
+    from kedro_diff.commit_parser import parse_commit
+    from kedro_diff.get_pipelines import ExtractionPool, resolve_sha
+    from kedro_diff.history import rev_list
+
+    project_path = get_project_path(metadata)
+
+    if quiet:
+        verbose = -1
+
+    logger = get_logger(verbose=verbose)
+    predicate = NodePredicate(node, inputs, outputs, tags, pipeline)
+    options = SnapshotOptions(
+        snapshot_format, compression, (pipeline,) if pipeline else ()
+    )
+    commit1, commit2 = parse_commit(commit, verbose=verbose)
+    commit_range = f"{commit1}..{commit2}"
+    good = resolve_sha(project_path, commit1)
+    revisions = rev_list(project_path, commit_range, first_parent=True)
+    commits = [good, *(sha for sha, _, _ in revisions)]
+    subjects = {sha: subject for sha, _, subject in revisions}
+
+    # a probe and both of the probes that may follow it are extracted at once
+    num_jobs = min(jobs or os.cpu_count() or 1, 3)
+    extractions: Dict[str, "Future[str]"] = {}
+    results: Dict[str, bool] = {}
+    probed: Dict[str, bool] = {}
+    with ExtractionPool(
+        project_path, num_jobs, verbose, checkout, warm, list(preload), options
+    ) as pool:
+
+        def prefetch(shas: List[str]) -> None:
+            for sha in shas:
+                if sha not in extractions:
+                    extractions[sha] = pool.submit(sha)
+
+        def evaluate(sha: str) -> Optional[bool]:
+            prefetch([sha])
+            try:
+                key = extractions[sha].result()
+            except KedroDiffError as e:
+                logger.warning(f"skipping {sha[:7]}, {e}")
+                return None
+            if not is_valid(key):
+                # a failed extraction is skipped, it never reads as a commit
+                # without any node
+                logger.warning(f"skipping {sha[:7]}, its extraction failed")
+                return None
+            # commits that share a snapshot share a result
+            if key not in results:
+                results[key] = predicate(load_snapshot(key))
+            probed[sha] = results[key]
+            logger.info(f"{sha[:7]} {predicate.describe()}: {probed[sha]}")
+            return probed[sha]
+
+        try:
+            index = first_change(
+                commits, evaluate, prefetch=prefetch if num_jobs > 1 else None
+            )
+        finally:
+            # prefetched commits that were never probed are not waited for
+            for future in extractions.values():
+                future.cancel()
+
+    logger.info(f"probed {len(probed)} of {len(commits)} commits")
+    if verbose < 0:
+        return
+    if index is None:
+        print(
+            f"{predicate.describe()} is {probed[good]} across {commit_range}, "
+            "nothing to bisect"
+        )
+        return
+    found = commits[index]
+    print(f"[yellow]{found}[/yellow] {escape(subjects[found])}")
+    print(f"{predicate.describe()}: {probed[good]} -> {probed[found]}")
+
+
+@diff.command(name="impact")
+@click.argument("commit", nargs=-1)
+@click.option(
+    "--pipeline",
+    "pipelines",
+    multiple=True,
+    default=["__default__"],
+    show_default=True,
+    help="pipeline to plan a run for, may be repeated",
+)
+@click.option(
+    "--from-nodes",
+    is_flag=True,
+    help="start the run at the first affected nodes instead of selecting "
+    "every affected node",
+)
+@click.option(
+    "-M",
+    "--find-renames",
+    is_flag=True,
+    help="treat dropped and new nodes that were renamed or moved as renames",
+)
+@extraction_options
+@click.pass_obj
+def diff_impact(
+    metadata: "ProjectMetadata",
+    verbose: int,
+    quiet: bool,
+    commit: Tuple[str, ...],
+    pipelines: Tuple[str, ...],
+    from_nodes: bool,
+    find_renames: bool,
+    checkout: str,
+    jobs: Optional[int],
+    warm: bool,
+    preload: Tuple[str, ...],
+    snapshot_format: str,
+    compression: Optional[str],
+) -> None:
+    """
+    Plan a `kedro run` of only the nodes affected by two commits.
+
+    Every changed node and every node downstream of a changed node or
+    dataset is selected, one command is printed per pipeline.
+    """
+    from kedro_diff.commit_parser import parse_commit
+    from kedro_diff.diff import KedroDiff
+    from kedro_diff.engine import NodeComparisons
+    from kedro_diff.get_pipelines import extract
+    from kedro_diff.impact import DatasetIndex, impact
+
+    project_path = get_project_path(metadata)
+
+    if quiet:
+        verbose = -1
+
+    logger = get_logger(verbose=verbose)
+    commit1, commit2 = parse_commit(commit, verbose=verbose)
+    key1, key2 = extract(
+        project_path,
+        [commit1, commit2],
+        jobs=jobs,
+        verbose=verbose,
+        mode=checkout,
+        warm=warm,
+        preload=list(preload),
+        options=SnapshotOptions(snapshot_format, compression, pipelines),
+    )
+    # an empty snapshot would plan a run of nothing
+    check_extracted([commit1, commit2], [key1, key2])
+    # both snapshots share their dataset, tag and node names
+    strings = StringTable()
+    snapshot1 = load_snapshot(key1, strings=strings)
+    snapshot2 = load_snapshot(key2, strings=strings)
+    index = DatasetIndex.from_snapshot(snapshot2)
+    comparisons = NodeComparisons()
+    for pipeline in pipelines:
+        result = KedroDiff.from_snapshots(
+            snapshot1,
+            snapshot2,
+            name=pipeline,
+            find_renames=find_renames,
+            comparisons=comparisons,
+        ).result
+        pipeline_impact = impact(result, index)
+        logger.info(
+            f"{pipeline}: {len(pipeline_impact.changed_nodes)} changed nodes, "
+            f"{len(pipeline_impact.affected_nodes)} affected nodes"
+        )
+        command = pipeline_impact.run_command(from_nodes=from_nodes)
+        if command and verbose >= 0:
+            click.echo(command)
+
+
+@diff.command(name="matrix")
+@click.argument("refs", nargs=-1, required=True)
+@click.option("--stat", is_flag=True, help="only print the change counts")
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["plain", "json", "ndjson"]),
+    default="plain",
+    show_default=True,
+    help="plain text tables, or one json record per pipeline",
+)
+@extraction_options
+@filter_options
+@click.pass_obj
+def diff_matrix(
+    metadata: "ProjectMetadata",
+    verbose: int,
+    quiet: bool,
+    refs: Tuple[str, ...],
+    stat: bool,
+    output_format: str,
+    checkout: str,
+    jobs: Optional[int],
+    warm: bool,
+    preload: Tuple[str, ...],
+    snapshot_format: str,
+    compression: Optional[str],
+    pipelines: Tuple[str, ...],
+    tags: Tuple[str, ...],
+    namespaces: Tuple[str, ...],
+    nodes: Tuple[str, ...],
+) -> None:
+    """
+    Compare every pair of several commits or branches at once.
+
+    Prints, for each pipeline that differs between any of the refs, how many
+    nodes differ between each pair of refs, the version of each changed node
+    in each ref and the version of each of its changed attributes.
+    """
+    from kedro_diff.get_pipelines import extract
+    from kedro_diff.matrix import NodeMatrix, matrix_lines
+    from kedro_diff.render import get_writer
+
+    project_path = get_project_path(metadata)
+
+    if quiet:
+        verbose = -1
+
+    logger = get_logger(verbose=verbose)
+    diff_filter = DiffFilter(pipelines, tags, namespaces, nodes)
+    keys = extract(
+        project_path,
+        list(refs),
+        jobs=jobs,
+        verbose=verbose,
+        mode=checkout,
+        warm=warm,
+        preload=list(preload),
+        options=SnapshotOptions(snapshot_format, compression, pipelines),
+    )
+    check_extracted(refs, keys)
+    strings = StringTable()
+    loaded: Dict[str, Mapping] = {}
+    for key in keys:
+        if key not in loaded:
+            loaded[key] = load_snapshot(key, strings=strings)
+    snapshots = [loaded[key] for key in keys]
+    logger.info(f"comparing {len(refs)} refs, {len(loaded)} distinct snapshots")
+
+    writer = get_writer(output_format, sys.stdout)
+    all_pipelines = diff_filter.select_pipelines(
+        sorted({name for snapshot in snapshots for name in snapshot["pipelines"]})
+    )
+    matrices = (
+        NodeMatrix.from_snapshots(refs, snapshots, pipeline, diff_filter=diff_filter)
+        for pipeline in all_pipelines
+    )
+    changed = (matrix for matrix in matrices if matrix.num_changed_nodes)
+    if writer is not None:
+        writer.write_all(matrix.to_record() for matrix in changed)
+        return
+    if verbose < 0:
+        return
+    for i, matrix in enumerate(changed):
+        if i:
+            click.echo()
+        click.echo("\n".join(matrix_lines(matrix, stat=stat)))
+
+
+def check_extracted(refs: Sequence[str], keys: Sequence[str]) -> None:
+    """
+    Fail when a ref could not be extracted, its missing snapshot would read
+    as a ref without any node.
+    """
+    failed = [ref for ref, key in zip(refs, keys) if not is_valid(key)]
+    if failed:
+        raise KedroDiffError(
+            f"could not extract {', '.join(failed)}, run with -v to see why"
+        )
+
+
+def get_project_path(metadata: "ProjectMetadata") -> Path:
+    """Project path of the kedro project, the current directory outside of one."""
+    try:
+        return Path(metadata.project_path)
+    except AttributeError:
+        return Path.cwd()
+
+
+def load_json(key: str, pipeline_name: str) -> Any:
     """
     Tries to load pipeline data from, if one is not found it returns an empty pipeline.
 
     Parameters
     --------
-        commit : str
-            a commit to load pipeline data for.
+        key : str
+            snapshot key of the commit to load pipeline data for.
         pipeline_name : str
             a pipeline to load pipeline data for.
 
@@ -158,37 +883,31 @@ def load_json(commit: str, pipeline_name: str) -> Any:
             pipeline data
 
     """
+    from kedro_diff.sample_data import create_simple_sample
+
     try:
-        return json.loads(
-            (
-                Path(".kedro-diff")
-                / (
-                    "_".join([commit, pipeline_name])
-                    .replace("/", "_")
-                    .replace(" ", "_")
-                    + ".json"
-                )
-            ).read_text()
-        )
+        return denormalize(load_snapshot(key), pipeline_name)
     except FileNotFoundError:
         return create_simple_sample(0)
 
 
-def diff_stat(commit1: str, commit2: str, pipeline_name: str = "__default__") -> None:
+def diff_stat(key1: str, key2: str, pipeline_name: str = "__default__") -> None:
     """
     Does a diff --stat for the given pipeline_name between two commits.
 
     Parameters
     --------
-        commit1 : str
-            first commit to load pipeline data for.
-        commit2 : str
-            second commit to load pipeline data for.
+        key1 : str
+            snapshot key of the first commit to load pipeline data for.
+        key2 : str
+            snapshot key of the second commit to load pipeline data for.
         pipeline_name : str
             a pipeline to load pipeline data for.
     """
-    pipe1 = load_json(commit1, pipeline_name)
-    pipe2 = load_json(commit2, pipeline_name)
+    from kedro_diff.diff import KedroDiff
+
+    pipe1 = load_json(key1, pipeline_name)
+    pipe2 = load_json(key2, pipeline_name)
 
     diff = KedroDiff(pipe1, pipe2, name=pipeline_name)
     diff.stat()
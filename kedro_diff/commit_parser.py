@@ -2,14 +2,15 @@
 
 Parses user input into two commits to compare
 """
-import json
 from pathlib import Path
 from typing import Dict, Tuple, Union
 
 from more_itertools import flatten
 
 from kedro_diff.errors import KedroDiffError
+from kedro_diff.get_pipelines import resolve_sha, snapshot_key
 from kedro_diff.logger import get_logger
+from kedro_diff.snapshot import load_metadata
 
 __version__ = "0.1.1"
 
@@ -67,24 +68,18 @@ def load_commit_metadata(
     verbose: int = 0,
     root_dir: Union[str, Path] = ".",
 ) -> Tuple[Dict, Dict]:
-    commit1, commit2 = parse_commit(commit)
-    meta1 = json.loads(
-        (
-            Path(root_dir)
-            / ".kedro-diff"
-            / (commit1.replace("/", "_").replace(" ", "_") + "-commit-metadata.json")
-        )
-        .absolute()
-        .read_text()
+    """
+    Load the snapshot metadata of both commits.
+
+    Commits are resolved to their snapshot key first, so a branch that has
+    moved since it was last extracted never loads stale metadata.
+    """
+    commit1, commit2 = parse_commit(commit, verbose=verbose)
+    meta1 = load_metadata(
+        snapshot_key(root_dir, resolve_sha(root_dir, commit1)), root_dir=root_dir
     )
-    meta2 = json.loads(
-        (
-            Path(root_dir)
-            / ".kedro-diff"
-            / (commit2.replace("/", "_").replace(" ", "_") + "-commit-metadata.json")
-        )
-        .absolute()
-        .read_text()
+    meta2 = load_metadata(
+        snapshot_key(root_dir, resolve_sha(root_dir, commit2)), root_dir=root_dir
     )
     return meta1, meta2
 
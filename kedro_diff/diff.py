@@ -2,12 +2,23 @@
 
 Core diffing logic for kedro diff.
 """
-from typing import Dict, List
-
-from rich.console import Console
-from rich.panel import Panel
-
+from typing import Dict, FrozenSet, List, Mapping, Optional, Tuple
+
+from kedro_diff.catalog import CATALOG_FIELDS, catalog_nodes
+from kedro_diff.engine import (
+    DIFF_ATTRS,
+    AttrChange,
+    DiffResult,
+    NodeComparisons,
+    diff_pipelines,
+    unchanged_result,
+)
+from kedro_diff.filters import DiffFilter
+from kedro_diff.fingerprint import PipelineHashes, compare
+from kedro_diff.parameters import changed_keys, parameter_nodes
+from kedro_diff.render import Renderer, RichRenderer, node_change, stat_line
 from kedro_diff.sample_data import create_simple_sample
+from kedro_diff.snapshot import denormalize
 
 from .node_diff import NodeDiff
 
@@ -25,6 +36,21 @@ class KedroDiff:
             pipeline to compare to the base pipeline
         name : str
             name of the pipeline that is being compared
+        diff_filter : DiffFilter
+            only nodes matching the node filters are compared
+        find_renames : bool
+            report dropped and new nodes that were renamed or moved as renames
+        renderer : Renderer
+            draws the stat and diff, share one renderer between the diffs of a
+            run.  A rich renderer is created by default.
+        hashes : PipelineHashes
+            fingerprints of both pipelines, identical pipelines, namespaces
+            and nodes are not compared
+        comparisons : NodeComparisons
+            node comparisons shared by the diffs of every pipeline of the same
+            two snapshots, a node in several pipelines is compared once
+        attrs : Tuple[str, ...]
+            attributes counted by the stat
 
     Examples
     --------
@@ -34,11 +60,28 @@ class KedroDiff:
         M __default__                    | 2 ++
     """
 
-    def __init__(self, pipe1: Dict, pipe2: Dict, name: str = "__default__") -> None:
-        self.pipe1 = pipe1["pipeline"]
-        self.pipe2 = pipe2["pipeline"]
+    def __init__(
+        self,
+        pipe1: Dict,
+        pipe2: Dict,
+        name: str = "__default__",
+        diff_filter: Optional[DiffFilter] = None,
+        find_renames: bool = False,
+        renderer: Optional[Renderer] = None,
+        hashes: Optional[PipelineHashes] = None,
+        comparisons: Optional[NodeComparisons] = None,
+        attrs: Tuple[str, ...] = DIFF_ATTRS,
+    ) -> None:
+        self.diff_filter = diff_filter or DiffFilter()
+        self.pipe1 = self.diff_filter.select_nodes(pipe1["pipeline"])
+        self.pipe2 = self.diff_filter.select_nodes(pipe2["pipeline"])
         self.name = name
-        self.console = Console()
+        self.find_renames = find_renames
+        self._renderer = renderer
+        self.hashes = hashes
+        self.comparisons = comparisons
+        self.attrs = attrs
+        self._result: Optional[DiffResult] = None
 
     @classmethod
     def from_sample(
@@ -72,21 +115,176 @@ class KedroDiff:
         pipe2 = create_simple_sample(**pipe2_args)
         return cls(pipe1=pipe1, pipe2=pipe2, name=name)
 
+    @classmethod
+    def from_snapshots(
+        cls,
+        snapshot1: Mapping,
+        snapshot2: Mapping,
+        name: str = "__default__",
+        diff_filter: Optional[DiffFilter] = None,
+        find_renames: bool = False,
+        renderer: Optional[Renderer] = None,
+        comparisons: Optional[NodeComparisons] = None,
+    ) -> "KedroDiff":
+        """
+        Creates a KedroDiff of one pipeline from two normalized snapshots.
+
+        Parameters
+        --------
+        snapshot1 : dict
+            base snapshot
+        snapshot2 : dict
+            snapshot to compare to the base snapshot
+        name : str
+            name of the pipeline that is being compared
+        diff_filter : DiffFilter
+            only nodes matching the node filters are compared
+        find_renames : bool
+            report dropped and new nodes that were renamed or moved as renames
+        renderer : Renderer
+            draws the stat and diff
+        comparisons : NodeComparisons
+            node comparisons shared with the other pipelines of both snapshots
+
+        A pipeline with the same fingerprint in both snapshots is not
+        compared at all, only the compared snapshot is decoded for it.
+
+        See Also
+        --------
+        kedro_diff.snapshot.normalize
+
+        Examples
+        --------
+            >>> from kedro_diff import KedroDiff
+            >>> from kedro_diff.snapshot import normalize
+            >>> from kedro_diff.sample_data import create_simple_sample
+            >>> snapshot1 = normalize({"__default__": create_simple_sample(2)["pipeline"]})
+            >>> snapshot2 = normalize({"__default__": create_simple_sample(4)["pipeline"]})
+            >>> KedroDiff.from_snapshots(snapshot1, snapshot2).stat()
+            M __default__                    | 2 ++
+
+        """
+        hashes = compare(snapshot1, snapshot2, name)
+        pipe2 = denormalize(snapshot2, name)
+        return cls(
+            pipe1=pipe2 if hashes.identical else denormalize(snapshot1, name),
+            pipe2=pipe2,
+            name=name,
+            diff_filter=diff_filter,
+            find_renames=find_renames,
+            renderer=renderer,
+            hashes=hashes,
+            comparisons=comparisons,
+        )
+
+    @classmethod
+    def from_catalogs(
+        cls,
+        snapshot1: Mapping,
+        snapshot2: Mapping,
+        renderer: Optional[Renderer] = None,
+    ) -> "KedroDiff":
+        """
+        Creates a KedroDiff of the catalog entries of two snapshots, each
+        dataset is compared as a node of a pipeline named catalog.
+
+        Examples
+        --------
+            >>> from kedro_diff import KedroDiff
+            >>> snapshot1 = {"catalog": {"cars": {"filepath": "cars.csv"}}}
+            >>> snapshot2 = {"catalog": {"cars": {"filepath": "cars.parquet"}}}
+            >>> KedroDiff.from_catalogs(snapshot1, snapshot2).stat()
+            M catalog                        | 2 +-
+
+        """
+        return cls(
+            pipe1={"pipeline": catalog_nodes(snapshot1)},
+            pipe2={"pipeline": catalog_nodes(snapshot2)},
+            name="catalog",
+            renderer=renderer,
+            attrs=CATALOG_FIELDS,
+        )
+
+    @classmethod
+    def from_parameters(
+        cls,
+        snapshot1: Mapping,
+        snapshot2: Mapping,
+        renderer: Optional[Renderer] = None,
+    ) -> "KedroDiff":
+        """
+        Creates a KedroDiff of the parameters of two snapshots, each dotted
+        key is compared as a node of a pipeline named parameters.  Only the
+        keys read from parameter files that differ are compared.
+
+        Examples
+        --------
+            >>> from kedro_diff import KedroDiff
+            >>> snapshot1 = {"parameters": {
+            ...     "files": {"base/parameters.yml": "1"},
+            ...     "sources": {"model": "base/parameters.yml"},
+            ...     "values": {"model": {"model.alpha": 0.1}},
+            ... }}
+            >>> snapshot2 = {"parameters": {
+            ...     "files": {"base/parameters.yml": "2"},
+            ...     "sources": {"model": "base/parameters.yml"},
+            ...     "values": {"model": {"model.alpha": 0.2}},
+            ... }}
+            >>> KedroDiff.from_parameters(snapshot1, snapshot2).stat()
+            M parameters                     | 2 +-
+
+        """
+        parameters1 = snapshot1.get("parameters") or {}
+        parameters2 = snapshot2.get("parameters") or {}
+        keys = changed_keys(parameters1, parameters2)
+        return cls(
+            pipe1={"pipeline": parameter_nodes(parameters1, keys)},
+            pipe2={"pipeline": parameter_nodes(parameters2, keys)},
+            name="parameters",
+            renderer=renderer,
+            attrs=("value",),
+        )
+
     @property
-    def all_nodes(self) -> List:
-        return sorted(
-            list(
-                set(
-                    [
-                        *[node["name"] for node in self.pipe2],
-                        *[node["name"] for node in self.pipe1],
-                    ]
+    def renderer(self) -> Renderer:
+        if self._renderer is None:
+            self._renderer = RichRenderer()
+        return self._renderer
+
+    @property
+    def result(self) -> DiffResult:
+        """Differences of both pipelines, computed once on first access."""
+        if self._result is None:
+            if self.hashes is None:
+                self._result = diff_pipelines(
+                    self.pipe1,
+                    self.pipe2,
+                    name=self.name,
+                    attrs=self.attrs,
+                    find_renames=self.find_renames,
+                    comparisons=self.comparisons,
                 )
-            )
-        )
+            elif self.hashes.identical:
+                self._result = unchanged_result(self.pipe2, name=self.name)
+            else:
+                self._result = diff_pipelines(
+                    self.pipe1,
+                    self.pipe2,
+                    name=self.name,
+                    find_renames=self.find_renames,
+                    hashes1=self.hashes.nodes1,
+                    hashes2=self.hashes.nodes2,
+                    same_namespaces=self.hashes.same_namespaces,
+                    comparisons=self.comparisons,
+                )
+        return self._result
 
     @property
-    def new_nodes(self) -> set:
+    def all_nodes(self) -> List:
+        return self.result.all_nodes
+
+    @property
+    def new_nodes(self) -> FrozenSet[str]:
         """
         Compares
 
@@ -96,117 +294,75 @@ class KedroDiff:
             a set of new nodes.
 
         """
-        return set([node["name"] for node in self.pipe2]).difference(
-            set([node["name"] for node in self.pipe1])
-        )
+        return self.result.new_nodes
 
     @property
-    def dropped_nodes(self) -> set:
-        return set([node["name"] for node in self.pipe1]).difference(
-            set([node["name"] for node in self.pipe2])
-        )
+    def dropped_nodes(self) -> FrozenSet[str]:
+        return self.result.dropped_nodes
 
     @property
-    def not_new_dropped_nodes(self) -> set:
-        return (
-            set([node["name"] for node in self.pipe2])
-            - self.new_nodes
-            - self.dropped_nodes
-        )
+    def not_new_dropped_nodes(self) -> FrozenSet[str]:
+        return self.result.common_nodes
+
+    @property
+    def renamed_nodes(self) -> Tuple[Tuple[str, str], ...]:
+        return self.result.renames
 
     @property
-    def change_input(self) -> set:
+    def change_input(self) -> FrozenSet[AttrChange]:
         return self.change_attr("inputs")
 
     @property
-    def change_output(self) -> set:
+    def change_output(self) -> FrozenSet[AttrChange]:
         return self.change_attr("outputs")
 
     @property
-    def change_tag(self) -> set:
+    def change_tag(self) -> FrozenSet[AttrChange]:
         return self.change_attr("tags")
 
-    def change_attr(self, attr: str) -> set:
-        return {
-            (
-                node["name"],
-                tuple(node[attr]),
-            )
-            for node in self.pipe2
-            if node["name"] in self.not_new_dropped_nodes
-        }.difference(
-            {
-                (
-                    node["name"],
-                    tuple(node[attr]),
-                )
-                for node in self.pipe1
-                if node["name"] in self.not_new_dropped_nodes
-            }
-        )
+    def change_attr(self, attr: str) -> FrozenSet[AttrChange]:
+        if attr in self.result.attr_changes:
+            return self.result.attr_changes[attr]
+        return diff_pipelines(self.pipe1, self.pipe2, attrs=(attr,)).attr_changes[attr]
 
     @property
     def num_changes(self) -> int:
-        return (
-            len(self.new_nodes)
-            + len(self.dropped_nodes)
-            + len(self.change_input) * 2
-            + len(self.change_output) * 2
-            + len(self.change_tag) * 2
-        )
+        return self.result.num_changes
 
     @property
     def num_adds(self) -> int:
-        return (
-            len(self.new_nodes)
-            + len(self.change_input)
-            + len(self.change_output)
-            + len(self.change_tag)
-        )
+        return self.result.num_adds
 
     @property
     def num_drops(self) -> int:
-        return (
-            len(self.dropped_nodes)
-            + len(self.change_input)
-            + len(self.change_output)
-            + len(self.change_tag)
-        )
+        return self.result.num_drops
 
     @property
     def _stat_msg(self) -> str:
-        return f'[red]M[/red] {self.name.ljust(30)[:30]} | {self.num_changes} [green]{"+" * self.num_adds}[/green][red]{"-"*self.num_drops}[/red]'
+        return stat_line(self.result)
 
     def stat(self) -> None:
-        self.console.print(self._stat_msg)
+        self.renderer.stat(self.result)
 
     def diff(self) -> None:
         if self.num_changes == 0:
             return
-        self.console.print(
-            Panel(
-                f"modified: {self.name.ljust(88)}",
-                title="[bright_black]kedro-diff[/bright_black]",
-                title_align="right",
-                expand=False,
-            ),
-        )
-        for node in self.all_nodes:
-            try:
-                node1 = [_node for _node in self.pipe1 if _node["name"] == node][0]
-            except IndexError:
-                node1 = None
-            try:
-                node2 = [_node for _node in self.pipe2 if _node["name"] == node][0]
-            except IndexError:
-                node2 = None
-
-            NodeDiff(node1, node2, node).diff()
+        renderer = self.renderer
+        renderer.pipeline(self.name)
+        renamed = {new_name for _, new_name in self.renamed_nodes}
+        for node, node1, node2 in self.result.changed_nodes():
+            if renderer.truncated:
+                # nodes past max_lines are only counted for the summary
+                renderer.node(node_change(node1, node2, node in renamed), node)
+            else:
+                NodeDiff(node1, node2, node, renderer=renderer).diff()
 
 
 def example() -> None:
     from copy import deepcopy
 
+    from rich.console import Console
+
     pipe10 = create_simple_sample(10)
 
     pipe10_change_one_input = deepcopy(pipe10)
@@ -0,0 +1,330 @@
+"""Engine.
+
+Single pass diff of two pipelines.  Both pipelines are indexed by node name
+once, then every node is visited once to find new, dropped and modified
+nodes along with the attributes that changed.  The result is immutable, so
+`KedroDiff.stat` and `KedroDiff.diff` both render from the same result.
+
+The pipelines of a snapshot share their nodes, `__default__` holds every node
+of the domain pipelines.  A `NodeComparisons` shared by the diffs of every
+pipeline of two snapshots compares each node once, the result of each
+pipeline is then derived from its own nodes.
+"""
+from types import MappingProxyType
+from typing import (
+    AbstractSet,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from kedro_diff.filters import namespaces_of
+from kedro_diff.renames import find_renames as renames_of
+
+# node attributes counted by `kedro diff --stat`, func_hash changes with the
+# implementation of the node function
+DIFF_ATTRS = ("inputs", "outputs", "tags", "func_hash")
+
+AttrChange = Tuple[str, Tuple]
+
+# attribute and new value of each changed attribute of a node, None when none
+# of the compared attributes changed
+NodeChanges = Optional[Tuple[Tuple[str, Tuple], ...]]
+
+
+def index_nodes(pipeline: Iterable[Dict]) -> Dict[str, Dict]:
+    """Nodes of a pipeline by name, the first node wins on duplicate names."""
+    index: Dict[str, Dict] = {}
+    for node in pipeline:
+        index.setdefault(node["name"], node)
+    return index
+
+
+def attr_value(node: Mapping, attr: str) -> Tuple:
+    """
+    Hashable value of a node attribute, a missing attribute is empty and a
+    scalar, such as the filepath of a catalog entry, is a single value.
+    """
+    value = node.get(attr)
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return (value,)
+
+
+def compare_nodes(
+    node1: Mapping, node2: Mapping, attrs: Tuple[str, ...] = DIFF_ATTRS
+) -> NodeChanges:
+    """
+    Changed attributes of two versions of a node, None when none of attrs
+    changed.  A node whose other fields, such as func, changed is unchanged
+    so that it is never modified without being counted.
+
+    Examples
+    --------
+        >>> compare_nodes({"name": "a", "tags": ["x"]}, {"name": "a", "tags": ["y"]})
+        (('tags', ('y',)),)
+        >>> compare_nodes({"name": "a", "func": "f"}, {"name": "a", "func": "g"})
+    """
+    if node1 == node2:
+        return None
+    changes = []
+    for attr in attrs:
+        value2 = attr_value(node2, attr)
+        if attr_value(node1, attr) != value2:
+            changes.append((attr, value2))
+    return tuple(changes) or None
+
+
+class NodeComparisons:
+    """NodeComparisons.
+
+    Node comparisons shared by the diffs of every pipeline of two snapshots.
+    A snapshot holds a single node per name, so each node is compared once
+    no matter how many pipelines it belongs to.
+
+    Parameters
+    --------
+        attrs : Tuple[str, ...]
+            node attributes to compare
+
+    Examples
+    --------
+        >>> comparisons = NodeComparisons()
+        >>> pipe1, pipe2 = [{"name": "a"}], [{"name": "a", "tags": ["x"]}]
+        >>> default = diff_pipelines(pipe1, pipe2, comparisons=comparisons)
+        >>> ds = diff_pipelines(pipe1, pipe2, name="ds", comparisons=comparisons)
+        >>> ds.modified_nodes, comparisons.compared, comparisons.reused
+        (frozenset({'a'}), 1, 1)
+    """
+
+    def __init__(self, attrs: Tuple[str, ...] = DIFF_ATTRS) -> None:
+        self.attrs = attrs
+        self.reused = 0
+        self._changes: Dict[str, NodeChanges] = {}
+
+    @property
+    def compared(self) -> int:
+        return len(self._changes)
+
+    def compare(self, node_name: str, node1: Mapping, node2: Mapping) -> NodeChanges:
+        """Changed attributes of a node, compared on first use."""
+        if node_name in self._changes:
+            self.reused += 1
+            return self._changes[node_name]
+        changes = compare_nodes(node1, node2, self.attrs)
+        self._changes[node_name] = changes
+        return changes
+
+
+class DiffResult(NamedTuple):
+    """DiffResult.
+
+    Differences between two pipelines, see `diff_pipelines`.
+
+    Parameters
+    --------
+        name : str
+            name of the pipeline that was compared
+        nodes1 : Mapping[str, Dict]
+            nodes of the base pipeline by name
+        nodes2 : Mapping[str, Dict]
+            nodes of the compared pipeline by name
+        new_nodes : FrozenSet[str]
+            nodes only in the compared pipeline
+        dropped_nodes : FrozenSet[str]
+            nodes only in the base pipeline
+        common_nodes : FrozenSet[str]
+            nodes in both pipelines
+        modified_nodes : FrozenSet[str]
+            common nodes that differ in any attribute
+        attr_changes : Mapping[str, FrozenSet[Tuple[str, Tuple]]]
+            name and new value of each common node whose attribute changed,
+            for each of the compared attributes
+        renames : Tuple[Tuple[str, str], ...]
+            old and new name of each renamed node, renamed nodes are neither
+            new nor dropped
+    """
+
+    name: str
+    nodes1: Mapping[str, Dict]
+    nodes2: Mapping[str, Dict]
+    new_nodes: FrozenSet[str]
+    dropped_nodes: FrozenSet[str]
+    common_nodes: FrozenSet[str]
+    modified_nodes: FrozenSet[str]
+    attr_changes: Mapping[str, FrozenSet[AttrChange]]
+    renames: Tuple[Tuple[str, str], ...] = ()
+
+    @property
+    def all_nodes(self) -> List[str]:
+        return sorted(self.nodes1.keys() | self.nodes2.keys())
+
+    @property
+    def num_attr_changes(self) -> int:
+        return sum(len(changes) for changes in self.attr_changes.values())
+
+    @property
+    def num_changes(self) -> int:
+        return (
+            len(self.new_nodes)
+            + len(self.dropped_nodes)
+            + len(self.renames)
+            + self.num_attr_changes * 2
+        )
+
+    @property
+    def num_adds(self) -> int:
+        return len(self.new_nodes) + self.num_attr_changes
+
+    @property
+    def num_drops(self) -> int:
+        return len(self.dropped_nodes) + self.num_attr_changes
+
+    def changed_nodes(self) -> Iterator[Tuple[str, Optional[Dict], Optional[Dict]]]:
+        """
+        Name and both versions of every new, dropped, modified or renamed node,
+        sorted.  Renamed nodes are yielded under their new name.
+        """
+        old_names = {new_name: old_name for old_name, new_name in self.renames}
+        changed = (
+            self.new_nodes | self.dropped_nodes | self.modified_nodes | old_names.keys()
+        )
+        for name in sorted(changed):
+            node1 = self.nodes1.get(old_names.get(name, name))
+            yield name, node1, self.nodes2.get(name)
+
+
+def unchanged_result(pipe: Iterable[Dict], name: str = "__default__") -> DiffResult:
+    """Result of a pipeline that is known to be identical in both snapshots."""
+    nodes = MappingProxyType(index_nodes(pipe))
+    return DiffResult(
+        name=name,
+        nodes1=nodes,
+        nodes2=nodes,
+        new_nodes=frozenset(),
+        dropped_nodes=frozenset(),
+        common_nodes=frozenset(nodes),
+        modified_nodes=frozenset(),
+        attr_changes=MappingProxyType({attr: frozenset() for attr in DIFF_ATTRS}),
+    )
+
+
+def diff_pipelines(
+    pipe1: Iterable[Dict],
+    pipe2: Iterable[Dict],
+    name: str = "__default__",
+    attrs: Tuple[str, ...] = DIFF_ATTRS,
+    find_renames: bool = False,
+    rename_threshold: float = 0.5,
+    hashes1: Optional[Mapping[str, str]] = None,
+    hashes2: Optional[Mapping[str, str]] = None,
+    same_namespaces: AbstractSet[str] = frozenset(),
+    comparisons: Optional[NodeComparisons] = None,
+) -> DiffResult:
+    """
+    Diff two pipelines in a single pass.
+
+    Parameters
+    --------
+        pipe1 : Iterable[Dict]
+            node dicts of the base pipeline, as in `pipeline.to_json()`
+        pipe2 : Iterable[Dict]
+            node dicts of the pipeline to compare to the base pipeline
+        name : str
+            name of the pipeline that is being compared
+        attrs : Tuple[str, ...]
+            node attributes to compare
+        find_renames : bool
+            pair dropped and new nodes that were renamed or moved, see
+            `kedro_diff.renames.find_renames`
+        rename_threshold : float
+            minimum similarity of a renamed pair that is not identical
+        hashes1 : Mapping[str, str]
+            node hashes of the base pipeline by name, see
+            `kedro_diff.fingerprint`, nodes with the same hash in both
+            pipelines are not compared
+        hashes2 : Mapping[str, str]
+            node hashes of the compared pipeline by name
+        same_namespaces : AbstractSet[str]
+            namespaces whose nodes are known to be identical in both pipelines,
+            their nodes are not compared
+        comparisons : NodeComparisons
+            node comparisons shared with the diffs of the other pipelines of
+            the same snapshots, it must compare the same attrs
+
+    Returns
+    --------
+        DiffResult
+            the differences between both pipelines
+
+    Examples
+    --------
+        >>> from kedro_diff.sample_data import create_simple_sample
+        >>> result = diff_pipelines(
+        ...     create_simple_sample(2)["pipeline"], create_simple_sample(3)["pipeline"]
+        ... )
+        >>> sorted(result.new_nodes), result.num_changes
+        (['node3'], 1)
+    """
+    if comparisons is None:
+        comparisons = NodeComparisons(attrs)
+    elif comparisons.attrs != attrs:
+        raise ValueError(
+            f"comparisons of {comparisons.attrs} can not be used to compare {attrs}"
+        )
+    nodes1 = index_nodes(pipe1)
+    nodes2 = index_nodes(pipe2)
+    new_nodes: Set[str] = set()
+    common_nodes: Set[str] = set()
+    modified_nodes: Set[str] = set()
+    attr_changes: Dict[str, Set[AttrChange]] = {attr: set() for attr in attrs}
+    for node_name, node2 in nodes2.items():
+        node1 = nodes1.get(node_name)
+        if node1 is None:
+            new_nodes.add(node_name)
+            continue
+        common_nodes.add(node_name)
+        if same_namespaces and not same_namespaces.isdisjoint(namespaces_of(node2)):
+            continue
+        if hashes1 is not None and hashes2 is not None:
+            hash1 = hashes1.get(node_name)
+            if hash1 is not None and hash1 == hashes2.get(node_name):
+                continue
+        changes = comparisons.compare(node_name, node1, node2)
+        if changes is None:
+            continue
+        modified_nodes.add(node_name)
+        for attr, value2 in changes:
+            attr_changes[attr].add((node_name, value2))
+    dropped_nodes = nodes1.keys() - nodes2.keys()
+    renames: List[Tuple[str, str]] = []
+    if find_renames and new_nodes and dropped_nodes:
+        renames = renames_of(
+            {node_name: nodes1[node_name] for node_name in dropped_nodes},
+            {node_name: nodes2[node_name] for node_name in new_nodes},
+            threshold=rename_threshold,
+        )
+        dropped_nodes -= {old_name for old_name, _ in renames}
+        new_nodes -= {new_name for _, new_name in renames}
+    return DiffResult(
+        name=name,
+        nodes1=MappingProxyType(nodes1),
+        nodes2=MappingProxyType(nodes2),
+        new_nodes=frozenset(new_nodes),
+        dropped_nodes=frozenset(dropped_nodes),
+        common_nodes=frozenset(common_nodes),
+        modified_nodes=frozenset(modified_nodes),
+        attr_changes=MappingProxyType(
+            {attr: frozenset(changes) for attr, changes in attr_changes.items()}
+        ),
+        renames=tuple(renames),
+    )
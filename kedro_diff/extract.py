@@ -0,0 +1,177 @@
+"""Extract.
+
+Serialize the pipelines, the catalog entries and the parameters of a loaded
+kedro project into a snapshot.  Shared by `kedro get-json` and the warm extraction worker.
+"""
+import inspect
+import json
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    Mapping,
+    Optional,
+    Union,
+    cast,
+)
+
+from kedro_diff.filters import DiffFilter
+from kedro_diff.fingerprint import snapshot_hashes
+from kedro_diff.functions import FunctionHasher, func_name
+from kedro_diff.snapshot import normalize, write_metadata, write_snapshot_file
+
+if TYPE_CHECKING:
+    from kedro.framework.context import KedroContext
+    from kedro.framework.session import KedroSession
+    from kedro.pipeline import Pipeline
+    from kedro.pipeline.node import Node
+
+
+def create_session(package_name: str, project_path: Path) -> "KedroSession":
+    """
+    Session of a bootstrapped project.  kedro 0.17 and 0.18 are given the
+    package name of the project, later versions read it from the project that
+    bootstrap_project configured.
+    """
+    from kedro.framework.session import KedroSession
+
+    # the signature depends on the installed kedro version
+    create = cast(Callable[..., "KedroSession"], KedroSession.create)
+    if "package_name" in inspect.signature(create).parameters:
+        return create(package_name, project_path=project_path)
+    return create(project_path=project_path)
+
+
+def project_pipelines(context: "KedroContext") -> Mapping[str, "Pipeline"]:
+    """
+    Registered pipelines of a loaded project.  kedro 0.17 serves them from the
+    context, later versions from `kedro.framework.project.pipelines`.
+    """
+    pipelines = getattr(context, "pipelines", None)
+    if pipelines is None:
+        from kedro.framework.project import pipelines as registered
+
+        pipelines = dict(registered)
+    return cast(Mapping[str, "Pipeline"], pipelines)
+
+
+def node_to_dict(node: "Node", hasher: Optional[FunctionHasher] = None) -> Dict:
+    """
+    Serialize a node the same way `pipeline.to_json()` does, along with its
+    namespace and the name and the hash of its function.
+    """
+    hasher = FunctionHasher() if hasher is None else hasher
+    return {
+        "name": node.name,
+        "namespace": node.namespace,
+        "func": func_name(node.func),
+        "func_hash": hasher.hash(node.func),
+        "inputs": list(node.inputs),
+        "outputs": list(node.outputs),
+        "tags": list(node.tags),
+    }
+
+
+def iter_node_dicts(
+    pipeline: "Pipeline",
+    serialized: Dict[str, Dict],
+    hasher: Optional[FunctionHasher] = None,
+) -> Iterator[Dict]:
+    """Node dicts of a pipeline, nodes already in serialized are reused."""
+    for node in pipeline.nodes:
+        if node.name not in serialized:
+            serialized[node.name] = node_to_dict(node, hasher)
+        yield serialized[node.name]
+
+
+def write_snapshot(
+    pipelines: Mapping[str, "Pipeline"],
+    root_dir: Union[str, Path],
+    commit: str,
+    sha: str,
+    key: str,
+    echo: Optional[Callable] = None,
+    snapshot_format: str = "json",
+    compression: Optional[str] = None,
+    pipeline_patterns: Iterable[str] = (),
+    catalog: Optional[Mapping[str, Dict]] = None,
+    parameters: Optional[Mapping[str, Dict]] = None,
+) -> Dict:
+    """
+    Write every pipeline into the snapshot stored under key, each node is
+    serialized and hashed once.  When pipeline patterns are given only the
+    matching pipelines are serialized.
+
+    Parameters
+    --------
+        pipelines : Mapping[str, Pipeline]
+            registered pipelines of the project
+        root_dir : str
+            directory containing the .kedro-diff directory
+        commit : str
+            name of the commit the pipelines were loaded from
+        sha : str
+            resolved sha of commit
+        key : str
+            snapshot key of commit
+        echo : Callable
+            called with the json of the snapshot when given
+        snapshot_format : str
+            one of SNAPSHOT_FORMATS
+        compression : str
+            compression of a binary snapshot
+        pipeline_patterns : Iterable[str]
+            glob patterns of the pipelines to write, empty for all
+        catalog : Mapping[str, Dict]
+            catalog entries of the project, see `kedro_diff.catalog`
+        parameters : Mapping[str, Dict]
+            parameters of the project, see `kedro_diff.parameters`
+
+    Returns
+    --------
+        dict
+            commit metadata of the snapshot
+
+    """
+    import kedro
+
+    diff_filter = DiffFilter(pipelines=tuple(pipeline_patterns))
+    selected = diff_filter.select_pipelines(pipelines.keys())
+    serialized: Dict[str, Dict] = {}
+    # function hashes of unchanged modules are reused from earlier commits
+    hasher = FunctionHasher(root_dir)
+    snapshot = normalize(
+        {
+            pipeline_name: iter_node_dicts(pipelines[pipeline_name], serialized, hasher)
+            for pipeline_name in selected
+        },
+        kedro_version=kedro.__version__,
+    )
+    snapshot["hashes"] = snapshot_hashes(snapshot)
+    if catalog is not None:
+        snapshot["catalog"] = dict(catalog)
+    if parameters is not None:
+        snapshot["parameters"] = dict(parameters)
+    if echo is not None:
+        echo(json.dumps(snapshot))
+    write_snapshot_file(
+        snapshot,
+        key,
+        root_dir,
+        snapshot_format=snapshot_format,
+        compression=compression,
+    )
+
+    diffmeta = {
+        "commit": commit,
+        "sha": sha,
+        "key": key,
+        "pipelines": selected,
+    }
+    if diff_filter.pipelines:
+        diffmeta["pipeline_patterns"] = list(diff_filter.pipelines)
+    write_metadata(diffmeta, root_dir)
+    return diffmeta
@@ -0,0 +1,105 @@
+"""Filters.
+
+Select the pipelines and nodes that a diff looks at.  Every filter is a list
+of glob patterns, a value matches when it matches any pattern of the filter
+and a node is selected when it matches every filter that is set.
+
+Pipeline filters are applied while extracting, so unselected pipelines are
+never serialized, node filters are applied by `KedroDiff` before comparing.
+"""
+from fnmatch import fnmatchcase
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Sequence, Tuple
+
+
+def matches(value: str, patterns: Iterable[str]) -> bool:
+    """Check if value matches any of the glob patterns."""
+    return any(fnmatchcase(value, pattern) for pattern in patterns)
+
+
+def namespaces_of(node: Mapping) -> Iterator[str]:
+    """
+    Namespace of a node, as stored at extraction, and every namespace
+    containing it.
+
+    Examples
+    --------
+        >>> list(namespaces_of({"name": "ds.models.fit", "namespace": "ds.models"}))
+        ['ds.models', 'ds']
+        >>> list(namespaces_of({"name": "ds.models.fit"}))
+        []
+    """
+    namespace = node.get("namespace")
+    while namespace:
+        yield namespace
+        namespace = namespace.rpartition(".")[0]
+
+
+class DiffFilter(NamedTuple):
+    """DiffFilter.
+
+    Glob patterns selecting pipelines and nodes, an empty filter selects
+    everything.
+
+    Parameters
+    --------
+        pipelines : Tuple[str, ...]
+            pipeline names
+        tags : Tuple[str, ...]
+            node tags, a node matches when any of its tags match
+        namespaces : Tuple[str, ...]
+            node namespaces, a pattern also matches nested namespaces
+        nodes : Tuple[str, ...]
+            node names
+
+    Examples
+    --------
+        >>> diff_filter = DiffFilter(pipelines=("data_*",), tags=("train",))
+        >>> diff_filter.select_pipelines(["__default__", "data_science"])
+        ['data_science']
+        >>> diff_filter.match_node({"name": "split", "tags": ["train"]})
+        True
+        >>> DiffFilter(namespaces=("ds",)).match_node(
+        ...     {"name": "ds.models.fit", "namespace": "ds.models"}
+        ... )
+        True
+    """
+
+    pipelines: Tuple[str, ...] = ()
+    tags: Tuple[str, ...] = ()
+    namespaces: Tuple[str, ...] = ()
+    nodes: Tuple[str, ...] = ()
+
+    @property
+    def filters_nodes(self) -> bool:
+        """True when any node filter is set."""
+        return bool(self.tags or self.namespaces or self.nodes)
+
+    def match_pipeline(self, pipeline_name: str) -> bool:
+        return not self.pipelines or matches(pipeline_name, self.pipelines)
+
+    def select_pipelines(self, pipeline_names: Iterable[str]) -> List[str]:
+        """Selected pipeline names, in their original order."""
+        return [name for name in pipeline_names if self.match_pipeline(name)]
+
+    def match_namespace(self, node: Mapping) -> bool:
+        return any(
+            matches(namespace, self.namespaces) for namespace in namespaces_of(node)
+        )
+
+    def match_node(self, node: Dict) -> bool:
+        """Check if a node dict, as in `pipeline.to_json()`, is selected."""
+        if self.nodes and not matches(node["name"], self.nodes):
+            return False
+        if self.tags and not any(
+            matches(tag, self.tags) for tag in node.get("tags") or []
+        ):
+            return False
+        if self.namespaces and not self.match_namespace(node):
+            return False
+        return True
+
+    def select_nodes(self, nodes: Sequence[Dict]) -> Sequence[Dict]:
+        """Selected node dicts, nodes are returned as is without node filters."""
+        if not self.filters_nodes:
+            return nodes
+        return [node for node in nodes if self.match_node(node)]
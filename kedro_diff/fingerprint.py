@@ -0,0 +1,202 @@
+"""Fingerprint.
+
+Content hashes of the nodes of a snapshot, rolled up Merkle style into a hash
+per namespace and per pipeline.  A node hash covers its name, inputs, outputs,
+tags, function name and function hash, a namespace hash covers every node of a pipeline under
+that namespace, nested namespaces included, and a pipeline hash covers every
+node of the pipeline.
+
+Hashes are computed once while extracting and stored in the snapshot, so two
+snapshots are compared hash first and only the nodes whose hashes differ are
+compared attribute by attribute.
+
+    "hashes": {
+        "nodes": ["<hash of node 0>", ...],
+        "pipelines": {"__default__": "<hash>"},
+        "namespaces": {"__default__": {"data_science": "<hash>"}}
+    }
+"""
+import hashlib
+import json
+from collections import defaultdict
+from typing import (
+    AbstractSet,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+)
+
+from kedro_diff.filters import namespaces_of
+
+# bytes of every hash, hashes are stored as hex
+DIGEST_SIZE = 16
+
+
+def digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def node_hash(node: Mapping) -> str:
+    """
+    Hash of the name, function, function hash, inputs, outputs and tags of a
+    node.
+
+    Examples
+    --------
+        >>> node_hash({"name": "a", "inputs": ["x"]}) == node_hash(
+        ...     {"name": "a", "inputs": ("x",)}
+        ... )
+        True
+    """
+    func = node.get("func")
+    fields = [
+        node["name"],
+        func if isinstance(func, str) else None,
+        node.get("func_hash"),
+        *(list(node.get(attr) or ()) for attr in ("inputs", "outputs", "tags")),
+    ]
+    return digest(json.dumps(fields, separators=(",", ":")).encode("utf-8"))
+
+
+def rollup(hashes: Iterable[str]) -> str:
+    """Hash of a set of node hashes, the order of the nodes does not matter."""
+    return digest("".join(sorted(hashes)).encode("ascii"))
+
+
+class PipelineHashes(NamedTuple):
+    """PipelineHashes.
+
+    What the hashes of two snapshots tell about one of their pipelines.
+
+    Parameters
+    --------
+        identical : bool
+            the pipeline has the same nodes in both snapshots
+        nodes1 : Mapping[str, str]
+            node hashes of the base pipeline by name, empty when identical
+        nodes2 : Mapping[str, str]
+            node hashes of the compared pipeline by name, empty when identical
+        same_namespaces : AbstractSet[str]
+            namespaces of the pipeline with the same nodes in both snapshots
+    """
+
+    identical: bool
+    nodes1: Mapping[str, str]
+    nodes2: Mapping[str, str]
+    same_namespaces: AbstractSet[str]
+
+
+class SnapshotHashes(NamedTuple):
+    """SnapshotHashes.
+
+    Hashes of a snapshot, see the module docstring.
+
+    Parameters
+    --------
+        nodes : Sequence[str]
+            hash of each node by node id
+        pipelines : Mapping[str, str]
+            hash of each pipeline
+        namespaces : Mapping[str, Mapping[str, str]]
+            hash of each namespace of each pipeline
+    """
+
+    nodes: Sequence[str]
+    pipelines: Mapping[str, str]
+    namespaces: Mapping[str, Mapping[str, str]]
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Mapping) -> "SnapshotHashes":
+        """
+        Stored hashes of a snapshot.  A snapshot dict written before hashes
+        were stored gets them computed and added to it.
+        """
+        hashes = snapshot.get("hashes")
+        if hashes is None:
+            hashes = snapshot_hashes(snapshot)
+            if isinstance(snapshot, MutableMapping):
+                snapshot["hashes"] = hashes
+        return cls(hashes["nodes"], hashes["pipelines"], hashes["namespaces"])
+
+    def pipeline_hash(self, pipeline_name: str) -> Optional[str]:
+        return self.pipelines.get(pipeline_name)
+
+    def same_pipeline(self, other: "SnapshotHashes", pipeline_name: str) -> bool:
+        """True when a pipeline exists in both snapshots with the same nodes."""
+        pipeline_hash = self.pipeline_hash(pipeline_name)
+        return pipeline_hash is not None and pipeline_hash == other.pipeline_hash(
+            pipeline_name
+        )
+
+    def same_namespaces(self, other: "SnapshotHashes", pipeline_name: str) -> Set[str]:
+        """Namespaces of a pipeline whose nodes are identical in both snapshots."""
+        namespaces = self.namespaces.get(pipeline_name, {})
+        other_namespaces = other.namespaces.get(pipeline_name, {})
+        return {
+            namespace
+            for namespace, namespace_hash in namespaces.items()
+            if other_namespaces.get(namespace) == namespace_hash
+        }
+
+    def by_name(self, snapshot: Mapping, pipeline_name: str) -> Dict[str, str]:
+        """Hash of each node of a pipeline by node name."""
+        nodes = snapshot["nodes"]
+        return {
+            nodes[node_id]["name"]: self.nodes[node_id]
+            for node_id in snapshot["pipelines"].get(pipeline_name, ())
+        }
+
+
+def compare(
+    snapshot1: Mapping, snapshot2: Mapping, pipeline_name: str
+) -> PipelineHashes:
+    """
+    Compare the hashes of a pipeline of two snapshots.  The node hashes are
+    only looked up when the pipeline hashes differ.
+    """
+    hashes1 = SnapshotHashes.from_snapshot(snapshot1)
+    hashes2 = SnapshotHashes.from_snapshot(snapshot2)
+    if hashes1.same_pipeline(hashes2, pipeline_name):
+        return PipelineHashes(True, {}, {}, frozenset())
+    return PipelineHashes(
+        identical=False,
+        nodes1=hashes1.by_name(snapshot1, pipeline_name),
+        nodes2=hashes2.by_name(snapshot2, pipeline_name),
+        same_namespaces=frozenset(hashes1.same_namespaces(hashes2, pipeline_name)),
+    )
+
+
+def snapshot_hashes(snapshot: Mapping) -> Dict:
+    """
+    Hash every node of a normalized snapshot and roll the hashes up per
+    namespace and per pipeline.
+
+    Examples
+    --------
+        >>> from kedro_diff.snapshot import normalize
+        >>> nodes = [{"name": "ds.a", "namespace": "ds"}, {"name": "b"}]
+        >>> hashes = snapshot_hashes(normalize({"__default__": nodes}))
+        >>> len(hashes["nodes"]), list(hashes["namespaces"]["__default__"])
+        (2, ['ds'])
+    """
+    nodes = snapshot["nodes"]
+    hashes = [node_hash(node) for node in nodes]
+    pipelines = {}
+    namespaces = {}
+    for pipeline_name, node_ids in snapshot["pipelines"].items():
+        pipelines[pipeline_name] = rollup(hashes[node_id] for node_id in node_ids)
+        members: Dict[str, List[str]] = defaultdict(list)
+        for node_id in node_ids:
+            for namespace in namespaces_of(nodes[node_id]):
+                members[namespace].append(hashes[node_id])
+        namespaces[pipeline_name] = {
+            namespace: rollup(namespace_hashes)
+            for namespace, namespace_hashes in sorted(members.items())
+        }
+    return {"nodes": hashes, "pipelines": pipelines, "namespaces": namespaces}
@@ -0,0 +1,154 @@
+"""Functions.
+
+Hashes of the functions that nodes run, so a diff tells when the
+implementation of a node changed while its name, inputs and outputs did not.
+A function is hashed from the ast of its source, so comments and formatting
+do not change its hash.  Only the function itself is hashed, not the
+functions it calls.
+
+Every function of a module is hashed at once, the first time a node needs
+one of them, and the hashes are cached under the git blob id of the module
+(see `kedro_diff.blob_cache`), so a history scan only parses the modules that
+a commit changed.  Functions without python source, and lambdas, are hashed
+from their bytecode instead.
+"""
+import ast
+import functools
+import inspect
+import sys
+from pathlib import Path
+from types import CodeType, ModuleType
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from kedro_diff.blob_cache import BlobCache, data_blob_id
+from kedro_diff.fingerprint import digest
+
+FUNCTION_DEFS = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+
+def source_hashes(source: Union[str, bytes]) -> Dict[str, str]:
+    """
+    Hash of every function and method of a module by qualified name.
+
+    Examples
+    --------
+        >>> hashes = source_hashes("class A:\\n    def f(self):\\n        pass\\n")
+        >>> list(hashes)
+        ['A.f']
+        >>> source_hashes("def f(): pass  # a comment") == source_hashes("def f(): pass")
+        True
+    """
+    hashes: Dict[str, str] = {}
+
+    def visit(node: ast.AST, prefix: str) -> None:
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, FUNCTION_DEFS):
+                qualname = prefix + child.name
+                # a function defined twice is the last definition at runtime
+                hashes[qualname] = digest(ast.dump(child).encode("utf-8"))
+                visit(child, qualname + ".<locals>.")
+            elif isinstance(child, ast.ClassDef):
+                visit(child, prefix + child.name + ".")
+            else:
+                visit(child, prefix)
+
+    visit(ast.parse(source), "")
+    return hashes
+
+
+def code_hash(code: CodeType) -> str:
+    """Hash of the bytecode, names and constants of a code object."""
+    parts: List[bytes] = []
+
+    def walk(code: CodeType) -> None:
+        parts.append(code.co_code)
+        parts.append(repr(code.co_names).encode("utf-8"))
+        for const in code.co_consts:
+            if isinstance(const, CodeType):
+                walk(const)
+            elif isinstance(const, frozenset):
+                # set order depends on the string hash seed
+                parts.append(repr(sorted(map(repr, const))).encode("utf-8"))
+            else:
+                parts.append(repr(const).encode("utf-8"))
+
+    walk(code)
+    return digest(b"\0".join(parts))
+
+
+def unwrap(func: Callable) -> Callable:
+    """The function that actually runs for a partial, decorated or callable."""
+    while isinstance(func, functools.partial):
+        func = func.func
+    func = inspect.unwrap(func)
+    if not inspect.isroutine(func) and callable(func):
+        func = type(func).__call__
+    return getattr(func, "__func__", func)
+
+
+def func_name(func: Callable) -> str:
+    """
+    Name of a node function, partials and decorated functions are named after
+    the function they wrap.
+
+    Examples
+    --------
+        >>> func_name(functools.partial(sorted, reverse=True))
+        'sorted'
+    """
+    func = unwrap(func)
+    return getattr(func, "__qualname__", None) or type(func).__qualname__
+
+
+class FunctionHasher:
+    """FunctionHasher.
+
+    Hashes node functions, each module is read once per hasher and parsed
+    once per blob.
+
+    Parameters
+    --------
+        root_dir : str
+            directory containing the .kedro-diff directory, module hashes are
+            only kept in memory without it
+    """
+
+    def __init__(self, root_dir: Optional[Union[str, Path]] = None) -> None:
+        self.cache = None if root_dir is None else BlobCache(root_dir, "functions")
+        self._modules: Dict[str, Dict[str, str]] = {}
+
+    def module_hashes(self, module: ModuleType) -> Dict[str, str]:
+        """Function hashes of a module, empty when its source can not be read."""
+        filename = getattr(module, "__file__", None)
+        loader = getattr(module, "__loader__", None)
+        if not filename or not filename.endswith(".py"):
+            return {}
+        if filename not in self._modules:
+            try:
+                # the git importer serves source through its loader too
+                source = loader.get_data(filename)  # type: ignore
+            except (AttributeError, OSError):
+                self._modules[filename] = {}
+                return {}
+            key = data_blob_id(source)
+            hashes = None if self.cache is None else self.cache.get(key)
+            if hashes is None:
+                hashes = source_hashes(source)
+                if self.cache is not None:
+                    self.cache.put(key, hashes)
+            self._modules[filename] = hashes
+        return self._modules[filename]
+
+    def hash(self, func: Any) -> Optional[str]:
+        """Hash of the implementation of a node function, None when unknown."""
+        if not callable(func):
+            return None
+        func = unwrap(func)
+        module = sys.modules.get(getattr(func, "__module__", None) or "")
+        qualname = getattr(func, "__qualname__", "")
+        if module is not None and "<lambda>" not in qualname:
+            func_hash = self.module_hashes(module).get(qualname)
+            if func_hash is not None:
+                return func_hash
+        code = getattr(func, "__code__", None)
+        return None if code is None else code_hash(code)
@@ -2,14 +2,56 @@
 
 Get json from a specific commit
 """
+import contextlib
+import hashlib
 import os
+import queue
 import shutil
 import subprocess
+import tarfile
 import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Optional, Union
+from typing import (
+    Callable,
+    ContextManager,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 
+from kedro_diff.errors import KedroDiffError
 from kedro_diff.logger import get_logger
+from kedro_diff.snapshot import (
+    SNAPSHOT_DIR,
+    SNAPSHOT_SCHEMA,
+    SnapshotOptions,
+    clean_name,
+    is_valid,
+)
+from kedro_diff.worker import ExtractionWorker
+
+CHECKOUT_MODES = ("worktree", "archive", "copy", "objects")
+
+# paths, relative to the kedro project, that are needed to build pipelines,
+# commits that agree on all of them share a snapshot
+SPARSE_PATHS = [
+    "src",
+    "conf",
+    "pyproject.toml",
+    ".kedro.yml",
+    "setup.cfg",
+]
+
+# paths written to disk in objects mode, python is imported from git objects
+CONF_PATHS = [
+    "conf",
+    "pyproject.toml",
+    ".kedro.yml",
+    "setup.cfg",
+]
 
 
 def copytree(
@@ -35,32 +77,448 @@ def copytree(
             shutil.copy2(s, d)
 
 
-def to_json(project_path: Union[str, Path], commit: str, verbose: int = 0) -> None:
-    """Get json from specific commit."""
+def git(*args: str, cwd: Union[str, Path]) -> str:
+    """Run a git command in cwd and return its stripped stdout."""
+    return (
+        subprocess.check_output(["git", *args], cwd=str(cwd), stderr=subprocess.PIPE)
+        .strip()
+        .decode("utf-8")
+    )
+
+
+def resolve_sha(project_path: Union[str, Path], commit: str) -> str:
+    """Resolve a commit-ish into a full commit sha."""
+    try:
+        return git(
+            "rev-parse", "--verify", "--quiet", f"{commit}^{{commit}}", cwd=project_path
+        )
+    except subprocess.CalledProcessError:
+        raise KedroDiffError(f"{commit} is not a valid commit")
+
+
+def snapshot_key(
+    project_path: Union[str, Path], sha: str, pipeline_patterns: Iterable[str] = ()
+) -> str:
+    """
+    Hash the pipeline relevant tree of a commit.
+
+    The key only depends on the git object ids of SPARSE_PATHS and on
+    SNAPSHOT_SCHEMA, so commits that only touch data, docs or notebooks share
+    the same key.  A snapshot extracted with pipeline patterns only holds the
+    matching pipelines, so each set of patterns gets a key of its own.
+    """
+    tree = git("ls-tree", sha, "--", *SPARSE_PATHS, cwd=project_path)
+    text = f"{SNAPSHOT_SCHEMA}\n{tree}"
+    patterns = sorted(set(pipeline_patterns))
+    if patterns:
+        text += "\n" + "\n".join(patterns)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def git_root(project_path: Union[str, Path]) -> Path:
+    """Top level directory of the git repo containing project_path."""
+    return Path(git("rev-parse", "--show-toplevel", cwd=project_path))
+
+
+def git_prefix(project_path: Union[str, Path]) -> str:
+    """Path of project_path relative to the root of its git repo."""
+    return git("rev-parse", "--show-prefix", cwd=project_path)
+
+
+def git_common_dir(project_path: Union[str, Path]) -> Path:
+    """The .git directory shared by a repo and all of its worktrees."""
+    return (
+        Path(project_path) / git("rev-parse", "--git-common-dir", cwd=project_path)
+    ).resolve()
 
+
+def copy_local_conf(project_path: Union[str, Path], project_dir: Path) -> None:
+    """Copy untracked local config (credentials) into a materialized project."""
+    local_conf = Path(project_path) / "conf" / "local"
+    if local_conf.is_dir():
+        target = project_dir / "conf" / "local"
+        if target.exists():
+            shutil.rmtree(str(target))
+        shutil.copytree(str(local_conf), str(target))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _acquire_slot(pool_dir: Path, max_slots: int) -> Optional[int]:
+    """Lock the first free worktree slot in the pool, None when all are in use."""
+    pool_dir.mkdir(parents=True, exist_ok=True)
+    for slot in range(max_slots):
+        lock = pool_dir / f"{slot}.lock"
+        try:
+            fd = os.open(str(lock), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                pid = int(lock.read_text() or 0)
+            except (OSError, ValueError):
+                continue
+            if pid and _pid_alive(pid):
+                continue
+            # the process holding this slot died, take it over
+            lock.unlink()
+            try:
+                fd = os.open(str(lock), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+        os.write(fd, str(os.getpid()).encode("utf-8"))
+        os.close(fd)
+        return slot
+    return None
+
+
+@contextlib.contextmanager
+def copy_checkout(
+    project_path: Union[str, Path], sha: str, verbose: int = 0
+) -> Iterator[Path]:
+    """Copy the whole project into a tempdir and check out sha."""
+    logger = get_logger(verbose=verbose)
     with tempfile.TemporaryDirectory() as tmpdirname:
-        logger = get_logger(verbose=verbose)
         logger.info(f"copying {project_path} into {tmpdirname}")
         copytree(project_path, tmpdirname)
         subprocess.call(
-            f'git checkout "{commit}" --force --quiet', shell=True, cwd=tmpdirname
+            f'git checkout "{sha}" --force --quiet', shell=True, cwd=tmpdirname
+        )
+        yield Path(tmpdirname)
+
+
+@contextlib.contextmanager
+def worktree_checkout(
+    project_path: Union[str, Path],
+    sha: str,
+    verbose: int = 0,
+    max_slots: Optional[int] = None,
+) -> Iterator[Path]:
+    """Check out sha into a warm worktree from a pool shared across runs.
+
+    Worktrees share the object store of the project repo, so checking out a
+    commit only writes the files that differ from the last commit the
+    worktree held.  The pool holds at most max_slots worktrees, one per cpu
+    by default, sha is exported like archive_checkout does when every
+    worktree is in use.
+    """
+    logger = get_logger(verbose=verbose)
+    root = git_root(project_path)
+    prefix = git_prefix(project_path)
+    # the pool sits in .git so that the worktrees are never part of the tree
+    pool_dir = git_common_dir(project_path) / "kedro-diff" / "worktrees"
+    max_slots = max_slots or os.cpu_count() or 1
+    slot = _acquire_slot(pool_dir, max_slots)
+    if slot is None:
+        logger.info(f"all {max_slots} worktrees in {pool_dir} are in use")
+        with archive_checkout(project_path, sha, verbose=verbose) as project_dir:
+            yield project_dir
+        return
+    worktree = pool_dir / str(slot)
+    try:
+        if (worktree / ".git").exists():
+            logger.info(f"reusing worktree {worktree} for {sha}")
+            git("checkout", "--force", "--detach", "--quiet", sha, cwd=worktree)
+            git("clean", "-fdq", cwd=worktree)
+        else:
+            logger.info(f"creating worktree {worktree} for {sha}")
+            if worktree.exists():
+                shutil.rmtree(str(worktree))
+            git("worktree", "prune", cwd=root)
+            git("worktree", "add", "--detach", "--force", str(worktree), sha, cwd=root)
+        project_dir = worktree / prefix
+        copy_local_conf(project_path, project_dir)
+        yield project_dir
+    finally:
+        (pool_dir / f"{slot}.lock").unlink()
+
+
+@contextlib.contextmanager
+def archive_checkout(
+    project_path: Union[str, Path],
+    sha: str,
+    verbose: int = 0,
+    paths: Optional[List[str]] = None,
+) -> Iterator[Path]:
+    """Export only the tracked paths, SPARSE_PATHS by default, of sha into a tempdir."""
+    logger = get_logger(verbose=verbose)
+    # both ls-tree and archive take and return paths relative to project_path
+    tracked = git(
+        "ls-tree", "--name-only", sha, "--", *(paths or SPARSE_PATHS), cwd=project_path
+    ).splitlines()
+    if not tracked:
+        raise KedroDiffError(f"{sha} does not contain a kedro project")
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        logger.info(f"exporting {', '.join(tracked)} from {sha} into {tmpdirname}")
+        proc = subprocess.Popen(
+            ["git", "archive", "--format=tar", sha, "--", *tracked],
+            cwd=str(project_path),
+            stdout=subprocess.PIPE,
         )
+        with tarfile.open(fileobj=proc.stdout, mode="r|") as archive:
+            archive.extractall(tmpdirname)
+        if proc.wait() != 0:
+            raise KedroDiffError(f"could not export {sha} from {project_path}")
+        copy_local_conf(project_path, Path(tmpdirname))
+        yield Path(tmpdirname)
 
-        pipeline_path = (Path() / ".kedro-diff").absolute()
-        if verbose < 1:
-            subprocess.call(
-                f"kedro get-json --output '{pipeline_path}' --commit '{commit}' --quiet",
-                shell=True,
-                cwd=tmpdirname,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
+
+def checkout(
+    project_path: Union[str, Path], sha: str, mode: str = "worktree", verbose: int = 0
+) -> ContextManager[Path]:
+    """Materialize sha of the project using one of CHECKOUT_MODES."""
+    if mode == "worktree":
+        return worktree_checkout(project_path, sha, verbose=verbose)
+    if mode == "archive":
+        return archive_checkout(project_path, sha, verbose=verbose)
+    if mode == "copy":
+        return copy_checkout(project_path, sha, verbose=verbose)
+    if mode == "objects":
+        return archive_checkout(project_path, sha, verbose=verbose, paths=CONF_PATHS)
+    raise KedroDiffError(f"checkout mode must be one of {CHECKOUT_MODES}, got {mode}")
+
+
+def get_json_command(
+    pipeline_path: Path, commit: str, sha: str, key: str, options: SnapshotOptions
+) -> List[str]:
+    return [
+        "kedro",
+        "get-json",
+        "--output",
+        str(pipeline_path),
+        "--commit",
+        commit,
+        "--sha",
+        sha,
+        "--key",
+        key,
+        *options.to_args(),
+        "--quiet",
+    ]
+
+
+def to_json(
+    project_path: Union[str, Path],
+    commit: str,
+    verbose: int = 0,
+    mode: str = "worktree",
+    worker: Optional[ExtractionWorker] = None,
+    options: SnapshotOptions = SnapshotOptions(),
+) -> str:
+    """Get json from specific commit.
+
+    Extraction is skipped when a complete snapshot with the same snapshot_key
+    already exists, the key is returned either way.  Snapshots are written by
+    worker when one is given, otherwise by a new `kedro get-json` process.
+    The objects mode imports the project package from git objects inside of
+    a worker, a one off worker is started when none is given.
+    """
+    if mode == "objects" and worker is None:
+        with ExtractionWorker(verbose=verbose) as one_off_worker:
+            return to_json(
+                project_path,
+                commit,
+                verbose,
+                mode,
+                worker=one_off_worker,
+                options=options,
             )
+
+    logger = get_logger(verbose=verbose)
+    sha = resolve_sha(project_path, commit)
+    key = snapshot_key(project_path, sha, options.pipeline_patterns)
+    if is_valid(key):
+        logger.info(f"reusing snapshot {key} for {commit} ({sha})")
+        return key
+    pipeline_path = (Path() / SNAPSHOT_DIR).absolute()
+
+    with checkout(project_path, sha, mode=mode, verbose=verbose) as project_dir:
+        if worker is not None:
+            response = worker.extract(
+                project_dir,
+                pipeline_path,
+                commit,
+                sha,
+                key,
+                options,
+                repo_path=Path(project_path).absolute() if mode == "objects" else None,
+            )
+            log, error = response["log"], response.get("error")
         else:
-            subprocess.call(
-                f"kedro get-json --output '{pipeline_path}' --commit '{commit}' --quiet",
-                shell=True,
-                cwd=tmpdirname,
+            proc = subprocess.run(
+                get_json_command(pipeline_path, commit, sha, key, options),
+                cwd=str(project_dir),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+            log = proc.stdout.decode("utf-8", "replace")
+            error = f"kedro get-json exited with {proc.returncode}"
+            if proc.returncode == 0:
+                error = None
+    # output is logged once the extraction is done so that commits extracted
+    # concurrently never interleave their logs
+    commit_logger = logger.getChild(clean_name(commit))
+    for line in log.splitlines():
+        commit_logger.info(line)
+    if error is not None:
+        commit_logger.warning(error)
+    return key
+
+
+class ExtractionPool:
+    """ExtractionPool.
+
+    Extracts commits concurrently, each through `to_json`.  Workers are
+    started once and kept until the pool is closed, so a caller that decides
+    what to extract next from what it extracted so far, such as
+    `kedro diff bisect`, reuses them across submits.
+
+    Parameters
+    --------
+        project_path : str
+            path to the kedro project
+        jobs : int
+            number of commits extracted concurrently
+        verbose : int
+            verbosity level
+        mode : str
+            one of CHECKOUT_MODES
+        warm : bool
+            extract through long lived ExtractionWorkers, one per job
+        preload : List[str]
+            modules each worker imports once when it starts
+        options : SnapshotOptions
+            how new snapshots are written
+
+    Examples
+    --------
+        >>> with ExtractionPool(".", jobs=2) as pool:
+        ...     future = pool.submit("main")
+        ...     key = future.result()
+    """
+
+    def __init__(
+        self,
+        project_path: Union[str, Path],
+        jobs: int = 1,
+        verbose: int = 0,
+        mode: str = "worktree",
+        warm: bool = False,
+        preload: Optional[List[str]] = None,
+        options: SnapshotOptions = SnapshotOptions(),
+    ) -> None:
+        self.project_path = project_path
+        self.jobs = jobs
+        self.verbose = verbose
+        self.mode = mode
+        self.warm = warm
+        self.preload = preload
+        self.options = options
+        self._stack = contextlib.ExitStack()
+        self._workers: "queue.Queue[Optional[ExtractionWorker]]" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=jobs)
+
+    def __enter__(self) -> "ExtractionPool":
+        for _ in range(self.jobs):
+            self._workers.put(
+                self._stack.enter_context(
+                    ExtractionWorker(self.preload, verbose=self.verbose)
+                )
+                if self.warm or self.mode == "objects"
+                else None
+            )
+        # running extractions finish before their workers are closed
+        self._stack.callback(self._executor.shutdown)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stack.close()
+
+    def _run(self, commit: str) -> str:
+        worker = self._workers.get()
+        try:
+            return to_json(
+                self.project_path,
+                commit,
+                self.verbose,
+                self.mode,
+                worker=worker,
+                options=self.options,
             )
+        finally:
+            self._workers.put(worker)
+
+    def submit(self, commit: str) -> "Future[str]":
+        """Extract commit in the background, the future holds its snapshot key."""
+        return self._executor.submit(self._run, commit)
+
+
+def extract(
+    project_path: Union[str, Path],
+    commits: List[str],
+    jobs: Optional[int] = None,
+    verbose: int = 0,
+    mode: str = "worktree",
+    warm: bool = False,
+    preload: Optional[List[str]] = None,
+    options: SnapshotOptions = SnapshotOptions(),
+) -> List[str]:
+    """
+    Get json from several commits concurrently.
+
+    Parameters
+    --------
+        project_path : str
+            path to the kedro project
+        commits : List[str]
+            commits to extract
+        jobs : int
+            maximum number of concurrent extractions, defaults to the number of
+            cpus
+        verbose : int
+            verbosity level
+        mode : str
+            one of CHECKOUT_MODES
+        warm : bool
+            extract through long lived ExtractionWorkers, one per job
+        preload : List[str]
+            modules each worker imports once when it starts
+        options : SnapshotOptions
+            how new snapshots are written
+
+    Returns
+    --------
+        List[str]
+            the snapshot key of each commit
+
+    """
+    keys = [
+        snapshot_key(
+            project_path, resolve_sha(project_path, commit), options.pipeline_patterns
+        )
+        for commit in commits
+    ]
+    # extract each snapshot once, even when several commits share it
+    pending = {}
+    for commit, key in zip(commits, keys):
+        if key not in pending and not is_valid(key):
+            pending[key] = commit
+    if not pending:
+        return keys
+
+    num_workers = min(jobs or os.cpu_count() or 1, len(pending))
+    with ExtractionPool(
+        project_path, num_workers, verbose, mode, warm, preload, options
+    ) as pool:
+        for future in [pool.submit(commit) for commit in pending.values()]:
+            future.result()
+    return keys
 
 
 if __name__ == "__main__":
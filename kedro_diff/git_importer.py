@@ -0,0 +1,183 @@
+"""Git Importer.
+
+Import python packages straight from the git objects of a commit, without a
+checkout.  Only the blobs of the modules that python actually imports are
+read, through a single `git cat-file --batch` process.
+"""
+import importlib.abc
+import importlib.util
+import subprocess
+import sys
+from importlib.machinery import ModuleSpec
+from pathlib import Path, PurePosixPath
+from typing import Optional, Sequence, Set, Union
+
+from kedro_diff.errors import KedroDiffError
+
+
+class GitTree:
+    """GitTree.
+
+    Read only view of the files below a directory of a commit.
+
+    Parameters
+    --------
+        repo_path : str
+            any directory inside the git repo, paths are relative to it
+        sha : str
+            commit to read files from
+        root : str
+            directory of the commit to expose, relative to repo_path
+    """
+
+    def __init__(self, repo_path: Union[str, Path], sha: str, root: str = ".") -> None:
+        self.repo_path = Path(repo_path)
+        self.sha = sha
+        self.root = PurePosixPath(root)
+        prefix = self._git("rev-parse", "--show-prefix")
+        self.blob_prefix = PurePosixPath(prefix) / self.root if prefix else self.root
+        listing = self._git("ls-tree", "-r", "--name-only", sha, "--", str(self.root))
+        self.files: Set[str] = {
+            str(PurePosixPath(path).relative_to(self.root))
+            for path in listing.splitlines()
+        }
+        self.dirs: Set[str] = {
+            str(parent)
+            for path in self.files
+            for parent in PurePosixPath(path).parents
+            if str(parent) != "."
+        }
+        self._batch: Optional[subprocess.Popen] = None
+
+    def _git(self, *args: str) -> str:
+        return (
+            subprocess.check_output(["git", *args], cwd=str(self.repo_path))
+            .decode("utf-8")
+            .strip()
+        )
+
+    def read(self, path: str) -> bytes:
+        """Read the blob at path, relative to root."""
+        if path not in self.files:
+            raise FileNotFoundError(path)
+        if self._batch is None:
+            self._batch = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=str(self.repo_path),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+        assert self._batch.stdin is not None and self._batch.stdout is not None
+        self._batch.stdin.write(f"{self.sha}:{self.blob_prefix / path}\n".encode())
+        self._batch.stdin.flush()
+        header = self._batch.stdout.readline().split()
+        if len(header) != 3 or header[1] != b"blob":
+            raise KedroDiffError(f"could not read {path} from {self.sha}")
+        data = self._batch.stdout.read(int(header[2]))
+        self._batch.stdout.read(1)  # trailing newline
+        return data
+
+    def close(self) -> None:
+        """Stop the cat-file process."""
+        if self._batch is not None:
+            assert self._batch.stdin is not None
+            self._batch.stdin.close()
+            self._batch.wait()
+            self._batch = None
+
+
+class GitLoader(importlib.abc.SourceLoader):
+    """Load module source from a GitTree."""
+
+    def __init__(self, tree: GitTree, origin: Path) -> None:
+        self.tree = tree
+        self.origin = origin
+
+    def get_filename(self, fullname: str) -> str:
+        module_path = fullname.replace(".", "/")
+        if module_path + "/__init__.py" in self.tree.files:
+            return str(self.origin / module_path / "__init__.py")
+        return str(self.origin / (module_path + ".py"))
+
+    def get_data(self, path: Union[str, bytes]) -> bytes:
+        relative = Path(str(path)).relative_to(self.origin)
+        return self.tree.read(relative.as_posix())
+
+
+class GitImporter(importlib.abc.MetaPathFinder):
+    """GitImporter.
+
+    Meta path finder that serves the top level packages of a GitTree,
+    shadowing any copy of them found on sys.path.
+
+    Parameters
+    --------
+        tree : GitTree
+            the source directory of a commit
+        origin : str
+            path that module filenames are reported under, it does not have to
+            exist
+
+    Examples
+    --------
+        >>> with GitImporter(GitTree(".", sha, "src"), "src"):
+        ...     import my_project.pipeline_registry
+    """
+
+    def __init__(self, tree: GitTree, origin: Union[str, Path]) -> None:
+        self.tree = tree
+        self.origin = Path(origin)
+        self.loader = GitLoader(tree, self.origin)
+        self.packages = {
+            parts[0] if len(parts) > 1 else parts[0][: -len(".py")]
+            for parts in (PurePosixPath(path).parts for path in tree.files)
+            if len(parts) > 1 or parts[0].endswith(".py")
+        }
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Optional[Sequence[Union[bytes, str]]] = None,
+        target: Optional[object] = None,
+    ) -> Optional[ModuleSpec]:
+        if fullname.split(".")[0] not in self.packages:
+            return None
+        module_path = fullname.replace(".", "/")
+        if module_path in self.tree.dirs:
+            if module_path + "/__init__.py" not in self.tree.files:
+                # namespace packages are left to the regular finders
+                return None
+            spec = importlib.util.spec_from_loader(
+                fullname,
+                self.loader,
+                origin=self.loader.get_filename(fullname),
+                is_package=True,
+            )
+            assert spec is not None
+            spec.submodule_search_locations = [str(self.origin / module_path)]
+            spec.has_location = True
+            return spec
+        if module_path + ".py" in self.tree.files:
+            spec = importlib.util.spec_from_loader(
+                fullname, self.loader, origin=self.loader.get_filename(fullname)
+            )
+            assert spec is not None
+            spec.has_location = True
+            return spec
+        return None
+
+    def purge(self) -> None:
+        """Drop any module imported through this importer."""
+        for name in list(sys.modules):
+            if name.split(".")[0] in self.packages:
+                del sys.modules[name]
+
+    def __enter__(self) -> "GitImporter":
+        sys.meta_path.insert(0, self)
+        self.purge()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        sys.meta_path.remove(self)
+        self.purge()
+        self.tree.close()
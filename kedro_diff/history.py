@@ -0,0 +1,118 @@
+"""History.
+
+Walk a range of commits and summarize the pipeline changes each commit made.
+Every commit is compared to its first parent, commits that share a snapshot
+key with their parent did not touch src or conf and are skipped without
+extracting anything.
+
+Snapshots are written to the .kedro-diff cache as soon as each commit is
+extracted, so an interrupted `kedro diff log` resumes from the commits that
+are still missing.
+"""
+from pathlib import Path
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from kedro_diff.commit_parser import parse_commit
+from kedro_diff.get_pipelines import git, snapshot_key
+
+
+class LogEntry(NamedTuple):
+    """A commit of a range along with its first parent."""
+
+    sha: str
+    parent: Optional[str]
+    subject: str
+    key: str
+    parent_key: Optional[str]
+
+    @property
+    def changes_pipelines(self) -> bool:
+        """True when src or conf differ from the parent."""
+        return self.key != self.parent_key
+
+
+def rev_list(
+    project_path: Union[str, Path],
+    commit: Union[str, Tuple[str, ...]],
+    first_parent: bool = False,
+) -> List[Tuple[str, Optional[str], str]]:
+    """
+    Commits of a range, oldest first.
+
+    Parameters
+    --------
+        project_path : str
+            path to the kedro project
+        commit : str
+            range of commits, in any form accepted by `parse_commit`
+        first_parent : bool
+            only follow the first parent of merge commits
+
+    Returns
+    --------
+        List[Tuple[str, str, str]]
+            sha, first parent sha (None for a root commit) and subject of each
+            commit
+
+    """
+    commit1, commit2 = parse_commit(commit)
+    args = ["log", "--reverse", "--format=%H%x09%P%x09%s"]
+    if first_parent:
+        args.append("--first-parent")
+    output = git(*args, f"{commit1}..{commit2}", cwd=project_path)
+    commits = []
+    for line in output.splitlines():
+        sha, parents, subject = line.split("\t", 2)
+        commits.append((sha, parents.split()[0] if parents else None, subject))
+    return commits
+
+
+def log_entries(
+    project_path: Union[str, Path],
+    commit: Union[str, Tuple[str, ...]],
+    first_parent: bool = False,
+    pipeline_patterns: Iterable[str] = (),
+) -> List[LogEntry]:
+    """
+    Commits of a range along with the snapshot keys of each commit and its
+    first parent, oldest first.  Keys are those of snapshots extracted with
+    pipeline_patterns.
+    """
+    keys: Dict[str, str] = {}
+
+    def key_of(sha: str) -> str:
+        if sha not in keys:
+            keys[sha] = snapshot_key(project_path, sha, pipeline_patterns)
+        return keys[sha]
+
+    return [
+        LogEntry(
+            sha=sha,
+            parent=parent,
+            subject=subject,
+            key=key_of(sha),
+            parent_key=key_of(parent) if parent is not None else None,
+        )
+        for sha, parent, subject in rev_list(project_path, commit, first_parent)
+    ]
+
+
+def commits_to_extract(entries: List[LogEntry]) -> Iterator[str]:
+    """Each commit, parents included, needed to diff the changed entries."""
+    seen = set()
+    for entry in entries:
+        if not entry.changes_pipelines:
+            continue
+        for sha in (entry.parent, entry.sha):
+            if sha is not None and sha not in seen:
+                seen.add(sha)
+                yield sha
@@ -0,0 +1,147 @@
+"""Impact.
+
+Find every node downstream of the changes of a diff, and turn them into a
+`kedro run` selection that only reruns the affected part of a pipeline.
+
+The lineage comes from the inputs and outputs stored in the snapshots, a
+dataset to consumer index is built once per snapshot and shared by every
+pipeline of it.
+"""
+import shlex
+from collections import defaultdict
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Set, Tuple
+
+from kedro_diff.engine import DiffResult
+
+
+class DatasetIndex(NamedTuple):
+    """Nodes consuming each dataset of a snapshot."""
+
+    consumers: Mapping[str, Tuple[str, ...]]
+
+    @classmethod
+    def from_nodes(cls, nodes: Iterable[Mapping]) -> "DatasetIndex":
+        consumers: Dict[str, List[str]] = defaultdict(list)
+        for node in nodes:
+            for dataset in node.get("inputs") or ():
+                consumers[dataset].append(node["name"])
+        return cls({dataset: tuple(names) for dataset, names in consumers.items()})
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Mapping) -> "DatasetIndex":
+        return cls.from_nodes(snapshot["nodes"])
+
+
+class Impact(NamedTuple):
+    """Impact.
+
+    Nodes of a pipeline affected by a diff.
+
+    Parameters
+    --------
+        pipeline : str
+            name of the pipeline
+        changed_nodes : Tuple[str, ...]
+            new, modified and renamed nodes
+        changed_datasets : Tuple[str, ...]
+            outputs of changed and dropped nodes, before and after the change
+        affected_nodes : Tuple[str, ...]
+            changed nodes and every node downstream of them, in pipeline order
+        from_nodes : Tuple[str, ...]
+            the affected nodes that no other affected node leads to, running
+            from them reruns every affected node
+    """
+
+    pipeline: str
+    changed_nodes: Tuple[str, ...]
+    changed_datasets: Tuple[str, ...]
+    affected_nodes: Tuple[str, ...]
+    from_nodes: Tuple[str, ...]
+
+    def run_command(self, from_nodes: bool = False) -> str:
+        """
+        `kedro run` command that reruns the affected nodes, an empty string
+        when nothing is affected.
+
+        With from_nodes the run starts at from_nodes and kedro runs everything
+        downstream of them, otherwise exactly the affected nodes are selected.
+        """
+        if not self.affected_nodes:
+            return ""
+        option, nodes = (
+            ("--from-nodes", self.from_nodes)
+            if from_nodes
+            else ("--nodes", self.affected_nodes)
+        )
+        return " ".join(
+            [
+                "kedro run",
+                "--pipeline",
+                shlex.quote(self.pipeline),
+                option,
+                shlex.quote(",".join(nodes)),
+            ]
+        )
+
+
+def impact(result: DiffResult, index: DatasetIndex) -> Impact:
+    """
+    Nodes of the compared pipeline affected by a diff.
+
+    Parameters
+    --------
+        result : DiffResult
+            the diff, see `KedroDiff.result`
+        index : DatasetIndex
+            dataset index of the snapshot the compared pipeline belongs to
+
+    Returns
+    --------
+        Impact
+            changed and downstream nodes
+
+    Examples
+    --------
+        >>> from kedro_diff.engine import diff_pipelines
+        >>> from kedro_diff.sample_data import create_simple_sample
+        >>> pipe1 = create_simple_sample(3)["pipeline"]
+        >>> pipe2 = create_simple_sample(3, tagged=False)["pipeline"][:1] + pipe1[1:]
+        >>> result = diff_pipelines(pipe1, pipe2)
+        >>> impact(result, DatasetIndex.from_nodes(pipe2)).run_command()
+        'kedro run --pipeline __default__ --nodes node1,node2,node3'
+    """
+    renamed = {new_name for _, new_name in result.renames}
+    changed_nodes = result.new_nodes | result.modified_nodes | renamed
+    changed_datasets: Set[str] = set()
+    for name in changed_nodes:
+        changed_datasets.update(result.nodes2[name].get("outputs") or ())
+    for name in result.dropped_nodes | result.modified_nodes:
+        changed_datasets.update(result.nodes1[name].get("outputs") or ())
+    for old_name, _ in result.renames:
+        changed_datasets.update(result.nodes1[old_name].get("outputs") or ())
+
+    # seeds are changed nodes and nodes reading a changed dataset, every node
+    # reached from a seed is affected
+    seeds = set(changed_nodes)
+    for dataset in changed_datasets:
+        seeds.update(index.consumers.get(dataset, ()))
+    seeds &= result.nodes2.keys()
+    reached: Set[str] = set()
+    stack = list(seeds)
+    while stack:
+        node = result.nodes2[stack.pop()]
+        for dataset in node.get("outputs") or ():
+            for consumer in index.consumers.get(dataset, ()):
+                if consumer not in reached and consumer in result.nodes2:
+                    reached.add(consumer)
+                    stack.append(consumer)
+
+    affected = seeds | reached
+    in_order = [name for name in result.nodes2 if name in affected]
+    return Impact(
+        pipeline=result.name,
+        changed_nodes=tuple(name for name in in_order if name in changed_nodes),
+        changed_datasets=tuple(sorted(changed_datasets)),
+        affected_nodes=tuple(in_order),
+        from_nodes=tuple(name for name in in_order if name not in reached),
+    )
@@ -0,0 +1,264 @@
+"""Matrix.
+
+Compare many commits or branches at once.  The nodes of a pipeline are lined
+up across every ref, and each ref becomes a column holding a version code
+per node: 0 when the node is missing from the ref, otherwise the number of
+the distinct node hash (see `kedro_diff.fingerprint`) in the order the refs
+are given.  The change count of two refs is the number of nodes whose codes
+differ, so every pair of refs is compared in one pass over the columns
+instead of one `KedroDiff` per pair.
+
+Only the nodes whose codes differ are read past their hash, each of their
+MATRIX_ATTRS gets version codes of its own, so the matrix shows which
+attribute of a node changed in which ref.
+
+numpy is used to compare the columns when it is installed
+(`pip install kedro-diff[matrix]`), otherwise the distinct rows of the
+columns are counted once and compared pairwise in python.
+"""
+from array import array
+from collections import Counter
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from kedro_diff.engine import DIFF_ATTRS, attr_value
+from kedro_diff.filters import DiffFilter
+from kedro_diff.fingerprint import SnapshotHashes
+
+ABSENT = 0
+
+# node attributes that get version codes, the function name along with the
+# attributes counted by `kedro diff --stat`
+MATRIX_ATTRS = ("func", *DIFF_ATTRS)
+
+# typecode of the version columns
+CODE = "I"
+
+
+def change_counts(columns: Sequence[Sequence[int]]) -> List[List[int]]:
+    """
+    Number of rows that differ between every pair of columns.
+
+    Examples
+    --------
+        >>> change_counts([[1, 1, 0], [1, 2, 0], [1, 2, 1]])
+        [[0, 1, 2], [1, 0, 1], [2, 1, 0]]
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return _change_counts_python(columns)
+    if not columns:
+        return []
+    codes = np.array(columns, dtype=np.uint32).reshape(len(columns), -1)
+    return [[int(n) for n in (codes != row).sum(axis=1)] for row in codes]
+
+
+def _change_counts_python(columns: Sequence[Sequence[int]]) -> List[List[int]]:
+    """change_counts without numpy, each distinct row is compared once."""
+    size = len(columns)
+    counts = [[0] * size for _ in range(size)]
+    for row, count in Counter(zip(*columns)).items():
+        for i in range(size):
+            for j in range(i + 1, size):
+                if row[i] != row[j]:
+                    counts[i][j] += count
+                    counts[j][i] += count
+    return counts
+
+
+def attr_versions(nodes: Sequence[Optional[Mapping]]) -> Dict[str, Tuple[int, ...]]:
+    """
+    Version codes of each of MATRIX_ATTRS of a node across refs, None where
+    the node is missing, for the attributes that differ between the refs.
+
+    Examples
+    --------
+        >>> attr_versions([{"name": "a", "tags": ["x"]}, None, {"name": "a"}])
+        {'tags': (1, 0, 2)}
+    """
+    changed = {}
+    for attr in MATRIX_ATTRS:
+        versions: Dict[Tuple, int] = {}
+        codes = tuple(
+            ABSENT
+            if node is None
+            else versions.setdefault(attr_value(node, attr), len(versions) + 1)
+            for node in nodes
+        )
+        if len(versions) > 1:
+            changed[attr] = codes
+    return changed
+
+
+class NodeMatrix(NamedTuple):
+    """NodeMatrix.
+
+    Versions of every node of a pipeline across several refs.
+
+    Parameters
+    --------
+        pipeline : str
+            name of the pipeline
+        refs : Tuple[str, ...]
+            the compared commits or branches
+        names : Tuple[str, ...]
+            every node of the pipeline in any of the refs, sorted
+        columns : Tuple[Sequence[int], ...]
+            version code of each node for each ref, ABSENT when missing
+        attrs : Mapping[str, Mapping[str, Tuple[int, ...]]]
+            version codes of the changed attributes of each changed node, see
+            `attr_versions`
+    """
+
+    pipeline: str
+    refs: Tuple[str, ...]
+    names: Tuple[str, ...]
+    columns: Tuple[Sequence[int], ...]
+    attrs: Mapping[str, Mapping[str, Tuple[int, ...]]]
+
+    @classmethod
+    def from_snapshots(
+        cls,
+        refs: Sequence[str],
+        snapshots: Sequence[Mapping],
+        pipeline: str = "__default__",
+        diff_filter: Optional[DiffFilter] = None,
+    ) -> "NodeMatrix":
+        """
+        Line up the nodes of a pipeline across the snapshots of each ref.
+
+        Only the names and hashes of the nodes are read, unless diff_filter
+        selects nodes by their tags, and the attributes of the nodes that
+        differ between refs.
+        """
+        diff_filter = diff_filter or DiffFilter()
+        hashes: List[Dict[str, str]] = []
+        node_ids: List[Dict[str, int]] = []
+        for snapshot in snapshots:
+            nodes = snapshot["nodes"]
+            ids = {
+                nodes[node_id]["name"]: node_id
+                for node_id in snapshot["pipelines"].get(pipeline, ())
+            }
+            if diff_filter.filters_nodes:
+                selected = diff_filter.select_nodes([nodes[i] for i in ids.values()])
+                ids = {node["name"]: ids[node["name"]] for node in selected}
+            node_hashes = SnapshotHashes.from_snapshot(snapshot).nodes
+            hashes.append({name: node_hashes[i] for name, i in ids.items()})
+            node_ids.append(ids)
+
+        names = tuple(sorted(set().union(*hashes)))
+        position = {name: i for i, name in enumerate(names)}
+        versions: List[Dict[str, int]] = [{} for _ in names]
+        columns = []
+        for ref_hashes in hashes:
+            column = array(CODE, [ABSENT]) * len(names)
+            for name, node_hash in ref_hashes.items():
+                i = position[name]
+                column[i] = versions[i].setdefault(node_hash, len(versions[i]) + 1)
+            columns.append(column)
+        attrs = {}
+        for name, row in zip(names, zip(*columns)):
+            if len(set(row)) > 1:
+                attrs[name] = attr_versions(
+                    [
+                        snapshot["nodes"][ids[name]] if name in ids else None
+                        for snapshot, ids in zip(snapshots, node_ids)
+                    ]
+                )
+        return cls(pipeline, tuple(refs), names, tuple(columns), attrs)
+
+    def changes(self) -> List[List[int]]:
+        """Number of nodes that are new, dropped or modified between each ref."""
+        return change_counts(self.columns)
+
+    def changed_nodes(self) -> List[Tuple[str, Tuple[int, ...]]]:
+        """Name and version codes of each node that differs between any refs."""
+        return [
+            (name, row)
+            for name, row in zip(self.names, zip(*self.columns))
+            if len(set(row)) > 1
+        ]
+
+    @property
+    def num_changed_nodes(self) -> int:
+        return len(self.changed_nodes())
+
+    def changed_attrs(self) -> List[Tuple[str, str, Tuple[int, ...]]]:
+        """Node name, attribute and version codes of each changed attribute."""
+        return [
+            (name, attr, codes)
+            for name, _ in self.changed_nodes()
+            for attr, codes in self.attrs[name].items()
+        ]
+
+    def to_record(self) -> Dict:
+        """Json record of the matrix, only nodes that differ are included."""
+        return {
+            "type": "matrix",
+            "pipeline": self.pipeline,
+            "refs": list(self.refs),
+            "changes": self.changes(),
+            "nodes": {name: list(row) for name, row in self.changed_nodes()},
+            "attrs": {
+                name: {attr: list(codes) for attr, codes in self.attrs[name].items()}
+                for name, _ in self.changed_nodes()
+            },
+        }
+
+
+def format_table(header: Sequence[str], rows: Sequence[Sequence[str]]) -> List[str]:
+    """Lines of a plain text table, every column padded to its widest cell."""
+    widths = [max(len(str(cell)) for cell in column) for column in zip(header, *rows)]
+    return [
+        "  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip()
+        for row in (header, *rows)
+    ]
+
+
+def version_label(code: int) -> str:
+    """Cell of the node table, `-` for a missing node."""
+    return "-" if code == ABSENT else f"v{code}"
+
+
+def matrix_lines(matrix: NodeMatrix, stat: bool = False) -> List[str]:
+    """
+    Plain text of a matrix, the change counts between each ref followed by
+    the version of each changed node in each ref, and the version of each
+    changed attribute of those nodes, unless stat.
+    """
+    lines = [f"pipeline: {matrix.pipeline}"]
+    lines.extend(
+        format_table(
+            ["", *matrix.refs],
+            [
+                [ref, *(str(count) for count in counts)]
+                for ref, counts in zip(matrix.refs, matrix.changes())
+            ],
+        )
+    )
+    changed = matrix.changed_nodes()
+    if changed and not stat:
+        lines.append("")
+        lines.extend(
+            format_table(
+                ["node", *matrix.refs],
+                [
+                    [name, *(version_label(code) for code in row)]
+                    for name, row in changed
+                ],
+            )
+        )
+        changed_attrs = matrix.changed_attrs()
+        if changed_attrs:
+            lines.append("")
+            lines.extend(
+                format_table(
+                    ["node", "attr", *matrix.refs],
+                    [
+                        [name, attr, *(version_label(code) for code in codes)]
+                        for name, attr, codes in changed_attrs
+                    ],
+                )
+            )
+    return lines
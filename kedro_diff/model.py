@@ -0,0 +1,156 @@
+"""Model.
+
+Compact in memory nodes of a loaded snapshot.  A node is a `NodeRecord`,
+a slotted object that holds its list attributes as tuples and reads like the
+node dict it was built from.  Every name, dataset and tag goes through a
+`StringTable`, so a string repeated across the nodes of a snapshot, or across
+the two snapshots of a diff, is held in memory once.
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+NODE_FIELDS = ("name", "namespace", "func", "func_hash", "inputs", "outputs", "tags")
+SCALAR_FIELDS = ("name", "namespace", "func", "func_hash")
+LIST_FIELDS = ("inputs", "outputs", "tags")
+
+
+def as_lists(node: Mapping) -> Dict[str, Any]:
+    """Copy of a node with every tuple turned into a list."""
+    return {
+        field: list(value) if isinstance(value, tuple) else value
+        for field, value in node.items()
+    }
+
+
+class StringTable:
+    """StringTable.
+
+    Hands out a single shared instance of each string.
+
+    Examples
+    --------
+        >>> strings = StringTable()
+        >>> a = strings.intern("".join(["raw", "_cars"]))
+        >>> strings.intern("raw_cars") is a
+        True
+    """
+
+    __slots__ = ("_strings",)
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+
+    def intern(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+    def intern_all(self, values: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+        """Interned tuple of values, None stays None."""
+        if values is None:
+            return None
+        setdefault = self._strings.setdefault
+        return tuple(setdefault(value, value) for value in values)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+
+class NodeRecord(Mapping):
+    """NodeRecord.
+
+    A node of a snapshot, see `kedro_diff.extract.node_to_dict`.  It is a
+    read only mapping of the fields that are set, so code written against
+    node dicts reads it unchanged.
+
+    Parameters
+    --------
+        name : str
+            node name
+        namespace : str
+            namespace of the node, None outside of any namespace
+        func : str
+            name of the node function
+        func_hash : str
+            hash of the node function, see `kedro_diff.functions`
+        inputs : Tuple[str, ...]
+            input datasets
+        outputs : Tuple[str, ...]
+            output datasets
+        tags : Tuple[str, ...]
+            node tags
+
+    Examples
+    --------
+        >>> node = NodeRecord("split", inputs=("raw",), outputs=("train", "test"))
+        >>> node["outputs"], node.get("tags"), sorted(node)
+        (('train', 'test'), None, ['inputs', 'name', 'outputs'])
+    """
+
+    __slots__ = NODE_FIELDS
+
+    def __init__(
+        self,
+        name: str,
+        namespace: Optional[str] = None,
+        func: Optional[str] = None,
+        func_hash: Optional[str] = None,
+        inputs: Optional[Tuple[str, ...]] = None,
+        outputs: Optional[Tuple[str, ...]] = None,
+        tags: Optional[Tuple[str, ...]] = None,
+    ) -> None:
+        self.name = name
+        self.namespace = namespace
+        self.func = func
+        self.func_hash = func_hash
+        self.inputs = inputs
+        self.outputs = outputs
+        self.tags = tags
+
+    @classmethod
+    def from_mapping(
+        cls, node: Mapping, strings: Optional[StringTable] = None
+    ) -> "NodeRecord":
+        """Record of a node dict, fields that are not NODE_FIELDS are dropped."""
+        strings = StringTable() if strings is None else strings
+        namespace = node.get("namespace")
+        func = node.get("func")
+        return cls(
+            name=strings.intern(node["name"]),
+            namespace=None if namespace is None else strings.intern(namespace),
+            func=None if func is None else strings.intern(func),
+            func_hash=node.get("func_hash"),
+            inputs=strings.intern_all(node.get("inputs")),
+            outputs=strings.intern_all(node.get("outputs")),
+            tags=strings.intern_all(node.get("tags")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Node dict of the record, with lists as in `pipeline.to_json()`."""
+        return as_lists(self)
+
+    def __getitem__(self, field: str) -> Any:
+        if field in NODE_FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                return value
+        raise KeyError(field)
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in NODE_FIELDS if getattr(self, field) is not None)
+
+    def __len__(self) -> int:
+        return sum(getattr(self, field) is not None for field in NODE_FIELDS)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, NodeRecord):
+            return all(
+                getattr(self, field) == getattr(other, field) for field in NODE_FIELDS
+            )
+        if isinstance(other, Mapping):
+            # a node dict holds lists where the record holds tuples
+            return self.to_dict() == as_lists(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"NodeRecord({dict(self.items())!r})"
@@ -1,6 +1,8 @@
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Tuple, Union
 
-from rich.console import Console
+from kedro_diff.render import Renderer, RichRenderer, node_change
+
+from .schema import node_fields
 
 if TYPE_CHECKING:
     from kedro.pipeline.node import Node
@@ -18,6 +20,7 @@ class NodeDiff:
         node2: Optional[Union[Dict, "Node"]] = None,
         name: Optional[str] = None,
         verbose_level: int = 1,
+        renderer: Optional[Renderer] = None,
     ) -> None:
         """
         verbose levels
@@ -25,12 +28,22 @@ class NodeDiff:
         1: (default) prints only node diffs
         2: prints regardless of equality
 
+        renderer is shared by every node of a diff, a rich renderer is
+        created when the node is diffed on its own.
         """
         self.node1 = node1
         self.node2 = node2
         self.name = name
-        self.console = Console()
+        self._renderer = renderer
         self.verbose_level = verbose_level
+        self._values1: Dict[str, Any] = {}
+        self._values2: Dict[str, Any] = {}
+
+    @property
+    def renderer(self) -> Renderer:
+        if self._renderer is None:
+            self._renderer = RichRenderer()
+        return self._renderer
 
     @property
     def is_changed(self) -> bool:
@@ -48,81 +61,70 @@ class NodeDiff:
     def is_deleted(self) -> bool:
         return self.node2 is None
 
+    @property
+    def is_renamed(self) -> bool:
+        if self.node1 is None or self.node2 is None:
+            return False
+        name1, name2 = self.get_attr("name")
+        return bool(name1 != name2)
+
     @property
     def attrs(self) -> List:
+        """Fields of both nodes, a field only set on the old node included."""
         if self.is_deleted:
-            _node = self.node1
-        else:
-            _node = self.node2
-
-        if _node is None:
-            return []
-        if isinstance(_node, dict):
-            _node_dict = _node
-            return [a for a in _node_dict.keys() if not a.startswith("_")]
-        return [a for a in dir(_node) if not a.startswith("_")]
-
-    def get_attr(self, attr: str) -> Tuple:
-
-        try:
-            if self.node1 is None:
-                attr1 = None
-            elif isinstance(self.node1, dict):
-                attr1 = self.node1[attr]
+            return list(node_fields(self.node1))
+        attrs = list(node_fields(self.node2))
+        if self.node1 is not None:
+            attrs.extend(attr for attr in node_fields(self.node1) if attr not in attrs)
+        return attrs
+
+    @staticmethod
+    def _read(node: Optional[Any], values: Dict[str, Any], attr: str) -> Any:
+        """Value of a field of a node, read at most once."""
+        if attr not in values:
+            if node is None:
+                values[attr] = None
+            elif isinstance(node, Mapping):
+                values[attr] = node.get(attr)
             else:
-                attr1 = getattr(self.node1, attr)
-        except KeyError:
-            attr1 = None
-
-        try:
-            if self.node2 is None:
-                attr2 = None
-            elif isinstance(self.node2, dict):
-                attr2 = self.node2[attr]
-            else:
-                attr2 = getattr(self.node2, attr)
-        except KeyError:
-            attr2 = None
+                values[attr] = getattr(node, attr, None)
+        return values[attr]
 
+    def get_attr(self, attr: str) -> Tuple:
+        attr1 = self._read(self.node1, self._values1, attr)
+        attr2 = self._read(self.node2, self._values2, attr)
         if callable(attr1) or callable(attr2):
             return None, None
         return attr1, attr2
 
     def diff_attr(self, attr: str) -> None:
         attr1, attr2 = self.get_attr(attr)
+        if attr == "func_hash":
+            # hashes mean nothing to people, only tell that the code changed
+            if attr1 is not None and attr2 is not None and attr1 != attr2:
+                self.renderer.message("    implementation changed")
+            return
         attr1 = "" if attr1 is None else attr1
         attr2 = "" if attr2 is None else attr2
         if attr1 != attr2:
-            attr_name = f"{attr}:      "[:10]
-            self.console.print(
-                f"[{self.diff_color}]    {attr_name} [red][strike]{attr1}[/strike] [green]{attr2}"
-            )
+            self.renderer.attr(self.change, attr, attr1, attr2)
 
     def diff_attrs(self) -> None:
         for attr in self.attrs:
             self.diff_attr(attr)
 
     @property
-    def diff_color(self) -> str:
-        if self.is_deleted:
-            return "red"
-        if self.is_new:
-            return "green"
-        return "gold1"
+    def change(self) -> str:
+        """Which of `kedro_diff.render.NODE_CHANGES` the node is."""
+        return node_change(self.node1, self.node2, self.is_renamed)
 
     def diff(self) -> None:
         if self.is_none:
             if self.verbose_level > 1:
-                self.console.print(f"[bright_black]  {self.name} is None")
+                self.renderer.message(f"  {self.name} is None")
         elif not self.is_changed:
             if self.verbose_level > 1:
-                self.console.print(f"[bright_black]  {self.name} is unchanged")
-        elif self.is_new:
-            self.console.print(f"[green]+ {self.name}")
-            self.diff_attrs()
-        elif self.is_deleted:
-            self.console.print(f"[red]- [strike]{self.name}[/strike]")
-            self.diff_attrs()
-        elif self.is_changed:
-            self.console.print(f"[green]+ [{self.diff_color}]{self.name}")
+                self.renderer.message(f"  {self.name} is unchanged")
+        else:
+            self.renderer.node(self.change, str(self.name))
             self.diff_attrs()
@@ -0,0 +1,39 @@
+"""Schema.
+
+Data fields of the nodes compared by `NodeDiff`.  The fields of a node class
+are its public properties, they are looked up once per class and cached, so
+comparing kedro `Node` objects never goes through `dir()` or touches their
+methods.  The fields of a node dict, or any other mapping such as a
+`kedro_diff.model.NodeRecord`, are its public keys.
+"""
+import functools
+import inspect
+from collections.abc import Mapping
+from typing import Any, Optional, Tuple
+
+# descriptors that expose data on a node class
+DATA_DESCRIPTORS: Tuple[type, ...] = tuple(
+    descriptor
+    for descriptor in (property, getattr(functools, "cached_property", None))
+    if descriptor is not None
+)
+
+
+@functools.lru_cache(maxsize=None)
+def class_fields(node_class: type) -> Tuple[str, ...]:
+    """Public data fields of a node class, sorted."""
+    return tuple(
+        name
+        for name in sorted(dir(node_class))
+        if not name.startswith("_")
+        and isinstance(inspect.getattr_static(node_class, name), DATA_DESCRIPTORS)
+    )
+
+
+def node_fields(node: Optional[Any]) -> Tuple[str, ...]:
+    """Data fields of a node dict or object, in the order they are diffed."""
+    if node is None:
+        return ()
+    if isinstance(node, Mapping):
+        return tuple(field for field in node if not field.startswith("_"))
+    return class_fields(node.__class__)
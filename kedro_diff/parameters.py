@@ -0,0 +1,186 @@
+"""Parameters.
+
+Parameter values of a kedro project, stored in the snapshot under dotted keys,
+the names `params:` inputs use for them.
+
+    "parameters": {
+        "files": {"base/parameters.yml": "<blob id>", "base/globals.yml": "<blob id>"},
+        "sources": {"model": "base/parameters.yml"},
+        "values": {"model": {"model.alpha": 0.1, "model.features": ["a"]}}
+    }
+
+Values are read through the config loader of the session, so templated values
+and globals are resolved the way the project resolves them.  They are resolved
+once per set of parameters and globals files and cached under the blob ids of
+those files (see `kedro_diff.blob_cache`), a commit that only changed src
+resolves no config at all.  The top level keys of each parameters file are
+cached per git blob id.
+
+Values are grouped by their top level key along with the file each top level
+key was read from, so two snapshots are only compared under the keys read
+from files whose blob differs, or under every key when a globals file differs.
+"""
+import json
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Set, Union
+
+from kedro_diff.blob_cache import BlobCache, blob_id, blobs_key, conf_files, conf_root
+
+if TYPE_CHECKING:
+    from kedro.framework.context import KedroContext
+
+PARAMETER_PREFIXES = ("parameters",)
+GLOBALS_PREFIXES = ("globals",)
+PARAMETER_SUFFIXES = (".yml", ".yaml", ".json")
+
+# kedro reads the environment from its default run environment when none is set
+DEFAULT_ENV = "local"
+
+
+def flatten(value: Any, prefix: str) -> Dict[str, Any]:
+    """
+    Value of every leaf of a parameter under its dotted key.
+
+    Examples
+    --------
+        >>> flatten({"alpha": 0.1, "layers": {"size": 8}, "empty": {}}, "model")
+        {'model.alpha': 0.1, 'model.layers.size': 8, 'model.empty': {}}
+    """
+    if not isinstance(value, Mapping) or not value:
+        return {prefix: value}
+    flat: Dict[str, Any] = {}
+    for key, child in value.items():
+        flat.update(flatten(child, f"{prefix}.{key}"))
+    return flat
+
+
+def parse_keys(path: Path) -> List[str]:
+    """Top level keys of a parameters file."""
+    text = path.read_text()
+    if path.suffix == ".json":
+        config = json.loads(text)
+    else:
+        import yaml
+
+        config = yaml.safe_load(text)
+    return [str(key) for key in config or {}]
+
+
+def resolve_values(context: "KedroContext") -> Dict[str, Dict[str, Any]]:
+    """
+    Flattened values of each top level parameter, as the project reads them.
+    Values that json has no type for, such as yaml dates, are kept as strings.
+    """
+    params = json.loads(json.dumps(dict(context.params), default=str))
+    return {str(key): flatten(value, str(key)) for key, value in params.items()}
+
+
+def is_globals(name: str) -> bool:
+    """Check if a conf file, relative to the conf directory, holds globals."""
+    return any(part.startswith(GLOBALS_PREFIXES) for part in Path(name).parts[1:])
+
+
+def load_parameters(
+    context: "KedroContext", root_dir: Optional[Union[str, Path]] = None
+) -> Dict:
+    """
+    Parameters of a loaded project, values are only resolved for a set of
+    parameters and globals files that was not resolved for an earlier commit.
+
+    Parameters
+    --------
+        context : KedroContext
+            context of the session that serializes the pipelines
+        root_dir : str
+            directory containing the .kedro-diff directory, values are
+            resolved every time without it
+
+    Returns
+    --------
+        dict
+            files, sources and values of the parameters, see the module
+            docstring
+
+    """
+    conf_dir = conf_root(context)
+    keys_cache = None if root_dir is None else BlobCache(root_dir, "parameter_keys")
+    values_cache = None if root_dir is None else BlobCache(root_dir, "parameter_values")
+    files: Dict[str, str] = {}
+    sources: Dict[str, str] = {}
+    envs = ["base", context.env or DEFAULT_ENV]
+    paths = [
+        path
+        for path in conf_files(conf_dir, PARAMETER_PREFIXES, envs=envs)
+        if path.suffix in PARAMETER_SUFFIXES
+    ]
+    for path in paths:
+        name = path.relative_to(conf_dir).as_posix()
+        files[name] = blob_id(path)
+        keys = None if keys_cache is None else keys_cache.get(files[name])
+        if keys is None:
+            keys = parse_keys(path)
+            if keys_cache is not None:
+                keys_cache.put(files[name], keys)
+        for key in keys:
+            sources[key] = name
+    globals_paths = conf_files(conf_dir, GLOBALS_PREFIXES, envs=envs)
+    for path in globals_paths:
+        files[path.relative_to(conf_dir).as_posix()] = blob_id(path)
+    values_key = blobs_key([*paths, *globals_paths], conf_dir, salt=str(context.env))
+    values = None if values_cache is None else values_cache.get(values_key)
+    if values is None:
+        values = resolve_values(context)
+        if values_cache is not None:
+            values_cache.put(values_key, values)
+    return {"files": files, "sources": sources, "values": values}
+
+
+def changed_keys(parameters1: Mapping, parameters2: Mapping) -> Set[str]:
+    """
+    Top level keys that may differ between two snapshots, the keys read from
+    a file that was added, removed or changed on either side, every key once
+    a globals file changed.
+
+    Examples
+    --------
+        >>> parameters1 = {"files": {"a.yml": "1", "b.yml": "2"},
+        ...                "sources": {"x": "a.yml", "y": "b.yml"}}
+        >>> parameters2 = {"files": {"a.yml": "1", "b.yml": "3"},
+        ...                "sources": {"x": "a.yml", "y": "b.yml", "z": "b.yml"}}
+        >>> sorted(changed_keys(parameters1, parameters2))
+        ['y', 'z']
+    """
+    files1 = parameters1.get("files") or {}
+    files2 = parameters2.get("files") or {}
+    changed = {
+        name
+        for name in files1.keys() | files2.keys()
+        if files1.get(name) != files2.get(name)
+    }
+    if any(is_globals(name) for name in changed):
+        # a globals value may be used by any parameter
+        return {
+            key
+            for parameters in (parameters1, parameters2)
+            for key in (parameters.get("values") or {})
+        }
+    return {
+        key
+        for parameters in (parameters1, parameters2)
+        for key, source in (parameters.get("sources") or {}).items()
+        if source in changed
+    }
+
+
+def parameter_nodes(parameters: Mapping, keys: Set[str]) -> List[Dict]:
+    """
+    Values under a set of top level keys as node like dicts, named after
+    their dotted key, so they are diffed like the nodes of a pipeline.  Values
+    are compared and shown as json.
+    """
+    values = parameters.get("values") or {}
+    return [
+        {"name": name, "value": json.dumps(value, sort_keys=True)}
+        for key in sorted(keys & values.keys())
+        for name, value in sorted(values[key].items())
+    ]
@@ -0,0 +1,135 @@
+"""Renames.
+
+Pair the dropped and new nodes of a diff that are most likely the same node
+under a new name or namespace.
+
+Nodes with an identical signature (inputs, outputs, tags and function) are
+paired first through a hash bucket per signature.  The remaining nodes are
+paired by the similarity of their attributes, candidates are only looked up
+through an inverted index of attribute values, so the work grows with the
+number of shared values instead of with every pair of nodes.
+"""
+from collections import Counter, defaultdict
+from typing import Dict, FrozenSet, Hashable, List, Mapping, Set, Tuple
+
+# node attributes that identify a node regardless of its name
+RENAME_ATTRS = ("inputs", "outputs", "tags")
+
+# attribute values shared by more nodes than this, such as a tag on every
+# node, say nothing about which node is which and are not indexed
+MAX_POSTING = 64
+
+Token = Tuple[str, Hashable]
+
+
+def base_name(name: str) -> str:
+    """Node name without its namespace."""
+    return name.rsplit(".", 1)[-1]
+
+
+def signature(node: Mapping) -> Tuple:
+    """Everything but the name of a node, as a hashable value."""
+    return (
+        *(frozenset(node.get(attr) or ()) for attr in RENAME_ATTRS),
+        node.get("func") if isinstance(node.get("func"), str) else None,
+    )
+
+
+def tokens(node: Mapping) -> FrozenSet[Token]:
+    """Attribute values of a node that are compared for similarity."""
+    values: Set[Token] = {
+        (attr, value) for attr in RENAME_ATTRS for value in node.get(attr) or ()
+    }
+    if isinstance(node.get("func"), str):
+        values.add(("func", node["func"]))
+    values.add(("base_name", base_name(node["name"])))
+    return frozenset(values)
+
+
+def similarity(tokens1: FrozenSet[Token], tokens2: FrozenSet[Token]) -> float:
+    """Jaccard similarity of the tokens of two nodes."""
+    if not tokens1 and not tokens2:
+        return 1.0
+    shared = len(tokens1 & tokens2)
+    return shared / (len(tokens1) + len(tokens2) - shared)
+
+
+def find_renames(
+    dropped: Mapping[str, Mapping],
+    new: Mapping[str, Mapping],
+    threshold: float = 0.5,
+) -> List[Tuple[str, str]]:
+    """
+    Pair dropped nodes with the new nodes they were renamed to.
+
+    Parameters
+    --------
+        dropped : Mapping[str, Mapping]
+            nodes only in the base pipeline by name
+        new : Mapping[str, Mapping]
+            nodes only in the compared pipeline by name
+        threshold : float
+            minimum similarity of a pair that is not identical
+
+    Returns
+    --------
+        List[Tuple[str, str]]
+            old and new name of each renamed node, sorted by the new name
+
+    Examples
+    --------
+        >>> find_renames(
+        ...     {"split": {"name": "split", "inputs": ["raw"], "outputs": ["train"]}},
+        ...     {"ds.split": {"name": "ds.split", "inputs": ["raw"], "outputs": ["train"]}},
+        ... )
+        [('split', 'ds.split')]
+    """
+    renames: Dict[str, str] = {}
+
+    # identical nodes, prefer a candidate with the same base name
+    buckets: Dict[Tuple, List[str]] = defaultdict(list)
+    for new_name in sorted(new):
+        buckets[signature(new[new_name])].append(new_name)
+    for old_name in sorted(dropped):
+        old_signature = signature(dropped[old_name])
+        bucket = buckets.get(old_signature)
+        # nodes without any attribute are not identical to each other
+        if not bucket or not any(old_signature):
+            continue
+        match = next(
+            (n for n in bucket if base_name(n) == base_name(old_name)), bucket[0]
+        )
+        bucket.remove(match)
+        renames[match] = old_name
+
+    # similar nodes, only candidates sharing an indexed token are scored
+    remaining_new = {name: tokens(new[name]) for name in new if name not in renames}
+    matched_old = set(renames.values())
+    index: Dict[Token, List[str]] = defaultdict(list)
+    for new_name, new_tokens in remaining_new.items():
+        for token in new_tokens:
+            index[token].append(new_name)
+    candidates: List[Tuple[float, str, str]] = []
+    for old_name in sorted(dropped):
+        if old_name in matched_old:
+            continue
+        old_tokens = tokens(dropped[old_name])
+        shared: Counter = Counter()
+        for token in old_tokens:
+            posting = index.get(token, ())
+            if len(posting) <= MAX_POSTING:
+                shared.update(posting)
+        for new_name in shared:
+            score = similarity(old_tokens, remaining_new[new_name])
+            if score >= threshold:
+                candidates.append((-score, old_name, new_name))
+
+    # best pairs first, each node is paired at most once
+    for _, old_name, new_name in sorted(candidates):
+        if old_name not in matched_old and new_name not in renames:
+            matched_old.add(old_name)
+            renames[new_name] = old_name
+    return sorted(
+        ((old_name, new_name) for new_name, old_name in renames.items()),
+        key=lambda pair: pair[1],
+    )
@@ -0,0 +1,485 @@
+"""Render.
+
+Output of a diff, either rendered for people or written as structured records.
+
+Renderers draw the stat and diff lines of every pipeline of a run.  A single
+renderer is shared by the whole run, `PlainRenderer` writes plain unified
+lines through a buffer and `RichRenderer` colors them with rich.  Both stop
+after `max_lines` and summarize what was left out.
+
+Structured output is one record per pipeline followed by one record per
+changed node of it.  Records are yielded while the diff is computed and
+written as soon as they are yielded, nothing is rendered with rich.
+
+    {"type": "pipeline", "pipeline": "__default__", "changes": 3, "adds": 2,
+     "drops": 1, "new": 1, "dropped": 0, "modified": 1, "renamed": 0}
+    {"type": "node", "pipeline": "__default__", "node": "node3",
+     "change": "new", "old_name": null,
+     "attrs": {"inputs": {"old": null, "new": ["output2"]}, ...}}
+
+The catalog and the parameters get the same records under the types of
+SECTIONS, parameter values are json.
+
+    {"type": "catalog", "changes": 2, "adds": 1, "drops": 1, "new": 0,
+     "dropped": 0, "modified": 1}
+    {"type": "dataset", "dataset": "cars", "change": "modified",
+     "attrs": {"filepath": {"old": "cars.csv", "new": "cars.parquet"}}}
+    {"type": "parameter", "parameter": "model.alpha", "change": "modified",
+     "attrs": {"value": {"old": "0.1", "new": "0.2"}}}
+
+Node changes are one of NODE_CHANGES.  The attrs of a node record hold every
+attribute that differs between both versions of the node, a missing node or
+attribute is null.  New fields may be added to records, existing fields keep
+their meaning.
+"""
+import abc
+import json
+import sys
+from collections import Counter
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Type
+
+from kedro_diff.engine import DiffResult
+
+NODE_CHANGES = ("new", "dropped", "modified", "renamed")
+OUTPUT_FORMATS = ("rich", "plain", "json", "ndjson")
+
+# record type of each section of a diff that is not a pipeline, and of the
+# items of the section
+SECTIONS = {"catalog": "dataset", "parameters": "parameter"}
+
+# lines kept by PlainRenderer before they are written at once
+BUFFER_LINES = 1024
+
+
+def node_change(
+    node1: Optional[Any], node2: Optional[Any], renamed: bool = False
+) -> str:
+    """Which of NODE_CHANGES a changed node is."""
+    if node1 is None:
+        return "new"
+    if node2 is None:
+        return "dropped"
+    if renamed:
+        return "renamed"
+    return "modified"
+
+
+def pipeline_record(result: DiffResult) -> Dict:
+    """Summary record of the diff of a pipeline."""
+    return {
+        "type": "pipeline",
+        "pipeline": result.name,
+        "changes": result.num_changes,
+        "adds": result.num_adds,
+        "drops": result.num_drops,
+        "new": len(result.new_nodes),
+        "dropped": len(result.dropped_nodes),
+        "modified": len(result.modified_nodes),
+        "renamed": len(result.renames),
+    }
+
+
+def attr_changes(node1: Optional[Dict], node2: Optional[Dict]) -> Dict:
+    """Old and new value of each attribute that differs between two nodes."""
+    attrs = {
+        attr
+        for node in (node1, node2)
+        if node is not None
+        for attr in node
+        if not attr.startswith("_")
+    }
+    changes = {}
+    for attr in sorted(attrs):
+        old = None if node1 is None else node1.get(attr)
+        new = None if node2 is None else node2.get(attr)
+        # functions are not serializable, they are compared by name instead
+        if callable(old) or callable(new) or old == new:
+            continue
+        changes[attr] = {"old": old, "new": new}
+    return changes
+
+
+def node_records(result: DiffResult) -> Iterator[Dict]:
+    """A record for each changed node of the diff of a pipeline."""
+    renamed = {new_name: old_name for old_name, new_name in result.renames}
+    for name, node1, node2 in result.changed_nodes():
+        yield {
+            "type": "node",
+            "pipeline": result.name,
+            "node": name,
+            "change": node_change(node1, node2, name in renamed),
+            "old_name": renamed.get(name),
+            "attrs": attr_changes(node1, node2),
+        }
+
+
+def diff_records(results: Iterable[DiffResult], stat: bool = False) -> Iterator[Dict]:
+    """
+    Records of the diffs of several pipelines, pipelines without changes
+    only get a pipeline record.  With stat only pipeline records are yielded.
+    """
+    for result in results:
+        yield pipeline_record(result)
+        if not stat:
+            yield from node_records(result)
+
+
+def section_records(result: DiffResult, stat: bool = False) -> Iterator[Dict]:
+    """
+    Records of the diff of the catalog or of the parameters, see
+    `KedroDiff.from_catalogs` and `KedroDiff.from_parameters`.  With stat only
+    the record of the section is yielded.
+    """
+    item = SECTIONS[result.name]
+    summary = pipeline_record(result)
+    yield {
+        "type": result.name,
+        **{
+            field: value
+            for field, value in summary.items()
+            if field not in ("type", "pipeline", "renamed")
+        },
+    }
+    if stat:
+        return
+    for record in node_records(result):
+        yield {
+            "type": item,
+            item: record["node"],
+            "change": record["change"],
+            "attrs": record["attrs"],
+        }
+
+
+class RecordWriter(abc.ABC):
+    """RecordWriter.
+
+    Writes records to a stream as they arrive.
+
+    Parameters
+    --------
+        stream : IO
+            text stream to write to
+    """
+
+    def __init__(self, stream: IO) -> None:
+        self.stream = stream
+
+    @abc.abstractmethod
+    def write(self, record: Dict) -> None:
+        """Write a single record."""
+
+    def close(self) -> None:
+        self.stream.flush()
+
+    def write_all(self, records: Iterable[Dict]) -> None:
+        """Write every record, then close the writer."""
+        for record in records:
+            self.write(record)
+        self.close()
+
+
+class NdjsonWriter(RecordWriter):
+    """One json record per line, each line is flushed as it is written."""
+
+    def write(self, record: Dict) -> None:
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+
+class JsonWriter(RecordWriter):
+    """A single json array, written one record at a time."""
+
+    def __init__(self, stream: IO) -> None:
+        super().__init__(stream)
+        self.count = 0
+
+    def write(self, record: Dict) -> None:
+        self.stream.write(("[\n" if self.count == 0 else ",\n") + json.dumps(record))
+        self.count += 1
+
+    def close(self) -> None:
+        self.stream.write("[]\n" if self.count == 0 else "\n]\n")
+        super().close()
+
+
+WRITERS: Dict[str, Type[RecordWriter]] = {"json": JsonWriter, "ndjson": NdjsonWriter}
+
+
+def stat_line(result: DiffResult, markup: bool = True) -> str:
+    """The `kedro diff --stat` line of the diff of a pipeline."""
+    colors = {"M": "red", "+": "green", "-": "red", "R": "blue"}
+    if not markup:
+        colors = {}
+
+    def color(key: str, text: str) -> str:
+        return f"[{colors[key]}]{text}[/{colors[key]}]" if key in colors else text
+
+    line = (
+        f"{color('M', 'M')} {result.name.ljust(30)[:30]} | {result.num_changes} "
+        f"{color('+', '+' * result.num_adds)}{color('-', '-' * result.num_drops)}"
+    )
+    if result.renames:
+        line += " " + color("R", f"({len(result.renames)} renamed)")
+    return line
+
+
+class Renderer(abc.ABC):
+    """Renderer.
+
+    Draws the diff of every pipeline of a run, lines past max_lines are left
+    out and summarized by `close`.
+
+    Parameters
+    --------
+        stream : IO
+            text stream to write to, stdout at the time of writing by default
+        max_lines : int
+            stop rendering after this many lines, no limit by default
+    """
+
+    # lines taken by the header of a pipeline
+    PIPELINE_LINES = 1
+
+    def __init__(self, stream: Optional[IO] = None, max_lines: Optional[int] = None):
+        self._stream = stream
+        self.max_lines = max_lines
+        self.lines = 0
+        self.full = False
+        self.skipped: Counter = Counter()
+
+    @property
+    def stream(self) -> IO:
+        return sys.stdout if self._stream is None else self._stream
+
+    @property
+    def truncated(self) -> bool:
+        """True once the next line would go past max_lines."""
+        return self.full
+
+    def _take(self, kind: Optional[str] = None, lines: int = 1) -> bool:
+        """Count the lines about to be rendered, False when they are left out."""
+        if not self.full and self.max_lines is not None:
+            self.full = self.lines + lines > self.max_lines
+        if self.full:
+            if kind is not None:
+                self.skipped[kind] += 1
+            return False
+        self.lines += lines
+        return True
+
+    def stat(self, result: DiffResult) -> None:
+        if self._take("pipeline"):
+            self.write_stat(result)
+
+    def pipeline(self, name: str) -> None:
+        """Header of the node diffs of a pipeline."""
+        if self._take("pipeline", lines=self.PIPELINE_LINES):
+            self.write_pipeline(name)
+
+    def node(self, change: str, name: str) -> None:
+        """First line of a changed node, change is one of NODE_CHANGES."""
+        if self._take(change):
+            self.write_node(change, name)
+
+    def attr(self, change: str, attr: str, old: Any, new: Any) -> None:
+        """Old and new value of an attribute of a changed node."""
+        # node records hold tuples, they are shown like the lists of node dicts
+        old = list(old) if isinstance(old, tuple) else old
+        new = list(new) if isinstance(new, tuple) else new
+        if self._take(lines=self.attr_lines(old, new)):
+            self.write_attr(change, attr, old, new)
+
+    def message(self, text: str) -> None:
+        """A line of text, such as a note about a node."""
+        if self._take():
+            self.write_message(text)
+
+    @property
+    def summary(self) -> str:
+        """What was left out once the output was truncated."""
+        nodes = ", ".join(
+            f"{self.skipped[change]} {change}"
+            for change in NODE_CHANGES
+            if self.skipped[change]
+        )
+        left_out = (
+            [f"{self.skipped['pipeline']} pipelines"]
+            if self.skipped["pipeline"]
+            else []
+        )
+        if nodes:
+            left_out.append(f"{nodes} nodes")
+        return f"... truncated after {self.max_lines} lines, not shown: " + ", ".join(
+            left_out
+        )
+
+    def close(self) -> None:
+        """Summarize the truncated output, then flush it."""
+        if self.skipped:
+            self.write_message(self.summary)
+        self.flush()
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+    def attr_lines(self, old: Any, new: Any) -> int:
+        """Number of lines `write_attr` writes."""
+        return 1
+
+    @abc.abstractmethod
+    def write_stat(self, result: DiffResult) -> None:
+        """Write the stat line of a pipeline."""
+
+    @abc.abstractmethod
+    def write_pipeline(self, name: str) -> None:
+        """Write the header of a pipeline."""
+
+    @abc.abstractmethod
+    def write_node(self, change: str, name: str) -> None:
+        """Write the first line of a changed node."""
+
+    @abc.abstractmethod
+    def write_attr(self, change: str, attr: str, old: Any, new: Any) -> None:
+        """Write the `attr_lines` lines of a changed attribute."""
+
+    @abc.abstractmethod
+    def write_message(self, text: str) -> None:
+        """Write a line of text."""
+
+
+class PlainRenderer(Renderer):
+    """Plain text in the style of a unified diff, written in chunks.
+
+    ``` text
+    modified: __default__
+    + node3
+        +inputs:  ['output2']
+    M node1
+        -outputs: ['output1']
+        +outputs: ['output1', 'extra']
+    ```
+    """
+
+    SIGNS = {"new": "+", "dropped": "-", "renamed": "R", "modified": "M"}
+
+    def __init__(self, stream: Optional[IO] = None, max_lines: Optional[int] = None):
+        super().__init__(stream, max_lines)
+        self.buffer: List[str] = []
+
+    def _write(self, line: str) -> None:
+        self.buffer.append(line)
+        if len(self.buffer) >= BUFFER_LINES:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.buffer:
+            self.stream.write("\n".join(self.buffer) + "\n")
+            self.buffer = []
+        super().flush()
+
+    def write_stat(self, result: DiffResult) -> None:
+        self._write(stat_line(result, markup=False))
+
+    def write_pipeline(self, name: str) -> None:
+        self._write(f"modified: {name}")
+
+    def write_node(self, change: str, name: str) -> None:
+        self._write(f"{self.SIGNS[change]} {name}")
+
+    def attr_lines(self, old: Any, new: Any) -> int:
+        return (old not in (None, "")) + (new not in (None, ""))
+
+    def write_attr(self, change: str, attr: str, old: Any, new: Any) -> None:
+        attr_name = f"{attr}:".ljust(9)
+        if old not in (None, ""):
+            self._write(f"    -{attr_name} {old}")
+        if new not in (None, ""):
+            self._write(f"    +{attr_name} {new}")
+
+    def write_message(self, text: str) -> None:
+        self._write(text)
+
+
+class RichRenderer(Renderer):
+    """Colored output through a single rich console, printed as it arrives."""
+
+    COLORS = {"new": "green", "dropped": "red", "renamed": "blue", "modified": "gold1"}
+    PIPELINE_LINES = 3
+
+    def __init__(self, stream: Optional[IO] = None, max_lines: Optional[int] = None):
+        from rich.console import Console
+
+        super().__init__(stream, max_lines)
+        self.console = Console(file=stream)
+
+    @property
+    def stream(self) -> IO:
+        return self.console.file
+
+    def write_stat(self, result: DiffResult) -> None:
+        self.console.print(stat_line(result))
+
+    def write_pipeline(self, name: str) -> None:
+        from rich.panel import Panel
+
+        self.console.print(
+            Panel(
+                f"modified: {name.ljust(88)}",
+                title="[bright_black]kedro-diff[/bright_black]",
+                title_align="right",
+                expand=False,
+            ),
+        )
+
+    def write_node(self, change: str, name: str) -> None:
+        from rich.text import Text
+
+        if change == "new":
+            line = Text.assemble(("+ ", "green"), (name, "green"))
+        elif change == "dropped":
+            line = Text.assemble(("- ", "red"), (name, "red strike"))
+        elif change == "renamed":
+            line = Text.assemble(("R ", "blue"), (name, "blue"))
+        else:
+            line = Text.assemble(("+ ", "green"), (name, "gold1"))
+        self.console.print(line)
+
+    def write_attr(self, change: str, attr: str, old: Any, new: Any) -> None:
+        from rich.text import Text
+
+        attr_name = f"{attr}:      "[:10]
+        self.console.print(
+            Text.assemble(
+                (f"    {attr_name} ", self.COLORS[change]),
+                (str(old), "red strike"),
+                " ",
+                (str(new), "green"),
+            )
+        )
+
+    def write_message(self, text: str) -> None:
+        from rich.text import Text
+
+        self.console.print(Text(text, style="bright_black"))
+
+
+RENDERERS: Dict[str, Type[Renderer]] = {"plain": PlainRenderer, "rich": RichRenderer}
+
+
+def get_renderer(
+    output_format: str, stream: Optional[IO] = None, max_lines: Optional[int] = None
+) -> Optional[Renderer]:
+    """Renderer of an output format, None for the structured formats."""
+    if output_format not in RENDERERS:
+        return None
+    renderer_class = RENDERERS[output_format]
+    return renderer_class(stream, max_lines=max_lines)
+
+
+def get_writer(output_format: str, stream: IO) -> Optional[RecordWriter]:
+    """Record writer of an output format, None for the rich output."""
+    if output_format not in WRITERS:
+        return None
+    writer_class = WRITERS[output_format]
+    return writer_class(stream)
@@ -0,0 +1,235 @@
+"""Snapshot.
+
+Locate the pipeline snapshots that `kedro get-json` writes into the
+.kedro-diff directory.  Snapshots are keyed by a hash of the pipeline relevant
+tree of a commit (see `kedro_diff.get_pipelines.snapshot_key`), so a branch
+that moves never reads stale pipelines, and any commit whose src and conf
+match an already extracted commit reuses its snapshot.
+
+A snapshot stores every node of a commit once, no matter how many pipelines
+it belongs to, along with the membership of each pipeline.  It is written
+either as json or in the binary format of `kedro_diff.binary_snapshot`, and
+its nodes are loaded as `kedro_diff.model.NodeRecord`.  The catalog entries
+and the parameters of the commit (see `kedro_diff.catalog` and
+`kedro_diff.parameters`) are stored next to the pipelines.
+
+    {
+        "kedro_version": "0.17.2",
+        "nodes": [{"name": "node1", "inputs": [], "outputs": [], "tags": []}],
+        "pipelines": {"__default__": [0], "data_science": [0]},
+        "catalog": {"output1": {"type": "pandas.CSVDataSet"}},
+        "parameters": {"files": {}, "sources": {}, "values": {}}
+    }
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple, Union
+
+from kedro_diff import binary_snapshot
+from kedro_diff.binary_snapshot import COLUMNS, BinarySnapshot
+from kedro_diff.model import NodeRecord, StringTable
+
+SNAPSHOT_DIR = ".kedro-diff"
+METADATA_FILE = "commit-metadata.json"
+SNAPSHOT_FILE = "snapshot.json"
+BINARY_SNAPSHOT_FILE = "snapshot.kds"
+SNAPSHOT_FORMATS = ("json", "binary")
+
+# version of what get-json extracts, it is part of every snapshot key so
+# snapshots extracted by an older kedro-diff are not reused
+SNAPSHOT_SCHEMA = 6
+
+
+class SnapshotOptions(NamedTuple):
+    """How `kedro get-json` writes a snapshot."""
+
+    snapshot_format: str = "json"
+    compression: Optional[str] = None
+    # glob patterns of the pipelines to serialize, empty for every pipeline
+    pipeline_patterns: Tuple[str, ...] = ()
+
+    def to_args(self) -> List[str]:
+        """Command line arguments of `kedro get-json` for these options."""
+        args = ["--format", self.snapshot_format]
+        if self.compression is not None:
+            args.extend(["--compression", self.compression])
+        for pattern in self.pipeline_patterns:
+            args.extend(["--pipeline", pattern])
+        return args
+
+
+def clean_name(name: str) -> str:
+    """Make a commit or pipeline name safe to use as a file name."""
+    return name.replace("/", "_").replace(" ", "_")
+
+
+def snapshot_path(key: str, root_dir: Union[str, Path] = ".") -> Path:
+    """Directory holding a snapshot."""
+    return (Path(root_dir) / SNAPSHOT_DIR / key).absolute()
+
+
+def metadata_path(key: str, root_dir: Union[str, Path] = ".") -> Path:
+    """Commit metadata file of a snapshot."""
+    return snapshot_path(key, root_dir) / METADATA_FILE
+
+
+def snapshot_file(
+    key: str, root_dir: Union[str, Path] = ".", snapshot_format: str = "json"
+) -> Path:
+    """Normalized pipeline file of a snapshot in one of SNAPSHOT_FORMATS."""
+    if snapshot_format == "binary":
+        return snapshot_path(key, root_dir) / BINARY_SNAPSHOT_FILE
+    return snapshot_path(key, root_dir) / SNAPSHOT_FILE
+
+
+def normalize(
+    pipelines: Mapping[str, Iterable[Dict]], kedro_version: Optional[str] = None
+) -> Dict:
+    """
+    Store the nodes of several pipelines once.
+
+    Parameters
+    --------
+        pipelines : Mapping[str, Iterable[Dict]]
+            node dicts, as in `pipeline.to_json()`, of each pipeline
+        kedro_version : str
+            version of kedro the pipelines were loaded with
+
+    Returns
+    --------
+        dict
+            snapshot with one node table and the node ids of each pipeline
+
+    Examples
+    --------
+        >>> normalize({"a": [{"name": "n1"}], "b": [{"name": "n1"}]})
+        {'kedro_version': None, 'nodes': [{'name': 'n1'}], 'pipelines': {'a': [0], 'b': [0]}}
+    """
+    nodes: List[Dict] = []
+    ids: Dict[str, int] = {}
+    membership = {}
+    for pipeline_name, pipeline in pipelines.items():
+        members = []
+        for node in pipeline:
+            if node["name"] not in ids:
+                ids[node["name"]] = len(nodes)
+                nodes.append(node)
+            members.append(ids[node["name"]])
+        membership[pipeline_name] = members
+    return {"kedro_version": kedro_version, "nodes": nodes, "pipelines": membership}
+
+
+def denormalize(snapshot: Mapping, pipeline_name: str) -> Dict:
+    """
+    Pipeline data, as in `pipeline.to_json()`, of one pipeline of a snapshot.
+
+    A pipeline missing from the snapshot is returned empty.
+    """
+    nodes = snapshot["nodes"]
+    return {
+        "kedro_version": snapshot["kedro_version"],
+        "pipeline": [nodes[i] for i in snapshot["pipelines"].get(pipeline_name, [])],
+    }
+
+
+def empty_snapshot() -> Dict:
+    """A snapshot without any pipeline."""
+    return normalize({})
+
+
+def load_snapshot(
+    key: str,
+    root_dir: Union[str, Path] = ".",
+    missing_ok: bool = False,
+    columns: Tuple[str, ...] = COLUMNS,
+    strings: Optional[StringTable] = None,
+) -> Mapping:
+    """
+    Load a snapshot, an empty one if it is missing and missing_ok.
+
+    A binary snapshot is memory mapped and only decodes the pipelines and
+    node columns that are accessed, a json snapshot is loaded as a dict.
+    Either way nodes are NodeRecords whose strings are interned in strings,
+    pass the same table to every snapshot of a diff.
+    """
+    strings = StringTable() if strings is None else strings
+    binary_file = snapshot_file(key, root_dir, "binary")
+    if binary_file.exists():
+        return BinarySnapshot(binary_file, columns=columns, strings=strings)
+    try:
+        snapshot: Dict = json.loads(snapshot_file(key, root_dir).read_text())
+    except FileNotFoundError:
+        if not missing_ok:
+            raise
+        return empty_snapshot()
+    nodes = snapshot["nodes"]
+    # replaced one at a time, so the parsed dicts are released as we go
+    for node_id, node in enumerate(nodes):
+        nodes[node_id] = NodeRecord.from_mapping(node, strings)
+    return snapshot
+
+
+def write_snapshot_file(
+    snapshot: Dict,
+    key: str,
+    root_dir: Union[str, Path] = ".",
+    snapshot_format: str = "json",
+    compression: Optional[str] = None,
+) -> Path:
+    """Write a normalized snapshot, returns the written file."""
+    path = snapshot_file(key, root_dir, snapshot_format)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if snapshot_format == "binary":
+        return binary_snapshot.write(snapshot, path, compression=compression)
+    path.write_text(json.dumps(snapshot))
+    return path
+
+
+def load_metadata(key: str, root_dir: Union[str, Path] = ".") -> Dict:
+    """Load the commit metadata of a snapshot."""
+    meta: Dict = json.loads(metadata_path(key, root_dir).read_text())
+    return meta
+
+
+def write_metadata(meta: Dict, root_dir: Union[str, Path] = ".") -> Path:
+    """
+    Write the commit metadata of a snapshot stored under meta["key"].
+
+    The metadata is written last and atomically, it marks the snapshot as
+    complete.
+    """
+    path = metadata_path(meta["key"], root_dir)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(meta))
+    os.replace(str(tmp_path), str(path))
+    return path
+
+
+def is_valid(key: str, root_dir: Union[str, Path] = ".") -> bool:
+    """
+    Check if a complete snapshot exists for key.
+
+    Parameters
+    --------
+        key : str
+            snapshot key
+        root_dir : str
+            directory containing the .kedro-diff directory
+
+    Returns
+    --------
+        bool
+            True when both the metadata and a snapshot file exist
+
+    """
+    try:
+        meta = load_metadata(key, root_dir)
+    except (FileNotFoundError, ValueError):
+        return False
+    if meta.get("key") != key:
+        return False
+    return any(
+        snapshot_file(key, root_dir, snapshot_format).exists()
+        for snapshot_format in SNAPSHOT_FORMATS
+    )
@@ -0,0 +1,233 @@
+"""Worker.
+
+A long lived extraction process.  Python, kedro and any preloaded third party
+modules are imported once, then each request only reloads the project
+package from the tree it points at and writes its snapshot.
+
+Requests and responses are json lines over the stdin and stdout of the
+worker process.
+
+    {"project_path": "...", "output": "...", "commit": "...", "sha": "...", "key": "...",
+     "options": {"snapshot_format": "json", "compression": null}}
+    {"key": "...", "pipelines": ["__default__", ...]}
+
+When a request also carries a "repo_path", project_path only holds the conf
+of the commit and the project package is imported from the git objects of
+sha in that repo.
+"""
+import contextlib
+import importlib
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import IO, Dict, List, Optional, Set, Tuple
+
+import click
+
+from kedro_diff.errors import KedroDiffError
+from kedro_diff.logger import silent_loggers
+from kedro_diff.snapshot import SnapshotOptions
+
+# project packages imported by earlier requests
+_project_packages: Set[str] = set()
+
+
+def purge_modules(package_name: str) -> None:
+    """Drop a package and its submodules so the next import reads them again."""
+    for name in list(sys.modules):
+        if name == package_name or name.startswith(package_name + "."):
+            del sys.modules[name]
+    importlib.invalidate_caches()
+
+
+def handle(request: Dict) -> Dict:
+    """Load the project of a single request and write its snapshot."""
+    from kedro.framework.startup import _get_project_metadata, bootstrap_project
+
+    from kedro_diff.catalog import load_catalog
+    from kedro_diff.extract import create_session, project_pipelines, write_snapshot
+    from kedro_diff.git_importer import GitImporter, GitTree
+    from kedro_diff.parameters import load_parameters
+
+    project_path = Path(request["project_path"]).resolve()
+    sys_path = list(sys.path)
+    # only the project itself is reloaded, kedro and its plugins stay warm
+    for package_name in _project_packages:
+        purge_modules(package_name)
+    try:
+        with contextlib.ExitStack() as stack:
+            if request.get("repo_path"):
+                # the importer has to be in place before bootstrap_project
+                # imports the project settings
+                source_dir = _get_project_metadata(project_path).source_dir
+                tree = GitTree(
+                    request["repo_path"],
+                    request["sha"],
+                    source_dir.relative_to(project_path).as_posix(),
+                )
+                stack.enter_context(GitImporter(tree, source_dir))
+                # the checkout only holds conf, bootstrap_project still
+                # insists on an existing source directory
+                source_dir.mkdir(parents=True, exist_ok=True)
+            metadata = bootstrap_project(project_path)
+            _project_packages.add(metadata.package_name)
+            session = create_session(metadata.package_name, project_path)
+            stack.enter_context(session)
+            context = session.load_context()
+            root_dir = Path(request["output"]).parent
+            meta = write_snapshot(
+                project_pipelines(context),
+                root_dir,
+                commit=request["commit"],
+                sha=request["sha"],
+                key=request["key"],
+                catalog=load_catalog(context, root_dir),
+                parameters=load_parameters(context, root_dir),
+                **request.get("options", {}),
+            )
+    finally:
+        # bootstrap_project puts the src of each tree on sys.path
+        sys.path[:] = sys_path
+    return {"key": meta["key"], "pipelines": meta["pipelines"]}
+
+
+def serve(requests: IO, responses: IO) -> None:
+    """Answer json line requests until requests is closed."""
+    for line in requests:
+        if not line.strip():
+            continue
+        log = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+                response = handle(json.loads(line))
+        except Exception as e:  # noqa: B902 any failure is reported to the client
+            response = {"error": f"{type(e).__name__}: {e}"}
+        response["log"] = log.getvalue()
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
+
+
+@click.command()
+@click.option(
+    "--preload",
+    multiple=True,
+    help="module to import once when the worker starts, may be repeated",
+)
+@click.option("-v", "--verbose", count=True)
+def main(preload: Tuple[str, ...], verbose: int) -> None:
+    """Run an extraction worker on stdin and stdout."""
+    # keep the real stdout for responses only, anything else that writes to
+    # stdout (kedro logging handlers included) ends up on stderr
+    responses = os.fdopen(os.dup(sys.stdout.fileno()), "w")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    import kedro.framework.session  # noqa: F401 warm up kedro itself
+
+    for module in preload:
+        importlib.import_module(module)
+    if verbose < 2:
+        silent_loggers()
+    serve(sys.stdin, responses)
+
+
+class ExtractionWorker:
+    """ExtractionWorker.
+
+    Client side of a worker process, requests are sent one at a time.  A
+    worker that exits while extracting fails that request, the next request
+    starts a new worker.
+
+    Parameters
+    --------
+        preload : List[str]
+            modules the worker imports once when it starts
+        verbose : int
+            verbosity level, the worker stderr is shown from 1
+    """
+
+    def __init__(self, preload: Optional[List[str]] = None, verbose: int = 0) -> None:
+        self.args = [sys.executable, "-m", "kedro_diff.worker"]
+        for module in preload or []:
+            self.args.extend(["--preload", module])
+        if verbose > 0:
+            self.args.append("-" + "v" * verbose)
+        self.verbose = verbose
+        self.proc = self.start()
+        self.lock = threading.Lock()
+
+    def start(self) -> "subprocess.Popen[str]":
+        """Start a worker process."""
+        return subprocess.Popen(
+            self.args,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=None if self.verbose > 0 else subprocess.DEVNULL,
+            universal_newlines=True,
+        )
+
+    def extract(
+        self,
+        project_path: Path,
+        output: Path,
+        commit: str,
+        sha: str,
+        key: str,
+        options: SnapshotOptions = SnapshotOptions(),
+        repo_path: Optional[Path] = None,
+    ) -> Dict:
+        """
+        Write the snapshot of the project at project_path.
+
+        When repo_path is given the project package is imported from the git
+        objects of sha in repo_path instead of from project_path.
+        """
+        request = {
+            "project_path": str(project_path),
+            "output": str(output),
+            "commit": commit,
+            "sha": sha,
+            "key": key,
+            "options": options._asdict(),
+            "repo_path": str(repo_path) if repo_path else None,
+        }
+        with self.lock:
+            if self.proc.poll() is not None:
+                self.proc = self.start()
+            assert self.proc.stdin is not None and self.proc.stdout is not None
+            try:
+                self.proc.stdin.write(json.dumps(request) + "\n")
+                self.proc.stdin.flush()
+                line = self.proc.stdout.readline()
+            except BrokenPipeError:
+                line = ""
+            if not line:
+                # make sure the next request starts a new worker
+                self.proc.kill()
+                self.proc.wait()
+        if not line:
+            raise KedroDiffError(f"extraction worker exited while extracting {commit}")
+        response: Dict = json.loads(line)
+        return response
+
+    def close(self) -> None:
+        """Let the worker finish and exit."""
+        if self.proc.stdin is not None:
+            # a worker that was killed leaves the request it failed unsent
+            with contextlib.suppress(BrokenPipeError):
+                self.proc.stdin.close()
+        self.proc.wait()
+
+    def __enter__(self) -> "ExtractionWorker":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -56,7 +56,7 @@ setup(
     author="Waylon Walker",
     keywords="pipelines, machine learning, data pipelines, data science, data engineering",
     install_requires=requires,
-    extras_require={"dev": dev_requires},
+    extras_require={"dev": dev_requires, "matrix": ["numpy"]},
     entry_points={
         "kedro.project_commands": ["kedro-diff = kedro_diff.cli:cli"],
         "console_scripts": ["kedro-diff = kedro_diff.cli:cli"],
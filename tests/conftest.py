@@ -0,0 +1,92 @@
+import subprocess
+
+import pytest
+
+
+def run_git(*args, cwd):
+    return (
+        subprocess.check_output(
+            [
+                "git",
+                "-c",
+                "user.name=kedro-diff",
+                "-c",
+                "user.email=kedro-diff@example.com",
+                *args,
+            ],
+            cwd=str(cwd),
+        )
+        .decode("utf-8")
+        .strip()
+    )
+
+
+@pytest.fixture
+def git():
+    """Runs git with a fixed identity and returns its stripped stdout."""
+    return run_git
+
+
+@pytest.fixture
+def commit(git):
+    """Writes a file, commits it and returns the sha of the new commit."""
+
+    def commit(project, path, content, message):
+        (project / path).parent.mkdir(parents=True, exist_ok=True)
+        (project / path).write_text(content)
+        git("add", ".", cwd=project)
+        git("commit", "-qm", message, cwd=project)
+        return git("rev-parse", "HEAD", cwd=project)
+
+    return commit
+
+
+KEDRO_PROJECT = {
+    "pyproject.toml": """
+[tool.kedro]
+package_name = "diff_demo"
+project_name = "diff demo"
+kedro_init_version = "{kedro_version}"
+""",
+    "src/diff_demo/__init__.py": "",
+    "src/diff_demo/settings.py": "",
+    "src/diff_demo/nodes.py": """
+def split(data, ratio):
+    return data, ratio
+""",
+    "src/diff_demo/pipeline_registry.py": """
+from kedro.pipeline import Pipeline, node
+
+from diff_demo.nodes import split
+
+
+def register_pipelines():
+    return {
+        "__default__": Pipeline(
+            [node(split, ["cars", "params:ratio"], ["train", "test"], name="split")]
+        )
+    }
+""",
+    "conf/base/catalog.yml": "cars: {type: pandas.CSVDataset, filepath: cars.csv}\n",
+    "conf/base/parameters.yml": "ratio: 0.2\n",
+    "conf/local/.gitkeep": "",
+}
+
+
+@pytest.fixture
+def kedro_project(tmp_path, git, monkeypatch):
+    """A committed kedro project with a single node, and its sha."""
+    import kedro
+
+    monkeypatch.setenv("KEDRO_DISABLE_TELEMETRY", "true")
+    monkeypatch.setenv("DO_NOT_TRACK", "true")
+    project = tmp_path / "project"
+    for path, content in KEDRO_PROJECT.items():
+        (project / path).parent.mkdir(parents=True, exist_ok=True)
+        (project / path).write_text(
+            content.replace("{kedro_version}", kedro.__version__)
+        )
+    git("init", "-q", cwd=project)
+    git("add", ".", cwd=project)
+    git("commit", "-qm", "add project", cwd=project)
+    return project, git("rev-parse", "HEAD", cwd=project)
@@ -0,0 +1,122 @@
+import pytest
+
+from kedro_diff import binary_snapshot
+from kedro_diff.binary_snapshot import BinarySnapshot
+from kedro_diff.sample_data import create_simple_sample
+from kedro_diff.snapshot import (
+    SnapshotOptions,
+    denormalize,
+    is_valid,
+    load_snapshot,
+    normalize,
+    snapshot_file,
+    write_metadata,
+    write_snapshot_file,
+)
+
+KEY = "4c2d8f0e1b7a"
+
+
+def sample_snapshot():
+    pipe = create_simple_sample(6)["pipeline"]
+    return normalize(
+        {"__default__": pipe, "data_science": pipe[2:4], "empty": []},
+        kedro_version="0.17.2",
+    )
+
+
+@pytest.mark.parametrize("compression", [None, "zlib"])
+def test_round_trip(tmpdir, compression):
+    snapshot = sample_snapshot()
+    path = binary_snapshot.write(snapshot, tmpdir / "snapshot.kds", compression)
+    with BinarySnapshot(path) as loaded:
+        assert loaded.to_dict() == snapshot
+
+
+def test_unicode_strings(tmpdir):
+    snapshot = normalize({"__default__": [{"name": "größe", "inputs": ["ü"]}]})
+    path = binary_snapshot.write(snapshot, tmpdir / "snapshot.kds")
+    with BinarySnapshot(path) as loaded:
+        assert loaded["nodes"][0] == {
+            "name": "größe",
+            "inputs": ["ü"],
+            "outputs": [],
+            "tags": [],
+        }
+
+
+def test_lazy_columns(tmpdir):
+    path = binary_snapshot.write(sample_snapshot(), tmpdir / "snapshot.kds")
+    with BinarySnapshot(path, columns=("name",)) as loaded:
+        pipeline = denormalize(loaded, "data_science")["pipeline"]
+        assert pipeline == [{"name": "node3"}, {"name": "node4"}]
+        assert set(loaded._columns) == {"name", "strings"}
+        assert list(loaded["pipelines"]) == ["__default__", "data_science", "empty"]
+
+
+def test_denormalize_matches_json(tmpdir):
+    snapshot = sample_snapshot()
+    path = binary_snapshot.write(snapshot, tmpdir / "snapshot.kds", "zlib")
+    with BinarySnapshot(path) as loaded:
+        for name in ["__default__", "data_science", "empty", "missing"]:
+            assert denormalize(loaded, name) == denormalize(snapshot, name)
+
+
+def test_bad_magic(tmpdir):
+    path = tmpdir / "snapshot.kds"
+    path.write_binary(b"not a snapshot")
+    with pytest.raises(ValueError, match="not a binary"):
+        BinarySnapshot(path)
+
+
+def test_unknown_column(tmpdir):
+    path = binary_snapshot.write(sample_snapshot(), tmpdir / "snapshot.kds")
+    with pytest.raises(ValueError, match="unknown columns"):
+        BinarySnapshot(path, columns=("name", "dataset"))
+
+
+def test_unknown_compression():
+    with pytest.raises(ValueError, match="compression"):
+        binary_snapshot.dumps(sample_snapshot(), compression="lzma")
+
+
+def test_load_snapshot_binary(tmpdir):
+    snapshot = sample_snapshot()
+    write_snapshot_file(snapshot, KEY, tmpdir, snapshot_format="binary")
+    assert snapshot_file(KEY, tmpdir, "binary").exists()
+    assert not snapshot_file(KEY, tmpdir).exists()
+    loaded = load_snapshot(KEY, tmpdir)
+    assert isinstance(loaded, BinarySnapshot)
+    assert loaded.to_dict() == snapshot
+    loaded.close()
+
+
+def test_is_valid_binary(tmpdir):
+    write_snapshot_file(sample_snapshot(), KEY, tmpdir, snapshot_format="binary")
+    assert not is_valid(KEY, tmpdir)
+    write_metadata({"key": KEY, "pipelines": ["__default__"]}, tmpdir)
+    assert is_valid(KEY, tmpdir)
+
+
+@pytest.mark.parametrize(
+    "options,expected",
+    [
+        (SnapshotOptions(), ["--format", "json"]),
+        (
+            SnapshotOptions("binary", "zlib"),
+            ["--format", "binary", "--compression", "zlib"],
+        ),
+    ],
+)
+def test_snapshot_options_args(options, expected):
+    assert options.to_args() == expected
+
+
+def test_scalar_column_missing_values(tmpdir):
+    snapshot = normalize(
+        {"__default__": [{"name": "a", "func": "split"}, {"name": "b", "inputs": []}]}
+    )
+    path = binary_snapshot.write(snapshot, tmpdir / "snapshot.kds")
+    with BinarySnapshot(path) as loaded:
+        assert loaded["nodes"][0]["func"] == "split"
+        assert "func" not in loaded["nodes"][1]
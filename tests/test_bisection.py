@@ -0,0 +1,121 @@
+import math
+
+import pytest
+
+from kedro_diff.bisection import NodePredicate, first_change
+from kedro_diff.errors import KedroDiffError
+from kedro_diff.snapshot import normalize
+
+SNAPSHOT = normalize(
+    {
+        "__default__": [
+            {"name": "split", "inputs": ["raw"], "outputs": ["train"], "tags": []},
+            {"name": "fit", "inputs": ["train"], "outputs": ["model"], "tags": ["ds"]},
+        ],
+        "data_science": [
+            {"name": "fit", "inputs": ["train"], "outputs": ["model"], "tags": ["ds"]}
+        ],
+    }
+)
+
+
+@pytest.mark.parametrize(
+    "predicate,expected",
+    [
+        (NodePredicate("fit"), True),
+        (NodePredicate("report"), False),
+        (NodePredicate("fit", inputs=("train",)), True),
+        (NodePredicate("fit", inputs=("raw",)), False),
+        (NodePredicate("fit", outputs=("model",), tags=("ds",)), True),
+        (NodePredicate("split", tags=("ds",)), False),
+        (NodePredicate("fit", pipeline="data_science"), True),
+        (NodePredicate("split", pipeline="data_science"), False),
+        (NodePredicate("split", pipeline="missing"), False),
+    ],
+)
+def test_node_predicate(predicate, expected):
+    assert predicate(SNAPSHOT) is expected
+
+
+@pytest.mark.parametrize(
+    "predicate,expected",
+    [
+        (NodePredicate("fit"), "node fit exists"),
+        (
+            NodePredicate("fit", inputs=("a",), tags=("b",)),
+            "node fit has input a and has tag b",
+        ),
+        (
+            NodePredicate("fit", outputs=("model",), pipeline="ds"),
+            "node fit has output model in pipeline ds",
+        ),
+    ],
+)
+def test_node_predicate_describe(predicate, expected):
+    assert predicate.describe() == expected
+
+
+@pytest.mark.parametrize("num_commits", [2, 3, 10, 2000])
+@pytest.mark.parametrize("change", [0.0, 0.5, 1.0])
+def test_first_change_probes_log_n(num_commits, change):
+    commits = [f"{i:05d}" for i in range(num_commits)]
+    changed_at = max(1, int(change * (num_commits - 1)))
+    probed = []
+
+    def evaluate(commit):
+        probed.append(commit)
+        return int(commit) >= changed_at
+
+    assert first_change(commits, evaluate) == changed_at
+    assert len(probed) <= 2 + math.ceil(math.log2(num_commits))
+
+
+def test_first_change_reversed_predicate():
+    commits = list("abcdef")
+    assert first_change(commits, lambda commit: commit < "e") == 4
+
+
+@pytest.mark.parametrize("commits", [[], ["a"], ["a", "b", "c"]])
+def test_first_change_no_change(commits):
+    assert first_change(commits, lambda commit: True) is None
+
+
+def test_first_change_skips_commits_that_can_not_be_evaluated():
+    commits = [f"{i:02d}" for i in range(20)]
+    broken = {"09", "10", "11"}
+    probed = []
+
+    def evaluate(commit):
+        probed.append(commit)
+        return None if commit in broken else commit >= "14"
+
+    assert first_change(commits, evaluate) == 14
+    assert set(probed) & broken
+
+
+def test_first_change_only_skipped_commits_left():
+    commits = list("abcde")
+    with pytest.raises(KedroDiffError, match="one of c d e$"):
+        first_change(commits, lambda c: None if c in "cd" else c >= "c")
+
+
+@pytest.mark.parametrize("broken", ["a", "e"])
+def test_first_change_needs_both_ends(broken):
+    with pytest.raises(KedroDiffError, match=f"{broken} can not be evaluated"):
+        first_change(list("abcde"), lambda c: None if c == broken else c >= "c")
+
+
+def test_first_change_prefetches_next_probes():
+    commits = [f"{i:02d}" for i in range(16)]
+    prefetched = []
+    evaluated = []
+
+    def evaluate(commit):
+        evaluated.append(commit)
+        return commit >= "05"
+
+    assert first_change(commits, evaluate, prefetch=prefetched.extend) == 5
+    assert prefetched[:2] == ["00", "15"]
+    # every probe was prefetched, along with both of the probes after it
+    assert set(evaluated) <= set(prefetched)
+    assert prefetched[2:5] == ["07", "03", "11"]
@@ -0,0 +1,40 @@
+import subprocess
+
+from kedro_diff.blob_cache import BlobCache, blob_id, blobs_key
+
+
+def test_blob_id_matches_git(tmp_path):
+    path = tmp_path / "catalog.yml"
+    path.write_text("cars:\n  type: pandas.CSVDataSet\n")
+    expected = subprocess.check_output(["git", "hash-object", str(path)])
+    assert blob_id(path) == expected.decode("utf-8").strip()
+
+
+def test_blobs_key(tmp_path):
+    (tmp_path / "a.yml").write_text("a")
+    (tmp_path / "b.yml").write_text("b")
+    paths = [tmp_path / "a.yml", tmp_path / "b.yml"]
+    key = blobs_key(paths, tmp_path)
+    assert blobs_key(reversed(paths), tmp_path) == key
+    assert blobs_key(paths, tmp_path, salt="prod") != key
+    assert blobs_key(paths[:1], tmp_path) != key
+    (tmp_path / "b.yml").write_text("changed")
+    assert blobs_key(paths, tmp_path) != key
+
+
+def test_blob_cache(tmp_path):
+    cache = BlobCache(tmp_path, "catalog")
+    assert cache.get("key") is None
+    cache.put("key", {"cars": {"type": "pandas.CSVDataSet"}})
+    assert BlobCache(tmp_path, "catalog").get("key") == {
+        "cars": {"type": "pandas.CSVDataSet"}
+    }
+    assert BlobCache(tmp_path, "other").get("key") is None
+    assert list(cache.path.iterdir()) == [cache.file("key")]
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = BlobCache(tmp_path, "catalog")
+    cache.file("key").parent.mkdir(parents=True)
+    cache.file("key").write_text("{")
+    assert cache.get("key") is None
@@ -0,0 +1,218 @@
+from types import SimpleNamespace
+
+import pytest
+
+from kedro_diff import binary_snapshot
+from kedro_diff.catalog import (
+    catalog_config,
+    catalog_entries,
+    catalog_entry,
+    catalog_files,
+    catalog_nodes,
+    load_catalog,
+)
+from kedro_diff.diff import KedroDiff
+from kedro_diff.render import PlainRenderer, section_records
+from kedro_diff.snapshot import load_snapshot, normalize, write_snapshot_file
+
+CATALOG = {
+    "_csv": {"type": "pandas.CSVDataSet"},
+    "cars": {
+        "type": "pandas.CSVDataSet",
+        "filepath": "data/01_raw/cars.csv",
+        "credentials": "s3",
+        "layer": "raw",
+    },
+    "model": {
+        "type": "pickle.PickleDataSet",
+        "filepath": "data/06_models/model.pkl",
+        "versioned": True,
+    },
+    "trips": {
+        "type": "pandas.SQLQueryDataSet",
+        "sql": "select * from trips",
+        "metadata": {"kedro-viz": {"layer": "primary"}},
+    },
+    "partitions": {"type": "PartitionedDataSet", "path": "data/02_intermediate"},
+}
+
+
+def test_catalog_entries():
+    entries = catalog_entries(CATALOG)
+    assert list(entries) == ["cars", "model", "partitions", "trips"]
+    assert entries["cars"] == {
+        "type": "pandas.CSVDataSet",
+        "filepath": "data/01_raw/cars.csv",
+        "layer": "raw",
+    }
+    assert entries["model"]["versioned"] is True
+    assert entries["partitions"]["filepath"] == "data/02_intermediate"
+    assert entries["trips"] == {
+        "type": "pandas.SQLQueryDataSet",
+        "sql": "select * from trips",
+        "layer": "primary",
+    }
+
+
+def test_catalog_entry_never_keeps_credentials():
+    assert "credentials" not in catalog_entry(CATALOG["cars"])
+
+
+def test_catalog_files(tmp_path):
+    conf = tmp_path / "conf"
+    for path in (
+        "base/catalog.yml",
+        "base/catalog/models.yml",
+        "base/pipelines/ds/catalog.yml",
+        "base/globals.yml",
+        "base/parameters.yml",
+        "local/credentials.yml",
+    ):
+        (conf / path).parent.mkdir(parents=True, exist_ok=True)
+        (conf / path).write_text("{}")
+    assert [path.relative_to(conf).as_posix() for path in catalog_files(conf)] == [
+        "base/catalog/models.yml",
+        "base/catalog.yml",
+        "base/globals.yml",
+        "base/pipelines/ds/catalog.yml",
+    ]
+
+
+class ConfigLoader:
+    def __init__(self, config):
+        self.config = config
+        self.calls = 0
+
+    def get(self, *patterns):
+        self.calls += 1
+        return self.config
+
+
+def make_context(project_path, config=CATALOG, env="local"):
+    return SimpleNamespace(
+        project_path=project_path, env=env, config_loader=ConfigLoader(config)
+    )
+
+
+def test_load_catalog_is_cached_by_blob(tmp_path):
+    catalog_file = tmp_path / "conf" / "base" / "catalog.yml"
+    catalog_file.parent.mkdir(parents=True)
+    catalog_file.write_text("cars: ...")
+    context = make_context(tmp_path)
+    entries = load_catalog(context, tmp_path)
+    assert entries == catalog_entries(CATALOG)
+    assert load_catalog(context, tmp_path) == entries
+    assert context.config_loader.calls == 1
+
+    other_env = make_context(tmp_path, env="prod")
+    load_catalog(other_env, tmp_path)
+    assert other_env.config_loader.calls == 1
+
+    catalog_file.write_text("cars: changed")
+    changed = make_context(tmp_path, config={"cars": {"type": "x"}})
+    assert load_catalog(changed, tmp_path) == {"cars": {"type": "x"}}
+
+
+class MappingConfigLoader(dict):
+    def get(self, *patterns):
+        raise AssertionError("config patterns are not used for mapping loaders")
+
+
+def test_catalog_config():
+    assert catalog_config(MappingConfigLoader(catalog=CATALOG)) == CATALOG
+    assert catalog_config(ConfigLoader(CATALOG)) == CATALOG
+
+
+def test_load_catalog_from_conf_source(tmp_path):
+    catalog_file = tmp_path / "settings" / "base" / "catalog.yml"
+    catalog_file.parent.mkdir(parents=True)
+    catalog_file.write_text("cars: ...")
+    context = make_context(tmp_path)
+    assert load_catalog(context, tmp_path) == {}
+    context.config_loader.conf_source = str(tmp_path / "settings")
+    assert load_catalog(context, tmp_path) == catalog_entries(CATALOG)
+
+
+def test_load_catalog_without_catalog_files(tmp_path):
+    context = make_context(tmp_path)
+    assert load_catalog(context, tmp_path) == {}
+    assert context.config_loader.calls == 0
+
+
+@pytest.mark.parametrize("snapshot_format", ["json", "binary"])
+def test_catalog_is_stored(tmp_path, snapshot_format):
+    snapshot = normalize({"__default__": [{"name": "a"}]})
+    snapshot["catalog"] = catalog_entries(CATALOG)
+    write_snapshot_file(snapshot, "key", tmp_path, snapshot_format=snapshot_format)
+    loaded = load_snapshot("key", tmp_path)
+    assert dict(loaded["catalog"]) == snapshot["catalog"]
+    assert catalog_nodes(loaded)[0] == {"name": "cars", **snapshot["catalog"]["cars"]}
+
+
+def test_binary_catalog_to_dict(tmp_path):
+    snapshot = normalize({"__default__": [{"name": "a"}]})
+    snapshot["catalog"] = catalog_entries(CATALOG)
+    path = binary_snapshot.write(snapshot, tmp_path / "snapshot.kds", "zlib")
+    with binary_snapshot.BinarySnapshot(path) as loaded:
+        assert len(loaded["catalog"]) == 4
+        assert loaded.to_dict()["catalog"] == snapshot["catalog"]
+
+
+def catalog_diff(renderer=None):
+    entries = catalog_entries(CATALOG)
+    changed = catalog_entries(CATALOG)
+    changed["cars"]["filepath"] = "data/01_raw/cars.parquet"
+    del changed["model"]["versioned"]
+    del changed["trips"]
+    changed["reviews"] = {"type": "pandas.CSVDataSet"}
+    return KedroDiff.from_catalogs(
+        {"catalog": entries}, {"catalog": changed}, renderer=renderer
+    )
+
+
+def test_catalog_diff():
+    result = catalog_diff().result
+    assert result.name == "catalog"
+    assert result.new_nodes == {"reviews"}
+    assert result.dropped_nodes == {"trips"}
+    assert result.modified_nodes == {"cars", "model"}
+    assert result.attr_changes["filepath"] == {("cars", ("data/01_raw/cars.parquet",))}
+    assert result.attr_changes["versioned"] == {("model", ())}
+
+
+def test_catalog_diff_renders_removed_fields():
+    renderer = PlainRenderer()
+    catalog_diff(renderer).diff()
+    assert "    -versioned: True" in renderer.buffer
+    assert "    -filepath: data/01_raw/cars.csv" in renderer.buffer
+
+
+def test_section_records():
+    records = list(section_records(catalog_diff().result))
+    assert records[0] == {
+        "type": "catalog",
+        "changes": 6,
+        "adds": 3,
+        "drops": 3,
+        "new": 1,
+        "dropped": 1,
+        "modified": 2,
+    }
+    assert records[1] == {
+        "type": "dataset",
+        "dataset": "cars",
+        "change": "modified",
+        "attrs": {
+            "filepath": {
+                "old": "data/01_raw/cars.csv",
+                "new": "data/01_raw/cars.parquet",
+            }
+        },
+    }
+    assert [record["dataset"] for record in records[1:]] == [
+        "cars",
+        "model",
+        "reviews",
+        "trips",
+    ]
+    assert len(list(section_records(catalog_diff().result, stat=True))) == 1
@@ -0,0 +1,123 @@
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+from click.testing import CliRunner
+
+from kedro_diff.cli import cli
+from kedro_diff.errors import KedroDiffError
+from tests.conftest import KEDRO_PROJECT
+
+# kedro imports the plugin for every command it runs
+IMPORT_BUDGET_MS = 100
+
+HEAVY_MODULES = (
+    "kedro.framework.session",
+    "rich",
+    "kedro_diff.diff",
+    "kedro_diff.sample_data",
+)
+
+
+def import_time_ms(module):
+    """Cumulative import time of module, click is imported by kedro already."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import click, {module}"],
+        stderr=subprocess.PIPE,
+        check=True,
+    )
+    for line in proc.stderr.decode("utf-8").splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative) / 1000
+    raise AssertionError(f"{module} was not imported")
+
+
+def test_cli_import_time():
+    # the first import may still compile bytecode
+    elapsed = min(import_time_ms("kedro_diff.cli") for _ in range(3))
+    assert elapsed < IMPORT_BUDGET_MS
+
+
+def test_cli_does_not_import_heavy_modules():
+    code = (
+        "import sys, kedro_diff.cli; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, check=True
+    )
+    assert proc.stdout.decode("utf-8").strip() == ""
+
+
+def test_kedro_diff_is_imported_when_used():
+    code = (
+        "import sys, kedro_diff; assert 'kedro_diff.diff' not in sys.modules; "
+        "print(kedro_diff.KedroDiff.__module__)"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], stdout=subprocess.PIPE, check=True
+    )
+    assert proc.stdout.decode("utf-8").strip() == "kedro_diff.diff"
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--help"],
+        ["get-json", "--help"],
+        ["diff", "--help"],
+        ["diff", "commits", "--help"],
+        ["diff", "log", "--help"],
+        ["diff", "bisect", "--help"],
+        ["diff", "impact", "--help"],
+        ["diff", "matrix", "--help"],
+    ],
+)
+def test_help(args):
+    result = CliRunner().invoke(cli, args)
+    assert result.exit_code == 0, result.output
+    assert "Usage:" in result.output
+
+
+@pytest.fixture
+def broken_project(kedro_project, commit, monkeypatch):
+    """A kedro project whose second commit can not be extracted."""
+    project, sha = kedro_project
+    broken = commit(
+        project, "src/diff_demo/pipeline_registry.py", "def (\n", "break registry"
+    )
+    monkeypatch.chdir(project)
+    return project, sha, broken
+
+
+def invoke(project, *args):
+    return CliRunner().invoke(
+        cli,
+        ["diff", *args, "--checkout", "objects"],
+        obj=SimpleNamespace(project_path=project),
+    )
+
+
+@pytest.mark.parametrize("command", ["commits", "impact", "matrix"])
+def test_failed_extraction_is_an_error(broken_project, command):
+    project, sha, broken = broken_project
+    result = invoke(project, command, sha, broken)
+    assert isinstance(result.exception, KedroDiffError)
+    assert str(result.exception).startswith(f"could not extract {broken}")
+
+
+def test_log_skips_commits_that_could_not_be_extracted(broken_project, commit):
+    project, sha, broken = broken_project
+    registry = "src/diff_demo/pipeline_registry.py"
+    fixed = commit(project, registry, KEDRO_PROJECT[registry], "fix registry")
+    result = invoke(project, "log", f"{sha}..{fixed}")
+    assert result.exit_code == 0, result.output
+    assert f"could not extract {broken[:7]}, skipped" in result.output
+    # the fix is compared to the broken commit, it is skipped as well
+    assert f"{fixed[:7]} fix registry\ncould not extract {broken[:7]}" in (
+        result.output
+    )
+    assert "--" not in result.output
@@ -5,7 +5,9 @@ from pathlib import Path
 import pytest
 
 from kedro_diff import KedroDiff
+from kedro_diff.filters import DiffFilter
 from kedro_diff.sample_data import create_simple_sample
+from kedro_diff.snapshot import normalize
 
 DATA = Path(__file__).parent / "sample-data"
 
@@ -115,3 +117,44 @@ def test_diff_from_sample():
     assert "++" in diff._stat_msg
     assert "+++" not in diff._stat_msg
     assert "-" not in diff._stat_msg
+
+
+def test_diff_from_snapshots():
+    nodes = create_simple_sample(4)["pipeline"]
+    snapshot1 = normalize({"__default__": nodes[:2], "first": nodes[:1]})
+    snapshot2 = normalize({"__default__": nodes, "first": nodes[:1]})
+    diff = KedroDiff.from_snapshots(snapshot1, snapshot2)
+    assert "__default__" in diff._stat_msg
+    assert "| 2 " in diff._stat_msg
+    assert KedroDiff.from_snapshots(snapshot1, snapshot2, name="first").num_changes == 0
+    new = KedroDiff.from_snapshots(snapshot1, snapshot2, name="new")
+    assert new.num_changes == 0
+
+
+def test_diff_filter_nodes():
+    nodes = create_simple_sample(4)["pipeline"]
+    snapshot1 = normalize({"__default__": nodes[:2]})
+    snapshot2 = normalize({"__default__": nodes})
+    diff = KedroDiff.from_snapshots(
+        snapshot1, snapshot2, diff_filter=DiffFilter(nodes=("node4",))
+    )
+    assert diff.all_nodes == ["node4"]
+    assert diff.num_changes == 1
+    unmatched = KedroDiff.from_snapshots(
+        snapshot1, snapshot2, diff_filter=DiffFilter(tags=("tag1",))
+    )
+    assert unmatched.num_changes == 0
+
+
+def test_diff_find_renames(capsys):
+    pipe1 = create_simple_sample(3)
+    pipe2 = deepcopy(pipe1)
+    pipe2["pipeline"][1]["name"] = "ds.node2"
+    diff = KedroDiff(pipe1, pipe2, find_renames=True)
+    assert diff.renamed_nodes == (("node2", "ds.node2"),)
+    assert "1 renamed" in diff._stat_msg
+    assert "1 renamed" not in KedroDiff(pipe1, pipe2)._stat_msg
+    diff.diff()
+    out = capsys.readouterr().out
+    assert "R ds.node2" in out
+    assert "node2" in out
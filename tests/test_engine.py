@@ -0,0 +1,149 @@
+from copy import deepcopy
+
+import pytest
+
+from kedro_diff.diff import KedroDiff
+from kedro_diff.engine import (
+    NodeComparisons,
+    compare_nodes,
+    diff_pipelines,
+    index_nodes,
+)
+from kedro_diff.sample_data import create_simple_sample
+from kedro_diff.snapshot import normalize
+
+
+def test_index_nodes_first_node_wins():
+    nodes = [{"name": "a", "tags": ["first"]}, {"name": "a", "tags": ["second"]}]
+    assert index_nodes(nodes) == {"a": {"name": "a", "tags": ["first"]}}
+
+
+def test_diff_pipelines_added_dropped():
+    result = diff_pipelines(
+        create_simple_sample(3, name_prefix="first")["pipeline"],
+        create_simple_sample(2)["pipeline"],
+        name="data_science",
+    )
+    assert result.name == "data_science"
+    assert result.new_nodes == {"node1", "node2"}
+    assert result.dropped_nodes == {"first1", "first2", "first3"}
+    assert result.common_nodes == frozenset()
+    assert result.all_nodes == ["first1", "first2", "first3", "node1", "node2"]
+    assert (result.num_changes, result.num_adds, result.num_drops) == (5, 2, 3)
+
+
+def test_diff_pipelines_attr_changes():
+    pipe1 = create_simple_sample(4)["pipeline"]
+    pipe2 = deepcopy(pipe1)
+    pipe2[1]["inputs"] = ["raw"]
+    pipe2[1]["tags"] = ["tag2", "train"]
+    pipe2[2]["outputs"] = []
+    result = diff_pipelines(pipe1, pipe2)
+    assert result.modified_nodes == {"node2", "node3"}
+    assert result.attr_changes["inputs"] == {("node2", ("raw",))}
+    assert result.attr_changes["outputs"] == {("node3", ())}
+    assert result.attr_changes["tags"] == {("node2", ("tag2", "train"))}
+    assert (result.num_changes, result.num_adds, result.num_drops) == (6, 3, 3)
+    assert [name for name, _, _ in result.changed_nodes()] == ["node2", "node3"]
+
+
+def test_diff_pipelines_untracked_attr_only_is_unchanged():
+    pipe1 = [{"name": "a", "inputs": [], "func": "f"}]
+    pipe2 = [{"name": "a", "inputs": [], "func": "g"}]
+    result = diff_pipelines(pipe1, pipe2)
+    assert result.modified_nodes == frozenset()
+    assert result.num_changes == 0
+    assert list(result.changed_nodes()) == []
+
+
+def test_diff_pipelines_missing_attr_is_empty():
+    result = diff_pipelines([{"name": "a"}], [{"name": "a", "tags": []}])
+    assert result.num_changes == 0
+    assert result.modified_nodes == frozenset()
+
+
+def test_diff_result_is_immutable():
+    result = diff_pipelines(
+        create_simple_sample(1)["pipeline"], create_simple_sample(2)["pipeline"]
+    )
+    with pytest.raises(AttributeError):
+        result.new_nodes = frozenset()
+    with pytest.raises(TypeError):
+        result.attr_changes["inputs"] = frozenset()
+    with pytest.raises(TypeError):
+        result.nodes2["node3"] = {}
+
+
+def test_diff_pipelines_is_linear(mocker):
+    pipe1 = create_simple_sample(20_000)["pipeline"]
+    pipe2 = deepcopy(pipe1)
+    for node in pipe2[::100]:
+        node["tags"] = ["changed"]
+    compare = mocker.patch("kedro_diff.engine.compare_nodes", wraps=compare_nodes)
+    comparisons = NodeComparisons()
+    result = diff_pipelines(pipe1, pipe2, comparisons=comparisons)
+    assert len(result.attr_changes["tags"]) == 200
+    # every node is compared exactly once
+    assert compare.call_count == comparisons.compared == 20_000
+    diff_pipelines(pipe1, pipe2, name="ds", comparisons=comparisons)
+    assert compare.call_count == 20_000
+    assert comparisons.reused == 20_000
+
+
+def test_diff_pipelines_find_renames():
+    pipe1 = create_simple_sample(3)["pipeline"]
+    pipe2 = deepcopy(pipe1)
+    pipe2[0]["name"] = "ds.node1"
+    pipe2[2]["name"] = "ds.node3"
+    pipe2[2]["tags"] = ["tag3", "new"]
+    without = diff_pipelines(pipe1, pipe2)
+    assert without.renames == ()
+    assert len(without.new_nodes) == len(without.dropped_nodes) == 2
+
+    result = diff_pipelines(pipe1, pipe2, find_renames=True)
+    assert result.renames == (("node1", "ds.node1"), ("node3", "ds.node3"))
+    assert result.new_nodes == result.dropped_nodes == frozenset()
+    assert result.num_changes == 2
+    assert (result.num_adds, result.num_drops) == (0, 0)
+    assert list(result.changed_nodes()) == [
+        ("ds.node1", pipe1[0], pipe2[0]),
+        ("ds.node3", pipe1[2], pipe2[2]),
+    ]
+
+
+def test_compare_nodes():
+    node = {"name": "a", "inputs": ["x"], "tags": ["t"]}
+    assert compare_nodes(node, dict(node)) is None
+    assert compare_nodes(node, {**node, "inputs": ["y"], "tags": []}) == (
+        ("inputs", ("y",)),
+        ("tags", ()),
+    )
+    assert compare_nodes(node, {**node, "func": "g", "namespace": "ns"}) is None
+
+
+def test_comparisons_are_shared_across_pipelines():
+    pipe1 = create_simple_sample(6)["pipeline"]
+    pipe2 = deepcopy(pipe1)
+    pipe2[1]["tags"] = ["changed"]
+    pipe2[4]["outputs"] = []
+    snapshot1 = normalize({"__default__": pipe1, "a": pipe1[:3], "b": pipe1[3:]})
+    snapshot2 = normalize({"__default__": pipe2, "a": pipe2[:3], "b": pipe2[3:]})
+    comparisons = NodeComparisons()
+    results = {
+        name: KedroDiff.from_snapshots(
+            snapshot1, snapshot2, name=name, comparisons=comparisons
+        ).result
+        for name in ("a", "b", "__default__")
+    }
+    # nodes with equal hashes are skipped, the two changed nodes are compared
+    # for their own pipeline and reused by __default__
+    assert (comparisons.compared, comparisons.reused) == (2, 2)
+    assert results["a"].modified_nodes == {"node2"}
+    assert results["b"].modified_nodes == {"node5"}
+    for name, result in results.items():
+        assert result == KedroDiff.from_snapshots(snapshot1, snapshot2, name).result
+
+
+def test_comparisons_must_compare_the_same_attrs():
+    with pytest.raises(ValueError):
+        diff_pipelines([], [], attrs=("tags",), comparisons=NodeComparisons())
@@ -0,0 +1,68 @@
+import json
+from types import SimpleNamespace
+
+from kedro.pipeline import Pipeline, node
+
+from kedro_diff.extract import node_to_dict, project_pipelines, write_snapshot
+from kedro_diff.snapshot import load_metadata, load_snapshot
+
+
+def split(data):
+    return data
+
+
+PIPELINES = {
+    "__default__": Pipeline([node(split, "cars", "train", name="split")]),
+    "data_science": Pipeline([node(split, "train", "model", name="train")]),
+}
+
+
+def test_node_to_dict():
+    record = node_to_dict(PIPELINES["__default__"].nodes[0])
+    assert record.pop("func_hash")
+    assert record == {
+        "name": "split",
+        "namespace": None,
+        "func": "split",
+        "inputs": ["cars"],
+        "outputs": ["train"],
+        "tags": [],
+    }
+
+
+def test_node_to_dict_namespace():
+    record = node_to_dict(node(split, "cars", "train", name="fit", namespace="ds.m"))
+    assert (record["name"], record["namespace"]) == ("ds.m.fit", "ds.m")
+
+
+def test_project_pipelines(monkeypatch):
+    # kedro 0.17 serves the pipelines from the context
+    assert project_pipelines(SimpleNamespace(pipelines=PIPELINES)) is PIPELINES
+    monkeypatch.setattr("kedro.framework.project.pipelines", PIPELINES)
+    assert project_pipelines(SimpleNamespace()) == PIPELINES
+
+
+def test_write_snapshot(tmp_path):
+    echoed = []
+    meta = write_snapshot(
+        PIPELINES,
+        tmp_path,
+        commit="main",
+        sha="abc",
+        key="key",
+        echo=echoed.append,
+        pipeline_patterns=["data_*"],
+        catalog={"cars": {"type": "pandas.CSVDataset"}},
+    )
+    assert meta == {
+        "commit": "main",
+        "sha": "abc",
+        "key": "key",
+        "pipelines": ["data_science"],
+        "pipeline_patterns": ["data_*"],
+    }
+    assert load_metadata("key", tmp_path) == meta
+    snapshot = load_snapshot("key", tmp_path)
+    assert list(snapshot["pipelines"]) == ["data_science"]
+    assert [n["name"] for n in snapshot["nodes"]] == ["train"]
+    assert json.loads(echoed[0])["catalog"] == {"cars": {"type": "pandas.CSVDataset"}}
@@ -0,0 +1,67 @@
+import pytest
+
+from kedro_diff.filters import DiffFilter, matches, namespaces_of
+
+
+@pytest.mark.parametrize(
+    "value,patterns,expected",
+    [
+        ("data_science", ["data_*"], True),
+        ("data_science", ["de", "data_science"], True),
+        ("data_science", ["Data_*"], False),
+        ("data_science", [], False),
+    ],
+)
+def test_matches(value, patterns, expected):
+    assert matches(value, patterns) is expected
+
+
+@pytest.mark.parametrize(
+    "node,expected",
+    [
+        ({"name": "train"}, []),
+        ({"name": "ds.train", "namespace": "ds"}, ["ds"]),
+        ({"name": "ds.model.train", "namespace": "ds.model"}, ["ds.model", "ds"]),
+        # the namespace is never guessed from the name
+        ({"name": "ds.train", "namespace": None}, []),
+    ],
+)
+def test_namespaces_of(node, expected):
+    assert list(namespaces_of(node)) == expected
+
+
+def test_empty_filter_selects_everything():
+    diff_filter = DiffFilter()
+    nodes = [{"name": "a", "tags": []}]
+    assert not diff_filter.filters_nodes
+    assert diff_filter.select_pipelines(["b", "a"]) == ["b", "a"]
+    assert diff_filter.select_nodes(nodes) is nodes
+
+
+def test_select_pipelines():
+    diff_filter = DiffFilter(pipelines=("data_*", "__default__"))
+    assert diff_filter.select_pipelines(
+        ["__default__", "data_science", "data_engineering", "reporting"]
+    ) == ["__default__", "data_science", "data_engineering"]
+
+
+@pytest.mark.parametrize(
+    "diff_filter,expected",
+    [
+        (DiffFilter(nodes=("*train*",)), ["ds.train", "ds.model.train"]),
+        (DiffFilter(tags=("model",)), ["ds.model.train"]),
+        (DiffFilter(tags=("t*",)), ["ds.train", "ds.model.train", "report"]),
+        (DiffFilter(namespaces=("ds",)), ["ds.train", "ds.model.train"]),
+        (DiffFilter(namespaces=("ds.model",)), ["ds.model.train"]),
+        (DiffFilter(namespaces=("model",)), []),
+        (DiffFilter(tags=("train",), namespaces=("ds.*",)), ["ds.model.train"]),
+        (DiffFilter(pipelines=("ds",)), ["ds.train", "ds.model.train", "report"]),
+    ],
+)
+def test_select_nodes(diff_filter, expected):
+    nodes = [
+        {"name": "ds.train", "namespace": "ds", "tags": ["train"]},
+        {"name": "ds.model.train", "namespace": "ds.model", "tags": ["train", "model"]},
+        {"name": "report", "tags": ["tables"]},
+    ]
+    assert [node["name"] for node in diff_filter.select_nodes(nodes)] == expected
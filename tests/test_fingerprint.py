@@ -0,0 +1,162 @@
+from copy import deepcopy
+
+import pytest
+
+from kedro_diff import binary_snapshot
+from kedro_diff.diff import KedroDiff
+from kedro_diff.engine import diff_pipelines
+from kedro_diff.fingerprint import (
+    SnapshotHashes,
+    compare,
+    node_hash,
+    rollup,
+    snapshot_hashes,
+)
+from kedro_diff.snapshot import load_snapshot, normalize, write_snapshot_file
+
+
+def make_node(name, inputs=(), outputs=(), tags=(), func="f"):
+    node = {
+        "name": name,
+        "func": func,
+        "inputs": list(inputs),
+        "outputs": list(outputs),
+        "tags": list(tags),
+    }
+    if "." in name:
+        node["namespace"] = name.rpartition(".")[0]
+    return node
+
+
+PIPELINE = [
+    make_node("de.clean", ["raw"], ["clean"]),
+    make_node("ds.split", ["clean"], ["train"]),
+    make_node("ds.models.fit", ["train"], ["model"]),
+    make_node("report", ["model"], ["report"]),
+]
+
+
+def snapshot_of(pipelines):
+    snapshot = normalize(pipelines)
+    snapshot["hashes"] = snapshot_hashes(snapshot)
+    return snapshot
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"name": "other"},
+        {"func": "g"},
+        {"inputs": ["other"]},
+        {"outputs": ["other"]},
+        {"tags": ["other"]},
+    ],
+)
+def test_node_hash_covers_every_field(change):
+    node = make_node("a", ["x"], ["y"], ["t"])
+    assert node_hash(node) != node_hash({**node, **change})
+
+
+def test_node_hash_ignores_callables():
+    node = make_node("a")
+    assert node_hash({**node, "func": lambda x: x}) == node_hash({**node, "func": None})
+
+
+def test_node_hash_is_unambiguous():
+    assert node_hash(make_node("a", ["b,c"])) != node_hash(make_node("a", ["b", "c"]))
+
+
+def test_rollup_ignores_order():
+    assert rollup(["a", "b"]) == rollup(["b", "a"])
+    assert rollup(["a"]) != rollup(["a", "b"])
+
+
+def test_snapshot_hashes():
+    hashes = snapshot_hashes(normalize({"__default__": PIPELINE, "ds": PIPELINE[1:3]}))
+    assert len(hashes["nodes"]) == 4
+    assert set(hashes["pipelines"]) == {"__default__", "ds"}
+    assert list(hashes["namespaces"]["__default__"]) == ["de", "ds", "ds.models"]
+    assert list(hashes["namespaces"]["ds"]) == ["ds", "ds.models"]
+    assert hashes["namespaces"]["__default__"]["ds"] == hashes["namespaces"]["ds"]["ds"]
+
+
+def test_hashes_are_computed_when_missing():
+    snapshot = normalize({"__default__": PIPELINE})
+    hashes = SnapshotHashes.from_snapshot(snapshot)
+    assert snapshot["hashes"]["pipelines"] == hashes.pipelines
+
+
+def test_compare_identical():
+    snapshot1 = snapshot_of({"__default__": PIPELINE})
+    snapshot2 = snapshot_of({"__default__": deepcopy(PIPELINE)})
+    assert compare(snapshot1, snapshot2, "__default__").identical
+    assert not compare(snapshot1, snapshot2, "missing").identical
+
+
+def test_compare_changed_namespace():
+    changed = deepcopy(PIPELINE)
+    changed[2]["tags"] = ["new"]
+    hashes = compare(
+        snapshot_of({"__default__": PIPELINE}),
+        snapshot_of({"__default__": changed}),
+        "__default__",
+    )
+    assert not hashes.identical
+    assert hashes.same_namespaces == {"de"}
+    assert hashes.nodes1["de.clean"] == hashes.nodes2["de.clean"]
+    assert hashes.nodes1["ds.models.fit"] != hashes.nodes2["ds.models.fit"]
+
+
+def test_engine_trusts_hashes():
+    changed = deepcopy(PIPELINE)
+    changed[0]["tags"] = ["new"]
+    changed[3]["tags"] = ["new"]
+    names = [node["name"] for node in PIPELINE]
+    same = {name: "same" for name in names}
+    # equal hashes and namespaces mark nodes unchanged without comparing them
+    result = diff_pipelines(
+        PIPELINE, changed, hashes1=same, hashes2={**same, "report": "changed"}
+    )
+    assert result.modified_nodes == {"report"}
+    result = diff_pipelines(PIPELINE, changed, same_namespaces={"de"})
+    assert result.modified_nodes == {"report"}
+    assert result.common_nodes == set(names)
+
+
+def test_diff_skips_identical_pipelines():
+    snapshot1 = snapshot_of({"__default__": PIPELINE, "ds": PIPELINE[1:3]})
+    changed = deepcopy(PIPELINE)
+    changed[0]["outputs"] = ["cleaner"]
+    snapshot2 = snapshot_of({"__default__": changed, "ds": changed[1:3]})
+    same = KedroDiff.from_snapshots(snapshot1, snapshot2, name="ds")
+    assert same.hashes.identical
+    assert same.pipe1 is same.pipe2
+    assert same.num_changes == 0
+    assert same.all_nodes == ["ds.models.fit", "ds.split"]
+    diff = KedroDiff.from_snapshots(snapshot1, snapshot2)
+    assert not diff.hashes.identical
+    assert diff.result.modified_nodes == {"de.clean"}
+    assert diff.num_changes == 2
+
+
+@pytest.mark.parametrize("snapshot_format", ["json", "binary"])
+def test_hashes_are_stored(tmpdir, snapshot_format):
+    snapshot = snapshot_of({"__default__": PIPELINE})
+    write_snapshot_file(snapshot, "key", tmpdir, snapshot_format=snapshot_format)
+    loaded = load_snapshot("key", tmpdir)
+    hashes = SnapshotHashes.from_snapshot(loaded)
+    assert list(hashes.nodes) == snapshot["hashes"]["nodes"]
+    assert hashes.pipelines == snapshot["hashes"]["pipelines"]
+    assert hashes.namespaces == snapshot["hashes"]["namespaces"]
+
+
+def test_binary_node_hashes(tmpdir):
+    snapshot = snapshot_of({"__default__": PIPELINE})
+    path = binary_snapshot.write(snapshot, tmpdir / "snapshot.kds")
+    with binary_snapshot.BinarySnapshot(path) as loaded:
+        node_hashes = loaded["hashes"]["nodes"]
+        assert node_hashes[-1] == snapshot["hashes"]["nodes"][-1]
+        assert node_hashes[:2] == snapshot["hashes"]["nodes"][:2]
+        with pytest.raises(IndexError):
+            node_hashes[4]
+        assert loaded.to_dict() == snapshot
@@ -0,0 +1,154 @@
+import functools
+import importlib.util
+import sys
+
+import pytest
+
+from kedro_diff import functions
+from kedro_diff.engine import diff_pipelines
+from kedro_diff.functions import (
+    FunctionHasher,
+    code_hash,
+    func_name,
+    source_hashes,
+    unwrap,
+)
+from kedro_diff.node_diff import NodeDiff
+from kedro_diff.render import PlainRenderer
+
+SOURCE = """
+def clean(df):
+    return df.dropna()
+
+
+class Model:
+    def fit(self, df):
+        def score(row):
+            return row
+        return df
+
+
+if True:
+    def split(df):
+        return df
+"""
+
+
+def test_source_hashes():
+    hashes = source_hashes(SOURCE)
+    assert list(hashes) == ["clean", "Model.fit", "Model.fit.<locals>.score", "split"]
+
+
+def test_source_hashes_ignore_formatting():
+    reformatted = SOURCE.replace("return df.dropna()", "return df.dropna()  # nan")
+    assert source_hashes(reformatted) == source_hashes(SOURCE)
+    changed = source_hashes(SOURCE.replace("dropna", "fillna"))
+    assert changed["clean"] != source_hashes(SOURCE)["clean"]
+    assert changed["split"] == source_hashes(SOURCE)["split"]
+
+
+def test_code_hash():
+    assert code_hash((lambda x: x + 1).__code__) == code_hash(
+        (lambda x: x + 1).__code__
+    )
+    assert code_hash((lambda x: x + 1).__code__) != code_hash(
+        (lambda x: x + 2).__code__
+    )
+    assert code_hash((lambda x: x in {"a", "b"}).__code__) == code_hash(
+        (lambda x: x in {"b", "a"}).__code__
+    )
+
+
+def clean(df):
+    return df
+
+
+class Callable:
+    def __call__(self, df):
+        return df
+
+
+def test_unwrap():
+    @functools.wraps(clean)
+    def decorated(df):
+        return clean(df)
+
+    assert unwrap(functools.partial(clean)) is clean
+    assert unwrap(decorated) is clean
+    assert unwrap(Callable()) is Callable.__call__
+
+
+def test_func_name():
+    @functools.wraps(clean)
+    def decorated(df):
+        return clean(df)
+
+    assert func_name(functools.partial(decorated)) == "clean"
+    assert func_name(Callable()) == "Callable.__call__"
+    assert func_name(lambda df: df) == "test_func_name.<locals>.<lambda>"
+
+
+@pytest.fixture
+def import_module(tmp_path):
+    imported = []
+
+    def import_module(source, name="nodes"):
+        path = tmp_path / "src" / f"{name}.py"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(source)
+        spec = importlib.util.spec_from_file_location(name, str(path))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        imported.append(name)
+        spec.loader.exec_module(module)
+        return module
+
+    yield import_module
+    for name in imported:
+        sys.modules.pop(name, None)
+
+
+def test_hash_functions_of_a_module(tmp_path, import_module):
+    module = import_module(SOURCE)
+    hasher = FunctionHasher(tmp_path)
+    assert hasher.hash(module.clean) == source_hashes(SOURCE)["clean"]
+    assert hasher.hash(module.Model().fit) == source_hashes(SOURCE)["Model.fit"]
+    assert hasher.hash(functools.partial(module.split)) == hasher.hash(module.split)
+    assert hasher.hash("not a function") is None
+    lambda_hash = hasher.hash(lambda df: df)
+    assert lambda_hash == code_hash((lambda df: df).__code__)
+
+
+def test_modules_are_parsed_once_per_blob(tmp_path, import_module, monkeypatch):
+    module = import_module(SOURCE)
+    expected = FunctionHasher(tmp_path).hash(module.clean)
+
+    def fail(source):
+        raise AssertionError("parsed a cached module")
+
+    monkeypatch.setattr(functions, "source_hashes", fail)
+    assert FunctionHasher(tmp_path).hash(module.clean) == expected
+    monkeypatch.undo()
+
+    changed = import_module(SOURCE.replace("dropna", "fillna"))
+    assert FunctionHasher(tmp_path).hash(changed.clean) != expected
+
+
+def test_functions_without_source():
+    hasher = FunctionHasher()
+    assert hasher.hash(len) is None
+    assert hasher.hash(clean) == source_hashes(open(__file__).read())["clean"]
+
+
+NODE = {"name": "clean", "func": "clean", "inputs": ["raw"], "outputs": ["clean"]}
+
+
+def test_implementation_changed():
+    node1 = {**NODE, "func_hash": "a"}
+    node2 = {**NODE, "func_hash": "b"}
+    result = diff_pipelines([node1], [node2])
+    assert result.modified_nodes == {"clean"}
+    assert result.num_changes == 2
+    renderer = PlainRenderer()
+    NodeDiff(node1, node2, "clean", renderer=renderer).diff()
+    assert renderer.buffer == ["M clean", "    implementation changed"]
@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from kedro_diff.get_pipelines import (
+    ExtractionPool,
+    _acquire_slot,
+    snapshot_key,
+    worktree_checkout,
+)
+from kedro_diff.snapshot import is_valid
+
+
+@pytest.fixture
+def project(tmp_path, git, commit):
+    git("init", "-q", cwd=tmp_path)
+    sha = commit(tmp_path, "src/pkg/__init__.py", "", "add package")
+    return tmp_path, sha
+
+
+def test_acquire_slot_is_bounded(tmp_path):
+    assert [_acquire_slot(tmp_path, 2) for _ in range(3)] == [0, 1, None]
+
+
+def test_acquire_slot_takes_over_dead_slots(tmp_path):
+    (tmp_path / "0.lock").write_text(str(os.getpid()))
+    # no process runs with a pid this large
+    (tmp_path / "1.lock").write_text(str(2**30))
+    assert _acquire_slot(tmp_path, 2) == 1
+    assert (tmp_path / "1.lock").read_text() == str(os.getpid())
+
+
+def test_worktree_checkout_exports_when_the_pool_is_full(project, git):
+    project_path, sha = project
+    pool_dir = project_path / ".git" / "kedro-diff" / "worktrees"
+    with worktree_checkout(project_path, sha, max_slots=1) as first:
+        assert first == pool_dir / "0"
+        with worktree_checkout(project_path, sha, max_slots=1) as second:
+            assert pool_dir not in second.parents
+            assert (second / "src" / "pkg" / "__init__.py").exists()
+        assert not (pool_dir / "1").exists()
+    assert not (pool_dir / "0.lock").exists()
+    assert git("status", "--porcelain", cwd=project_path) == ""
+
+
+def test_snapshot_key_of_pipeline_patterns(project):
+    project_path, sha = project
+    key = snapshot_key(project_path, sha)
+    assert snapshot_key(project_path, sha, ()) == key
+    filtered = snapshot_key(project_path, sha, ["data_*", "de"])
+    assert filtered not in (key, snapshot_key(project_path, sha, ["de"]))
+    assert snapshot_key(project_path, sha, ["de", "data_*", "de"]) == filtered
+
+
+def test_extraction_pool(kedro_project, commit, monkeypatch):
+    project, sha = kedro_project
+    broken = commit(
+        project, "src/diff_demo/pipeline_registry.py", "def (\n", "break registry"
+    )
+    monkeypatch.chdir(project)
+    with ExtractionPool(project, jobs=2, mode="objects") as pool:
+        futures = [pool.submit(c) for c in (sha, broken)]
+        keys = [future.result() for future in futures]
+    assert keys == [snapshot_key(project, c) for c in (sha, broken)]
+    # a failed extraction returns its key without writing a snapshot
+    assert is_valid(keys[0])
+    assert not is_valid(keys[1])
@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+
+from kedro_diff.errors import KedroDiffError
+from kedro_diff.git_importer import GitImporter, GitTree
+
+
+@pytest.fixture
+def repo(tmp_path, git):
+    project = tmp_path / "project"
+    package = project / "src" / "git_imported_pkg"
+    (package / "pipelines").mkdir(parents=True)
+    (package / "__init__.py").write_text("VERSION = 'first'\n")
+    (package / "pipelines" / "__init__.py").write_text("")
+    (package / "pipelines" / "nodes.py").write_text("def split(x):\n    return x\n")
+    (project / "src" / "single_module.py").write_text("NAME = 'single'\n")
+    (project / "README.md").write_text("not python\n")
+    git("init", "-q", cwd=tmp_path)
+    git("add", ".", cwd=tmp_path)
+    git("commit", "-qm", "first", cwd=tmp_path)
+    first = git("rev-parse", "HEAD", cwd=tmp_path)
+    (package / "__init__.py").write_text("VERSION = 'second'\n")
+    git("commit", "-qam", "second", cwd=tmp_path)
+    return project, first
+
+
+def test_tree_lists_files_below_root(repo):
+    project, first = repo
+    tree = GitTree(project, first, "src")
+    assert "git_imported_pkg/pipelines/nodes.py" in tree.files
+    assert "git_imported_pkg/pipelines" in tree.dirs
+    assert "README.md" not in tree.files
+
+
+def test_tree_reads_blobs_of_commit(repo):
+    project, first = repo
+    tree = GitTree(project, first, "src")
+    assert tree.read("git_imported_pkg/__init__.py") == b"VERSION = 'first'\n"
+    assert tree.read("single_module.py") == b"NAME = 'single'\n"
+    tree.close()
+
+
+def test_tree_missing_file(repo):
+    project, first = repo
+    with pytest.raises(FileNotFoundError):
+        GitTree(project, first, "src").read("nope.py")
+
+
+def test_tree_bad_sha(repo):
+    project, _ = repo
+    tree = GitTree(project, "HEAD", "src")
+    tree.sha = "0" * 40
+    with pytest.raises(KedroDiffError):
+        tree.read("single_module.py")
+    tree.close()
+
+
+def test_importer_imports_from_commit(repo):
+    project, first = repo
+    with GitImporter(GitTree(project, first, "src"), project / "src"):
+        import git_imported_pkg
+        import single_module
+        from git_imported_pkg.pipelines import nodes
+
+        assert git_imported_pkg.VERSION == "first"
+        assert single_module.NAME == "single"
+        assert nodes.split(1) == 1
+        assert nodes.__file__ == str(
+            project / "src" / "git_imported_pkg" / "pipelines" / "nodes.py"
+        )
+    assert "git_imported_pkg" not in sys.modules
+
+
+def test_importer_shadows_working_tree(repo, monkeypatch):
+    project, first = repo
+    monkeypatch.syspath_prepend(str(project / "src"))
+    with GitImporter(GitTree(project, first, "src"), project / "src"):
+        import git_imported_pkg
+
+        assert git_imported_pkg.VERSION == "first"
+    import git_imported_pkg
+
+    assert git_imported_pkg.VERSION == "second"
+    del sys.modules["git_imported_pkg"]
+
+
+def test_importer_ignores_other_modules(repo):
+    project, first = repo
+    importer = GitImporter(GitTree(project, first, "src"), project / "src")
+    assert importer.find_spec("json") is None
+    assert importer.find_spec("git_imported_pkg.missing") is None
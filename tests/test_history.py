@@ -0,0 +1,53 @@
+import pytest
+
+from kedro_diff.history import commits_to_extract, log_entries, rev_list
+
+
+@pytest.fixture
+def repo(tmp_path, git, commit):
+    git("init", "-q", cwd=tmp_path)
+    shas = [
+        commit(tmp_path, "src/pkg/__init__.py", "", "add package"),
+        commit(tmp_path, "README.md", "docs\n", "add docs"),
+        commit(tmp_path, "conf/base/catalog.yml", "a: 1\n", "add catalog"),
+        commit(tmp_path, "src/pkg/nodes.py", "x = 1\n", "add nodes"),
+    ]
+    return tmp_path, shas
+
+
+def test_rev_list(repo):
+    project, shas = repo
+    assert rev_list(project, f"{shas[0]}..{shas[3]}") == [
+        (shas[1], shas[0], "add docs"),
+        (shas[2], shas[1], "add catalog"),
+        (shas[3], shas[2], "add nodes"),
+    ]
+
+
+def test_rev_list_single_commit_ranges_to_head(repo):
+    project, shas = repo
+    assert [c[0] for c in rev_list(project, (shas[2],))] == [shas[3]]
+
+
+def test_log_entries_skip_unchanged_trees(repo):
+    project, shas = repo
+    entries = log_entries(project, f"{shas[0]}..{shas[3]}")
+    assert [entry.changes_pipelines for entry in entries] == [False, True, True]
+    assert entries[0].key == entries[0].parent_key
+    assert entries[1].parent_key == entries[0].key
+    assert list(commits_to_extract(entries)) == [shas[1], shas[2], shas[3]]
+
+
+def test_log_entries_first_parent(repo, git, commit):
+    project, shas = repo
+    git("checkout", "-qb", "feature", shas[1], cwd=project)
+    feature = commit(project, "src/pkg/feature.py", "", "add feature")
+    git("checkout", "-q", "-", cwd=project)
+    git("merge", "-q", "--no-ff", "-m", "merge feature", "feature", cwd=project)
+    merge = git("rev-parse", "HEAD", cwd=project)
+
+    entries = log_entries(project, f"{shas[3]}..{merge}")
+    assert {entry.sha for entry in entries} == {feature, merge}
+    first_parent = log_entries(project, f"{shas[3]}..{merge}", first_parent=True)
+    assert [(entry.sha, entry.parent) for entry in first_parent] == [(merge, shas[3])]
+    assert first_parent[0].changes_pipelines
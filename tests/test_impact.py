@@ -0,0 +1,107 @@
+import pytest
+
+from kedro_diff.engine import diff_pipelines
+from kedro_diff.impact import DatasetIndex, impact
+from kedro_diff.snapshot import normalize
+
+
+def make_node(name, inputs, outputs, tags=()):
+    return {"name": name, "inputs": inputs, "outputs": outputs, "tags": list(tags)}
+
+
+# raw -> clean -> features -> model -> report
+#                          \-> summary
+PIPELINE = [
+    make_node("clean", ["raw"], ["clean"]),
+    make_node("featurize", ["clean"], ["features"]),
+    make_node("train", ["features", "params:seed"], ["model"]),
+    make_node("report", ["model"], ["report"]),
+    make_node("summarize", ["features"], ["summary"]),
+    make_node("unrelated", ["other"], ["other_out"]),
+]
+
+
+def changed(pipe, node_name, **attrs):
+    return [{**node, **attrs} if node["name"] == node_name else node for node in pipe]
+
+
+def run_impact(pipe1, pipe2, **kwargs):
+    result = diff_pipelines(pipe1, pipe2, **kwargs)
+    return impact(result, DatasetIndex.from_nodes(pipe2))
+
+
+def test_dataset_index():
+    index = DatasetIndex.from_snapshot(normalize({"__default__": PIPELINE}))
+    assert index.consumers["features"] == ("train", "summarize")
+    assert "report" not in index.consumers
+
+
+def test_no_changes():
+    result = run_impact(PIPELINE, PIPELINE)
+    assert result.affected_nodes == ()
+    assert result.run_command() == ""
+
+
+def test_modified_node_downstream():
+    result = run_impact(PIPELINE, changed(PIPELINE, "train", tags=["gpu"]))
+    assert result.changed_nodes == ("train",)
+    assert result.affected_nodes == ("train", "report")
+    assert result.from_nodes == ("train",)
+
+
+def test_changed_output_reaches_old_consumers():
+    pipe2 = changed(PIPELINE, "featurize", outputs=["features_v2"])
+    result = run_impact(PIPELINE, pipe2)
+    assert result.changed_datasets == ("features", "features_v2")
+    assert result.affected_nodes == ("featurize", "train", "report", "summarize")
+    # train and summarize still read features, nothing produces it anymore
+    assert result.from_nodes == ("featurize", "train", "summarize")
+
+
+def test_dropped_node_reruns_consumers():
+    pipe2 = [node for node in PIPELINE if node["name"] != "clean"]
+    result = run_impact(PIPELINE, pipe2)
+    assert result.changed_nodes == ()
+    assert result.affected_nodes == ("featurize", "train", "report", "summarize")
+    assert result.from_nodes == ("featurize",)
+
+
+def test_several_roots():
+    pipe2 = changed(PIPELINE, "report", tags=["x"])
+    pipe2 = changed(pipe2, "unrelated", tags=["x"])
+    pipe2 = changed(pipe2, "clean", tags=["x"])
+    result = run_impact(PIPELINE, pipe2)
+    assert result.from_nodes == ("clean", "unrelated")
+    assert len(result.affected_nodes) == len(PIPELINE)
+
+
+def test_renamed_node():
+    pipe2 = changed(PIPELINE, "train", name="ds.train")
+    result = run_impact(PIPELINE, pipe2, find_renames=True)
+    assert result.changed_nodes == ("ds.train",)
+    assert result.affected_nodes == ("ds.train", "report")
+
+
+@pytest.mark.parametrize(
+    "from_nodes,expected",
+    [
+        (False, "kedro run --pipeline __default__ --nodes train,report"),
+        (True, "kedro run --pipeline __default__ --from-nodes train"),
+    ],
+)
+def test_run_command(from_nodes, expected):
+    result = run_impact(PIPELINE, changed(PIPELINE, "train", tags=["gpu"]))
+    assert result.run_command(from_nodes=from_nodes) == expected
+
+
+def test_run_command_quotes():
+    pipe1 = [make_node("my node", ["a"], ["b"])]
+    result = impact(
+        diff_pipelines(
+            pipe1, changed(pipe1, "my node", tags=["x"]), name="data science"
+        ),
+        DatasetIndex.from_nodes(pipe1),
+    )
+    assert result.run_command() == (
+        "kedro run --pipeline 'data science' --nodes 'my node'"
+    )
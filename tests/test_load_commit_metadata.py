@@ -19,7 +19,7 @@ from kedro_diff.commit_parser import load_commit_metadata
             },
             "meta2": {
                 "commit": "HEAD",
-                "sha": "hs0af0ahj",
+                "sha": "9c1e5d2b7",
                 "pipelines": [
                     "__default__",
                     "ten_nodes",
@@ -37,8 +37,8 @@ from kedro_diff.commit_parser import load_commit_metadata
                 ],
             },
             "meta2": {
-                "commit": "hs0af0ahj",
-                "sha": "hs0af0ahj",
+                "commit": "9c1e5d2b7",
+                "sha": "9c1e5d2b7",
                 "pipelines": [
                     "__default__",
                     "ten_nodes",
@@ -57,7 +57,7 @@ from kedro_diff.commit_parser import load_commit_metadata
             },
             "meta2": {
                 "commit": "feat/new-nodes",
-                "sha": "hs0af0ahj",
+                "sha": "9c1e5d2b7",
                 "pipelines": [
                     "__default__",
                     "ten_nodes",
@@ -76,7 +76,7 @@ from kedro_diff.commit_parser import load_commit_metadata
             },
             "meta2": {
                 "commit": "feat/new.nodes",
-                "sha": "hs0af0ahj",
+                "sha": "9c1e5d2b7",
                 "pipelines": [
                     "__default__",
                     "ten_nodes",
@@ -86,17 +86,22 @@ from kedro_diff.commit_parser import load_commit_metadata
         },
     ],
 )
-def test_load_commit_metadata(tmpdir, runargs):
+def test_load_commit_metadata(tmpdir, mocker, runargs):
     def run(meta1, meta2):
-        p = tmpdir.mkdir(".kedro-diff")
-        meta_file1 = p.join(
-            f"{meta1['commit'].replace('/', '_').replace(' ', '_')}-commit-metadata.json"
+        shas = {meta1["commit"]: meta1["sha"], meta2["commit"]: meta2["sha"]}
+        mocker.patch(
+            "kedro_diff.commit_parser.resolve_sha",
+            side_effect=lambda root_dir, commit: shas[commit],
         )
-        meta_file2 = p.join(
-            f"{meta2['commit'].replace('/', '_').replace(' ', '_')}-commit-metadata.json"
+        mocker.patch(
+            "kedro_diff.commit_parser.snapshot_key",
+            side_effect=lambda root_dir, sha: sha,
         )
-        meta_file1.write(json.dumps(meta1))
-        meta_file2.write(json.dumps(meta2))
-        load_commit_metadata(f"{meta1['commit']}..{meta2['commit']}", root_dir=tmpdir)
+        p = tmpdir.mkdir(".kedro-diff")
+        p.mkdir(meta1["sha"]).join("commit-metadata.json").write(json.dumps(meta1))
+        p.mkdir(meta2["sha"]).join("commit-metadata.json").write(json.dumps(meta2))
+        assert load_commit_metadata(
+            f"{meta1['commit']}..{meta2['commit']}", root_dir=tmpdir
+        ) == (meta1, meta2)
 
     run(**runargs)
@@ -0,0 +1,176 @@
+import sys
+from copy import deepcopy
+
+import pytest
+
+from kedro_diff import matrix
+from kedro_diff.filters import DiffFilter
+from kedro_diff.fingerprint import snapshot_hashes
+from kedro_diff.matrix import (
+    NodeMatrix,
+    _change_counts_python,
+    attr_versions,
+    change_counts,
+    format_table,
+    matrix_lines,
+    version_label,
+)
+from kedro_diff.snapshot import normalize
+
+
+def make_node(name, inputs=(), outputs=(), tags=()):
+    return {
+        "name": name,
+        "func": name,
+        "inputs": list(inputs),
+        "outputs": list(outputs),
+        "tags": list(tags),
+    }
+
+
+MAIN = [
+    make_node("clean", ["raw"], ["clean"], ["de"]),
+    make_node("split", ["clean"], ["train"], ["ds"]),
+    make_node("fit", ["train"], ["model"], ["ds"]),
+]
+
+
+def snapshot_of(pipeline):
+    snapshot = normalize({"__default__": pipeline})
+    snapshot["hashes"] = snapshot_hashes(snapshot)
+    return snapshot
+
+
+@pytest.fixture
+def snapshots():
+    release = deepcopy(MAIN)
+    release[1]["outputs"] = ["train", "test"]
+    dev = deepcopy(release)
+    dev[2]["inputs"] = ["train", "params:seed"]
+    dev.append(make_node("report", ["model"], ["report"], ["ds"]))
+    return [snapshot_of(MAIN), snapshot_of(release), snapshot_of(dev)]
+
+
+COLUMNS = [[1, 1, 0, 2], [1, 2, 0, 2], [1, 2, 1, 3]]
+COUNTS = [[0, 1, 3], [1, 0, 2], [3, 2, 0]]
+
+
+def test_change_counts_python():
+    assert _change_counts_python(COLUMNS) == COUNTS
+    assert _change_counts_python([]) == []
+
+
+def test_change_counts():
+    assert change_counts(COLUMNS) == COUNTS
+    assert change_counts([[1, 2]]) == [[0]]
+
+
+def test_change_counts_numpy():
+    pytest.importorskip("numpy")
+    assert change_counts(COLUMNS) == _change_counts_python(COLUMNS)
+    assert change_counts([]) == []
+
+
+def test_change_counts_without_numpy(monkeypatch):
+    # a None entry makes the import fail as if numpy was not installed
+    monkeypatch.setitem(sys.modules, "numpy", None)
+    assert change_counts(COLUMNS) == COUNTS
+
+
+def test_from_snapshots(snapshots):
+    node_matrix = NodeMatrix.from_snapshots(["main", "release", "dev"], snapshots)
+    assert node_matrix.names == ("clean", "fit", "report", "split")
+    assert [list(column) for column in node_matrix.columns] == [
+        [1, 1, 0, 1],
+        [1, 1, 0, 2],
+        [1, 2, 1, 2],
+    ]
+    assert node_matrix.changes() == [[0, 1, 3], [1, 0, 2], [3, 2, 0]]
+    assert node_matrix.num_changed_nodes == 3
+    assert [name for name, _ in node_matrix.changed_nodes()] == [
+        "fit",
+        "report",
+        "split",
+    ]
+    assert node_matrix.changed_attrs() == [
+        ("fit", "inputs", (1, 1, 2)),
+        ("split", "outputs", (1, 2, 2)),
+    ]
+
+
+def test_attr_versions():
+    node = make_node("fit", ["train"], ["model"])
+    renamed = {**node, "func": "train_model", "func_hash": "a"}
+    assert attr_versions([node, None, node]) == {}
+    assert attr_versions([node, renamed, None, {**renamed, "tags": ["ds"]}]) == {
+        "func": (1, 2, 0, 2),
+        "tags": (1, 1, 0, 2),
+        "func_hash": (1, 2, 0, 2),
+    }
+
+
+def test_same_snapshot_twice(snapshots):
+    node_matrix = NodeMatrix.from_snapshots(["a", "b"], [snapshots[0]] * 2)
+    assert node_matrix.changes() == [[0, 0], [0, 0]]
+    assert node_matrix.num_changed_nodes == 0
+
+
+def test_from_snapshots_filters_nodes(snapshots):
+    node_matrix = NodeMatrix.from_snapshots(
+        ["main", "dev"],
+        [snapshots[0], snapshots[2]],
+        diff_filter=DiffFilter(tags=("de",)),
+    )
+    assert node_matrix.names == ("clean",)
+    assert node_matrix.num_changed_nodes == 0
+
+
+def test_missing_pipeline(snapshots):
+    node_matrix = NodeMatrix.from_snapshots(["main"], snapshots[:1], "missing")
+    assert node_matrix.names == ()
+    assert node_matrix.changes() == [[0]]
+
+
+def test_to_record(snapshots):
+    record = NodeMatrix.from_snapshots(["main", "dev"], snapshots[::2]).to_record()
+    assert record == {
+        "type": "matrix",
+        "pipeline": "__default__",
+        "refs": ["main", "dev"],
+        "changes": [[0, 3], [3, 0]],
+        "nodes": {"fit": [1, 2], "report": [0, 1], "split": [1, 2]},
+        "attrs": {
+            "fit": {"inputs": [1, 2]},
+            "report": {},
+            "split": {"outputs": [1, 2]},
+        },
+    }
+
+
+def test_format_table():
+    assert format_table(["", "a", "long"], [["x", "1", "2"]]) == [
+        "   a  long",
+        "x  1  2",
+    ]
+
+
+def test_version_label():
+    assert version_label(matrix.ABSENT) == "-"
+    assert version_label(2) == "v2"
+
+
+def test_matrix_lines(snapshots):
+    node_matrix = NodeMatrix.from_snapshots(["main", "release"], snapshots[:2])
+    assert matrix_lines(node_matrix) == [
+        "pipeline: __default__",
+        "         main  release",
+        "main     0     1",
+        "release  1     0",
+        "",
+        "node   main  release",
+        "split  v1    v2",
+        "",
+        "node   attr     main  release",
+        "split  outputs  v1    v2",
+    ]
+    assert matrix_lines(node_matrix, stat=True) == matrix_lines(node_matrix)[:4]
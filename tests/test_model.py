@@ -0,0 +1,130 @@
+import json
+import sys
+
+import pytest
+
+from kedro_diff import binary_snapshot
+from kedro_diff.engine import diff_pipelines
+from kedro_diff.model import NODE_FIELDS, NodeRecord, StringTable, as_lists
+from kedro_diff.node_diff import NodeDiff
+from kedro_diff.render import PlainRenderer
+from kedro_diff.snapshot import (
+    load_snapshot,
+    normalize,
+    snapshot_file,
+    write_snapshot_file,
+)
+
+NODE = {
+    "name": "ds.split",
+    "namespace": "ds",
+    "func": "split_data",
+    "func_hash": "0123456789abcdef0123456789abcdef",
+    "inputs": ["raw", "params:ratio"],
+    "outputs": ["train", "test"],
+    "tags": ["ds"],
+}
+
+
+def test_string_table():
+    strings = StringTable()
+    first = strings.intern("".join(["ra", "w"]))
+    assert strings.intern("raw") is first
+    assert strings.intern_all(["raw", "raw"]) == ("raw", "raw")
+    assert strings.intern_all(None) is None
+    assert len(strings) == 1
+
+
+def test_record_reads_like_a_dict():
+    node = NodeRecord.from_mapping(NODE)
+    assert node["inputs"] == ("raw", "params:ratio")
+    assert node.get("func") == "split_data"
+    assert list(node) == list(NODE_FIELDS)
+    assert len(node) == 7
+    assert node.to_dict() == NODE
+    assert node == NODE
+    assert node != {**NODE, "tags": []}
+    assert node != "split"
+    assert "split" in repr(node)
+
+
+def test_missing_fields():
+    node = NodeRecord.from_mapping({"name": "a", "inputs": ["x"], "extra": 1})
+    assert dict(node) == {"name": "a", "inputs": ("x",)}
+    assert node.get("func") is None
+    assert node.get("extra") is None
+    with pytest.raises(KeyError):
+        node["outputs"]
+    with pytest.raises(KeyError):
+        node["extra"]
+
+
+def test_record_equality():
+    assert NodeRecord.from_mapping(NODE) == NodeRecord.from_mapping(NODE)
+    assert NodeRecord.from_mapping(NODE) != NodeRecord.from_mapping(
+        {**NODE, "outputs": ["train"]}
+    )
+    with pytest.raises(TypeError):
+        hash(NodeRecord("a"))
+
+
+def test_record_is_slotted():
+    node = NodeRecord("a")
+    assert not hasattr(node, "__dict__")
+    assert sys.getsizeof(node) < sys.getsizeof(dict(NODE))
+
+
+def test_as_lists():
+    assert as_lists({"name": "a", "inputs": ("x",)}) == {"name": "a", "inputs": ["x"]}
+
+
+@pytest.mark.parametrize("snapshot_format", ["json", "binary"])
+def test_load_snapshot_interns_strings(tmpdir, snapshot_format):
+    nodes = [
+        {**NODE, "name": "split"},
+        {**NODE, "name": "train", "inputs": ["train"], "outputs": ["model"]},
+    ]
+    for key, pipeline in (("a", nodes), ("b", nodes[:1])):
+        write_snapshot_file(
+            normalize({"__default__": pipeline}),
+            key,
+            tmpdir,
+            snapshot_format=snapshot_format,
+        )
+    strings = StringTable()
+    snapshot1 = load_snapshot("a", tmpdir, strings=strings)
+    snapshot2 = load_snapshot("b", tmpdir, strings=strings)
+    split, train = snapshot1["nodes"]
+    assert isinstance(split, NodeRecord)
+    assert split["outputs"][0] is train["inputs"][0]
+    assert split["tags"][0] is snapshot2["nodes"][0]["tags"][0]
+    assert split == snapshot2["nodes"][0]
+
+
+def test_json_snapshot_is_unchanged_on_disk(tmpdir):
+    snapshot = normalize({"__default__": [NODE]})
+    write_snapshot_file(snapshot, "a", tmpdir)
+    load_snapshot("a", tmpdir)
+    assert json.loads(snapshot_file("a", tmpdir).read_text()) == snapshot
+
+
+def test_binary_to_dict_has_lists(tmpdir):
+    snapshot = normalize({"__default__": [NODE]})
+    path = binary_snapshot.write(snapshot, tmpdir / "snapshot.kds")
+    with binary_snapshot.BinarySnapshot(path) as loaded:
+        assert loaded.to_dict()["nodes"] == [NODE]
+
+
+def test_diff_records():
+    strings = StringTable()
+    node1 = NodeRecord.from_mapping(NODE, strings)
+    node2 = NodeRecord.from_mapping({**NODE, "outputs": ["train"]}, strings)
+    result = diff_pipelines([node1], [node2])
+    assert result.modified_nodes == {"ds.split"}
+    renderer = PlainRenderer()
+    NodeDiff(node1, node2, "ds.split", renderer=renderer).diff()
+    assert renderer.buffer == [
+        "M ds.split",
+        "    -outputs:  ['train', 'test']",
+        "    +outputs:  ['train']",
+    ]
@@ -272,3 +272,18 @@ def test_diff_Node_attrs(caplog, capsys):
     log = capsys.readouterr().out
     assert "unchanged" not in log
     assert log == ""
+
+
+def test_is_renamed():
+    assert NodeDiff(nodes[0], {**nodes[0], "name": "moved"}).is_renamed is True
+    assert NodeDiff(nodes[0], nodes[0]).is_renamed is False
+    assert NodeDiff(None, nodes[0]).is_renamed is False
+
+
+def test_diff_renamed(capsys):
+    node1 = {"name": "split", "inputs": ["raw"]}
+    node2 = {"name": "ds.split", "inputs": ["raw"]}
+    NodeDiff(node1, node2, "ds.split").diff()
+    out = capsys.readouterr().out
+    assert "R ds.split" in out
+    assert "inputs" not in out
@@ -0,0 +1,66 @@
+from kedro.pipeline.node import Node, node
+
+from kedro_diff.node_diff import NodeDiff
+from kedro_diff.node_diff.schema import class_fields, node_fields
+from kedro_diff.render import PlainRenderer
+
+
+class Counted:
+    """A node class that counts every read of its fields."""
+
+    reads = 0
+
+    def __init__(self, name, inputs):
+        self._name = name
+        self._inputs = inputs
+
+    @property
+    def name(self):
+        Counted.reads += 1
+        return self._name
+
+    @property
+    def inputs(self):
+        Counted.reads += 1
+        return self._inputs
+
+    def run(self):  # pragma: no cover
+        raise AssertionError("methods are never called")
+
+
+def test_class_fields_are_properties():
+    assert class_fields(Counted) == ("inputs", "name")
+    fields = class_fields(Node)
+    assert {"func", "inputs", "name", "outputs", "tags"} <= set(fields)
+    assert "run" not in fields
+    assert "tag" not in fields
+
+
+def test_class_fields_are_cached():
+    class_fields.cache_clear()
+    class_fields(Counted)
+    class_fields(Counted)
+    assert class_fields.cache_info().hits == 1
+
+
+def test_node_fields():
+    assert node_fields(None) == ()
+    assert node_fields({"name": "a", "_private": 1, "inputs": []}) == ("name", "inputs")
+    assert node_fields(Counted("a", [])) == ("inputs", "name")
+
+
+def test_fields_are_read_once():
+    Counted.reads = 0
+    diff = NodeDiff(Counted("a", ["x"]), Counted("b", ["y"]), "b")
+    diff.is_renamed
+    diff.get_attr("name")
+    diff.attrs
+    assert Counted.reads == 2
+
+
+def test_diff_live_nodes():
+    node1 = node(lambda x: x, "input", "output", name="id")
+    node2 = node(lambda x: x, "input2", "output", name="id")
+    renderer = PlainRenderer()
+    NodeDiff(node1, node2, "id", renderer=renderer).diff_attrs()
+    assert renderer.buffer == ["    -inputs:   ['input']", "    +inputs:   ['input2']"]
@@ -0,0 +1,236 @@
+import pytest
+from kedro.config import OmegaConfigLoader
+
+from kedro_diff import parameters as parameters_module
+from kedro_diff.diff import KedroDiff
+from kedro_diff.parameters import (
+    changed_keys,
+    flatten,
+    is_globals,
+    load_parameters,
+    parameter_nodes,
+    parse_keys,
+)
+from kedro_diff.render import PlainRenderer, section_records
+from kedro_diff.snapshot import load_snapshot, normalize, write_snapshot_file
+
+BASE = """
+model:
+  alpha: 0.1
+  features: [a, b]
+seed: 42
+start: 2021-01-01
+"""
+
+DATA = """
+split:
+  ratio: 0.2
+"""
+
+
+def write_conf(project_path, files):
+    for name, text in files.items():
+        path = project_path / "conf" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+class Context:
+    """The parts of a KedroContext that parameters are loaded from."""
+
+    def __init__(self, project_path, env=None):
+        self.project_path = project_path
+        self.env = env
+        self.config_loader = OmegaConfigLoader(
+            str(project_path / "conf"),
+            env=env,
+            base_env="base",
+            default_run_env="local",
+        )
+        self.resolved = 0
+
+    @property
+    def params(self):
+        self.resolved += 1
+        return self.config_loader["parameters"]
+
+
+def make_context(project_path, env=None):
+    return Context(project_path, env)
+
+
+def test_flatten():
+    assert flatten({"a": {"b": 1, "c": [1, {"d": 2}]}}, "p") == {
+        "p.a.b": 1,
+        "p.a.c": [1, {"d": 2}],
+    }
+    assert flatten(3, "seed") == {"seed": 3}
+
+
+def test_parse_keys(tmp_path):
+    write_conf(tmp_path, {"base/parameters.yml": BASE, "base/p.json": '{"x": 1}'})
+    parsed = parse_keys(tmp_path / "conf" / "base" / "parameters.yml")
+    assert parsed == ["model", "seed", "start"]
+    assert parse_keys(tmp_path / "conf" / "base" / "p.json") == ["x"]
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("base/globals.yml", True),
+        ("local/globals/model.yml", True),
+        ("base/parameters.yml", False),
+        ("globals/parameters.yml", False),
+    ],
+)
+def test_is_globals(name, expected):
+    assert is_globals(name) is expected
+
+
+def test_load_parameters(tmp_path):
+    write_conf(
+        tmp_path,
+        {
+            "base/parameters.yml": BASE,
+            "base/parameters/data.yml": DATA,
+            "base/catalog.yml": "cars: {}",
+            "local/parameters.yml": "seed: 7",
+            "prod/parameters.yml": "seed: 1",
+        },
+    )
+    parameters = load_parameters(make_context(tmp_path), tmp_path)
+    assert list(parameters["files"]) == [
+        "base/parameters/data.yml",
+        "base/parameters.yml",
+        "local/parameters.yml",
+    ]
+    assert parameters["sources"] == {
+        "split": "base/parameters/data.yml",
+        "model": "base/parameters.yml",
+        "seed": "local/parameters.yml",
+        "start": "base/parameters.yml",
+    }
+    assert parameters["values"]["seed"] == {"seed": 7}
+    assert parameters["values"]["start"] == {"start": "2021-01-01"}
+    prod = load_parameters(make_context(tmp_path, env="prod"), tmp_path)
+    assert prod["values"]["seed"] == {"seed": 1}
+
+
+def test_files_are_parsed_once_per_blob(tmp_path, monkeypatch):
+    write_conf(tmp_path, {"base/parameters.yml": BASE, "local/parameters.yml": DATA})
+    expected = load_parameters(make_context(tmp_path), tmp_path)
+    parsed = []
+    parse_keys = parameters_module.parse_keys
+
+    def counting_parse_keys(path):
+        parsed.append(path.name)
+        return parse_keys(path)
+
+    monkeypatch.setattr(parameters_module, "parse_keys", counting_parse_keys)
+    context = make_context(tmp_path)
+    assert load_parameters(context, tmp_path) == expected
+    assert parsed == []
+    assert context.resolved == 0
+    write_conf(tmp_path, {"local/parameters.yml": "split: {ratio: 0.3}"})
+    context = make_context(tmp_path)
+    changed = load_parameters(context, tmp_path)
+    assert parsed == ["parameters.yml"]
+    assert context.resolved == 1
+    assert changed["values"]["split"] == {"split.ratio": 0.3}
+    load_parameters(make_context(tmp_path))
+    assert len(parsed) == 3
+
+
+def test_globals_are_resolved(tmp_path):
+    write_conf(
+        tmp_path,
+        {
+            "base/parameters.yml": "split: {ratio: '${globals:ratio}'}\nseed: 1\n",
+            "base/globals.yml": "ratio: 0.2\n",
+            "local/.gitkeep": "",
+        },
+    )
+    parameters1 = load_parameters(make_context(tmp_path), tmp_path)
+    assert parameters1["values"]["split"] == {"split.ratio": 0.2}
+    assert "base/globals.yml" in parameters1["files"]
+    write_conf(tmp_path, {"base/globals.yml": "ratio: 0.3\n"})
+    context = make_context(tmp_path)
+    parameters2 = load_parameters(context, tmp_path)
+    assert context.resolved == 1
+    assert parameters2["values"]["split"] == {"split.ratio": 0.3}
+    assert changed_keys(parameters1, parameters2) == {"split", "seed"}
+    diff = KedroDiff.from_parameters(
+        {"parameters": parameters1}, {"parameters": parameters2}
+    )
+    assert diff.result.modified_nodes == {"split.ratio"}
+
+
+def snapshot_of(project_path):
+    snapshot = normalize({})
+    snapshot["parameters"] = load_parameters(make_context(project_path))
+    return snapshot
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    write_conf(tmp_path, {"base/parameters.yml": BASE, "local/parameters.yml": DATA})
+    snapshot1 = snapshot_of(tmp_path)
+    write_conf(
+        tmp_path,
+        {
+            "local/parameters.yml": "split:\n  ratio: 0.3\n  shuffle: true\n",
+            "local/parameters_new.yml": "epochs: 10",
+        },
+    )
+    return snapshot1, snapshot_of(tmp_path)
+
+
+def test_changed_keys(snapshots):
+    parameters1, parameters2 = (snapshot["parameters"] for snapshot in snapshots)
+    assert changed_keys(parameters1, parameters2) == {"split", "epochs"}
+    assert changed_keys(parameters1, parameters1) == set()
+    assert changed_keys({}, parameters1) == {"model", "seed", "split", "start"}
+
+
+def test_parameter_nodes(snapshots):
+    assert parameter_nodes(snapshots[0]["parameters"], {"model", "missing"}) == [
+        {"name": "model.alpha", "value": "0.1"},
+        {"name": "model.features", "value": '["a", "b"]'},
+    ]
+
+
+def test_parameters_diff(snapshots):
+    renderer = PlainRenderer()
+    diff = KedroDiff.from_parameters(*snapshots, renderer=renderer)
+    result = diff.result
+    assert result.name == "parameters"
+    assert result.new_nodes == {"epochs", "split.shuffle"}
+    assert result.modified_nodes == {"split.ratio"}
+    assert result.common_nodes == {"split.ratio"}
+    diff.diff()
+    assert "M split.ratio" in renderer.buffer
+    assert "    +value:    0.3" in renderer.buffer
+
+
+def test_parameter_records(snapshots):
+    records = list(section_records(KedroDiff.from_parameters(*snapshots).result))
+    assert records[0]["type"] == "parameters"
+    assert records[0]["new"] == 2
+    assert records[-1] == {
+        "type": "parameter",
+        "parameter": "split.shuffle",
+        "change": "new",
+        "attrs": {
+            "name": {"old": None, "new": "split.shuffle"},
+            "value": {"old": None, "new": "true"},
+        },
+    }
+
+
+@pytest.mark.parametrize("snapshot_format", ["json", "binary"])
+def test_parameters_are_stored(tmp_path, snapshots, snapshot_format):
+    write_snapshot_file(snapshots[0], "key", tmp_path, snapshot_format=snapshot_format)
+    loaded = load_snapshot("key", tmp_path)
+    assert dict(loaded["parameters"]) == snapshots[0]["parameters"]
+    stored = KedroDiff.from_parameters(loaded, snapshots[1]).result
+    assert stored == KedroDiff.from_parameters(*snapshots).result
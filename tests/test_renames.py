@@ -0,0 +1,110 @@
+from kedro_diff.renames import base_name, find_renames, signature, similarity, tokens
+
+
+def make_node(name, inputs=(), outputs=(), tags=(), func=None):
+    node = {
+        "name": name,
+        "inputs": list(inputs),
+        "outputs": list(outputs),
+        "tags": list(tags),
+    }
+    if func is not None:
+        node["func"] = func
+    return node
+
+
+def by_name(*nodes):
+    return {node["name"]: node for node in nodes}
+
+
+def test_base_name():
+    assert base_name("ds.model.train") == "train"
+    assert base_name("train") == "train"
+
+
+def test_signature_ignores_name_and_order():
+    assert signature(make_node("a", ["x", "y"], ["z"])) == signature(
+        make_node("b", ["y", "x"], ["z"])
+    )
+    assert signature(make_node("a", func="f")) != signature(make_node("a", func="g"))
+
+
+def test_signature_ignores_callables():
+    assert signature({"name": "a", "func": lambda x: x}) == signature({"name": "a"})
+
+
+def test_similarity():
+    a = tokens(make_node("ds.a", ["x", "y"], ["z"]))
+    b = tokens(make_node("de.a", ["x"], ["z"]))
+    assert similarity(a, a) == 1
+    assert similarity(a, b) == 3 / 4
+    assert similarity(frozenset(), frozenset()) == 1
+
+
+def test_find_renames_identical():
+    dropped = by_name(make_node("split", ["raw"], ["train"], func="split_data"))
+    new = by_name(
+        make_node("ds.split", ["raw"], ["train"], func="split_data"),
+        make_node("ds.report", ["train"], ["report"]),
+    )
+    assert find_renames(dropped, new) == [("split", "ds.split")]
+
+
+def test_find_renames_identical_prefers_base_name():
+    dropped = by_name(
+        make_node("a.fit", ["x"], ["y"]), make_node("a.fit2", ["x"], ["y"])
+    )
+    new = by_name(make_node("b.fit2", ["x"], ["y"]), make_node("b.fit", ["x"], ["y"]))
+    assert find_renames(dropped, new) == [("a.fit", "b.fit"), ("a.fit2", "b.fit2")]
+
+
+def test_find_renames_similar():
+    dropped = by_name(
+        make_node("train", ["features", "params:seed"], ["model"], ["ds"]),
+        make_node("report", ["metrics"], ["report"]),
+    )
+    new = by_name(
+        make_node("data_science.train", ["features"], ["model"], ["ds"]),
+        make_node("plot", ["images"], ["plots"]),
+    )
+    assert find_renames(dropped, new) == [("train", "data_science.train")]
+
+
+def test_find_renames_threshold():
+    dropped = by_name(make_node("a", ["x", "y", "z"], ["out"]))
+    new = by_name(make_node("b", ["x"], ["other"]))
+    assert find_renames(dropped, new) == []
+    assert find_renames(dropped, new, threshold=0.1) == [("a", "b")]
+
+
+def test_find_renames_pairs_each_node_once():
+    dropped = by_name(make_node("a", ["x"], ["y"]), make_node("b", ["x"], ["y"]))
+    new = by_name(make_node("c", ["x"], ["y"]))
+    assert len(find_renames(dropped, new)) == 1
+
+
+def test_find_renames_empty_nodes_are_not_identical():
+    assert find_renames(by_name(make_node("a")), by_name(make_node("b"))) == []
+
+
+def test_find_renames_scales_near_linearly(mocker):
+    num_nodes = 5000
+    dropped = by_name(
+        *(
+            make_node(f"n{i}", [f"d{i}"], [f"d{i + 1}"], ["shared"])
+            for i in range(num_nodes)
+        )
+    )
+    new = by_name(
+        *(
+            make_node(f"ns.n{i}", [f"d{i}"], [f"d{i + 1}", "extra"], ["shared"])
+            for i in range(num_nodes)
+        )
+    )
+    scored = mocker.patch("kedro_diff.renames.similarity", wraps=similarity)
+    renames = find_renames(dropped, new)
+    # tokens on every node are not indexed, each node is scored against the
+    # one node it shares its datasets with
+    assert scored.call_count == num_nodes
+    assert len(renames) == num_nodes
+    assert all(new_name == f"ns.{old_name}" for old_name, new_name in renames)
@@ -0,0 +1,255 @@
+import io
+import json
+
+import pytest
+
+from kedro_diff.engine import diff_pipelines
+from kedro_diff.diff import KedroDiff
+from kedro_diff.render import (
+    BUFFER_LINES,
+    JsonWriter,
+    NdjsonWriter,
+    PlainRenderer,
+    RecordWriter,
+    Renderer,
+    RichRenderer,
+    attr_changes,
+    diff_records,
+    get_renderer,
+    get_writer,
+    pipeline_record,
+    stat_line,
+)
+from kedro_diff.sample_data import create_simple_sample
+
+
+def make_node(name, inputs, outputs, tags=()):
+    return {"name": name, "inputs": inputs, "outputs": outputs, "tags": list(tags)}
+
+
+PIPE1 = [
+    make_node("clean", ["raw"], ["clean"]),
+    make_node("train", ["clean"], ["model"]),
+    make_node("report", ["model"], ["report"]),
+]
+PIPE2 = [
+    make_node("clean", ["raw"], ["clean"], tags=["etl"]),
+    make_node("ds.train", ["clean"], ["model"]),
+    make_node("score", ["model"], ["score"]),
+]
+
+
+@pytest.fixture
+def result():
+    return diff_pipelines(PIPE1, PIPE2, find_renames=True)
+
+
+def test_pipeline_record(result):
+    record = pipeline_record(result)
+    assert record == {
+        "type": "pipeline",
+        "pipeline": "__default__",
+        "changes": result.num_changes,
+        "adds": result.num_adds,
+        "drops": result.num_drops,
+        "new": 1,
+        "dropped": 1,
+        "modified": 1,
+        "renamed": 1,
+    }
+
+
+def test_node_records(result):
+    records = {r["node"]: r for r in diff_records([result]) if r["type"] == "node"}
+    assert {name: r["change"] for name, r in records.items()} == {
+        "clean": "modified",
+        "ds.train": "renamed",
+        "report": "dropped",
+        "score": "new",
+    }
+    assert records["ds.train"]["old_name"] == "train"
+    assert records["ds.train"]["attrs"] == {"name": {"old": "train", "new": "ds.train"}}
+    assert records["clean"]["attrs"] == {"tags": {"old": [], "new": ["etl"]}}
+    assert records["score"]["attrs"]["outputs"] == {"old": None, "new": ["score"]}
+
+
+def test_stat_only_yields_pipeline_records(result):
+    assert [r["type"] for r in diff_records([result], stat=True)] == ["pipeline"]
+
+
+def test_unchanged_pipeline_only_has_a_pipeline_record():
+    result = diff_pipelines(PIPE1, PIPE1)
+    assert [r["type"] for r in diff_records([result])] == ["pipeline"]
+
+
+def test_attr_changes_skips_callables():
+    node1 = {"name": "a", "func": lambda x: x, "inputs": ["x"]}
+    node2 = {"name": "a", "func": lambda x: x, "inputs": ["y"]}
+    assert attr_changes(node1, node2) == {"inputs": {"old": ["x"], "new": ["y"]}}
+
+
+def test_records_are_lazy():
+    seen = []
+
+    def results():
+        for n in (2, 3):
+            seen.append(n)
+            yield diff_pipelines(
+                create_simple_sample(2)["pipeline"], create_simple_sample(n)["pipeline"]
+            )
+
+    records = diff_records(results())
+    assert next(records)["type"] == "pipeline"
+    assert seen == [2]
+
+
+def test_ndjson_writer(result):
+    stream = io.StringIO()
+    NdjsonWriter(stream).write_all(diff_records([result]))
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 5
+    assert [json.loads(line)["type"] for line in lines][0] == "pipeline"
+
+
+def test_json_writer(result):
+    stream = io.StringIO()
+    JsonWriter(stream).write_all(diff_records([result]))
+    records = json.loads(stream.getvalue())
+    assert records == list(diff_records([result]))
+
+
+def test_record_writer_is_abstract():
+    with pytest.raises(TypeError, match="write"):
+        RecordWriter(io.StringIO())
+
+
+def test_json_writer_empty():
+    stream = io.StringIO()
+    JsonWriter(stream).write_all([])
+    assert json.loads(stream.getvalue()) == []
+
+
+@pytest.mark.parametrize(
+    "output_format,writer_class",
+    [("json", JsonWriter), ("ndjson", NdjsonWriter), ("rich", type(None))],
+)
+def test_get_writer(output_format, writer_class):
+    assert type(get_writer(output_format, io.StringIO())) is writer_class
+
+
+def render(renderer, pipe1=PIPE1, pipe2=PIPE2):
+    diff = KedroDiff(
+        {"pipeline": pipe1}, {"pipeline": pipe2}, find_renames=True, renderer=renderer
+    )
+    diff.stat()
+    diff.diff()
+    renderer.close()
+
+
+def test_stat_line(result):
+    assert stat_line(result).startswith("[red]M[/red] __default__")
+    assert stat_line(result, markup=False) == (
+        f"M {'__default__'.ljust(30)} | 5 ++-- (1 renamed)"
+    )
+
+
+def test_plain_renderer():
+    stream = io.StringIO()
+    render(PlainRenderer(stream))
+    lines = stream.getvalue().splitlines()
+    assert lines[1:] == [
+        "modified: __default__",
+        "M clean",
+        "    -tags:     []",
+        "    +tags:     ['etl']",
+        "R ds.train",
+        "    -name:     train",
+        "    +name:     ds.train",
+        "- report",
+        "    -name:     report",
+        "    -inputs:   ['model']",
+        "    -outputs:  ['report']",
+        "    -tags:     []",
+        "+ score",
+        "    +name:     score",
+        "    +inputs:   ['model']",
+        "    +outputs:  ['score']",
+        "    +tags:     []",
+    ]
+
+
+def test_plain_renderer_is_buffered():
+    stream = io.StringIO()
+    renderer = PlainRenderer(stream)
+    renderer.message("first")
+    assert stream.getvalue() == ""
+    for _ in range(BUFFER_LINES):
+        renderer.message("line")
+    assert stream.getvalue().startswith("first\n")
+    renderer.close()
+    assert len(stream.getvalue().splitlines()) == BUFFER_LINES + 1
+
+
+# stat, header, clean and its tags
+@pytest.mark.parametrize(
+    "renderer_class,max_lines", [(PlainRenderer, 5), (RichRenderer, 6)]
+)
+def test_max_lines(renderer_class, max_lines):
+    stream = io.StringIO()
+    render(renderer_class(stream, max_lines=max_lines))
+    lines = stream.getvalue().splitlines()
+    assert "R ds.train" not in lines
+    assert lines[-1] == (
+        f"... truncated after {max_lines} lines, "
+        "not shown: 1 new, 1 dropped, 1 renamed nodes"
+    )
+    assert len(lines) == max_lines + 1
+
+
+def test_max_lines_keeps_attr_lines_together():
+    renderer = PlainRenderer(io.StringIO(), max_lines=2)
+    renderer.node("modified", "clean")
+    renderer.attr("modified", "tags", ["a"], ["b"])
+    assert renderer.truncated
+    assert renderer.lines == 1
+
+
+def test_max_lines_summarizes_pipelines():
+    stream = io.StringIO()
+    renderer = PlainRenderer(stream, max_lines=1)
+    for name in ("a", "b", "c"):
+        KedroDiff(
+            {"pipeline": PIPE1}, {"pipeline": PIPE2}, name=name, renderer=renderer
+        ).stat()
+    renderer.close()
+    assert stream.getvalue().splitlines()[-1].endswith("not shown: 2 pipelines")
+
+
+def test_rich_renderer():
+    stream = io.StringIO()
+    render(RichRenderer(stream))
+    out = stream.getvalue()
+    for expected in ("kedro-diff", "R ds.train", "- report", "+ score", "['etl']"):
+        assert expected in out
+
+
+def test_rich_renderer_does_not_parse_markup():
+    stream = io.StringIO()
+    RichRenderer(stream).node("new", "[red]node[/red]")
+    assert stream.getvalue() == "+ [red]node[/red]\n"
+
+
+def test_renderer_is_abstract():
+    with pytest.raises(TypeError, match="write_"):
+        Renderer(io.StringIO())
+
+
+@pytest.mark.parametrize(
+    "output_format,renderer_class",
+    [("plain", PlainRenderer), ("rich", RichRenderer), ("json", type(None))],
+)
+def test_get_renderer(output_format, renderer_class):
+    renderer = get_renderer(output_format, io.StringIO(), max_lines=3)
+    assert type(renderer) is renderer_class
+    if renderer is not None:
+        assert renderer.max_lines == 3
@@ -0,0 +1,129 @@
+import json
+
+import pytest
+
+from kedro_diff.sample_data import create_simple_sample
+from kedro_diff.snapshot import (
+    clean_name,
+    denormalize,
+    empty_snapshot,
+    is_valid,
+    load_metadata,
+    load_snapshot,
+    normalize,
+    snapshot_file,
+    snapshot_path,
+    write_metadata,
+    write_snapshot_file,
+)
+
+KEY = "4c2d8f0e1b7a"
+
+
+@pytest.mark.parametrize(
+    "name,expected",
+    [
+        ("main", "main"),
+        ("feat/new-nodes", "feat_new-nodes"),
+        ("data science", "data_science"),
+    ],
+)
+def test_clean_name(name, expected):
+    assert clean_name(name) == expected
+
+
+def test_snapshot_file_is_keyed(tmpdir):
+    assert snapshot_file(KEY, tmpdir).parent == snapshot_path(KEY, tmpdir)
+    assert snapshot_path(KEY, tmpdir).name == KEY
+
+
+def write_snapshot(root_dir, pipelines, key=KEY):
+    write_snapshot_file(
+        normalize({p: create_simple_sample(2)["pipeline"] for p in pipelines}),
+        key,
+        root_dir,
+    )
+    return write_metadata(
+        {"commit": "main", "key": key, "pipelines": pipelines}, root_dir
+    )
+
+
+def test_write_metadata(tmpdir):
+    path = write_snapshot(tmpdir, ["__default__"])
+    assert json.loads(path.read_text())["key"] == KEY
+    assert load_metadata(KEY, tmpdir)["pipelines"] == ["__default__"]
+    assert not path.with_suffix(".tmp").exists()
+
+
+def test_is_valid(tmpdir):
+    write_snapshot(tmpdir, ["__default__", "data_science"])
+    assert is_valid(KEY, tmpdir)
+
+
+def test_is_valid_missing_snapshot(tmpdir):
+    assert not is_valid(KEY, tmpdir)
+
+
+def test_is_valid_missing_snapshot_file(tmpdir):
+    write_snapshot(tmpdir, ["__default__", "data_science"])
+    snapshot_file(KEY, tmpdir).unlink()
+    assert not is_valid(KEY, tmpdir)
+
+
+def test_is_valid_wrong_key(tmpdir):
+    write_snapshot(tmpdir, ["__default__"])
+    (snapshot_path(KEY, tmpdir)).rename(snapshot_path("0" * 12, tmpdir))
+    assert not is_valid("0" * 12, tmpdir)
+
+
+def test_is_valid_corrupt_metadata(tmpdir):
+    path = write_snapshot(tmpdir, ["__default__"])
+    path.write_text("{")
+    assert not is_valid(KEY, tmpdir)
+
+
+def test_normalize_stores_each_node_once():
+    nodes = create_simple_sample(3)["pipeline"]
+    snapshot = normalize(
+        {"__default__": nodes, "first": nodes[:1], "last": nodes[1:]}, "0.17.2"
+    )
+    assert snapshot["kedro_version"] == "0.17.2"
+    assert snapshot["nodes"] == nodes
+    assert snapshot["pipelines"] == {
+        "__default__": [0, 1, 2],
+        "first": [0],
+        "last": [1, 2],
+    }
+
+
+def test_normalize_keeps_pipeline_order():
+    nodes = create_simple_sample(3)["pipeline"]
+    snapshot = normalize({"reversed": nodes[::-1], "__default__": nodes})
+    assert [n["name"] for n in snapshot["nodes"]] == ["node3", "node2", "node1"]
+    assert denormalize(snapshot, "__default__")["pipeline"] == nodes
+
+
+@pytest.mark.parametrize("num_nodes", [0, 1, 10])
+def test_denormalize_round_trip(num_nodes):
+    pipe = create_simple_sample(num_nodes)
+    snapshot = normalize({"__default__": pipe["pipeline"]}, pipe["kedro_version"])
+    assert denormalize(snapshot, "__default__") == pipe
+
+
+def test_denormalize_missing_pipeline():
+    snapshot = normalize({"__default__": create_simple_sample(2)["pipeline"]})
+    assert denormalize(snapshot, "data_science")["pipeline"] == []
+
+
+def test_load_snapshot(tmpdir):
+    write_snapshot(tmpdir, ["__default__"])
+    snapshot = load_snapshot(KEY, tmpdir)
+    assert denormalize(snapshot, "__default__")["pipeline"] == (
+        create_simple_sample(2)["pipeline"]
+    )
+
+
+def test_load_snapshot_missing(tmpdir):
+    with pytest.raises(FileNotFoundError):
+        load_snapshot(KEY, tmpdir)
+    assert load_snapshot(KEY, tmpdir, missing_ok=True) == empty_snapshot()
@@ -0,0 +1,191 @@
+import io
+import json
+import sys
+
+import pytest
+
+from kedro_diff import worker
+from kedro_diff.errors import KedroDiffError
+from kedro_diff.get_pipelines import CONF_PATHS, archive_checkout
+from kedro_diff.snapshot import SnapshotOptions, load_snapshot
+from kedro_diff.worker import ExtractionWorker, handle, purge_modules, serve
+
+
+def request(project_path, output, sha, **kwargs):
+    return {
+        "project_path": str(project_path),
+        "output": str(output),
+        "commit": "HEAD",
+        "sha": sha,
+        "key": "key",
+        **kwargs,
+    }
+
+
+def node_names(root_dir):
+    return [node["name"] for node in load_snapshot("key", root_dir)["nodes"]]
+
+
+def test_purge_modules(monkeypatch):
+    for name in ("purged_pkg", "purged_pkg.nodes", "purged_pkg_other"):
+        monkeypatch.setitem(sys.modules, name, object())
+    purge_modules("purged_pkg")
+    assert "purged_pkg" not in sys.modules
+    assert "purged_pkg.nodes" not in sys.modules
+    assert "purged_pkg_other" in sys.modules
+
+
+def test_handle(kedro_project, tmp_path):
+    project, sha = kedro_project
+    sys_path = list(sys.path)
+    response = handle(request(project, tmp_path / ".kedro-diff", sha))
+    assert response == {"key": "key", "pipelines": ["__default__"]}
+    assert sys.path == sys_path
+    snapshot = load_snapshot("key", tmp_path)
+    assert node_names(tmp_path) == ["split"]
+    assert snapshot["catalog"] == {
+        "cars": {"type": "pandas.CSVDataset", "filepath": "cars.csv"}
+    }
+    assert snapshot["parameters"]["values"] == {"ratio": {"ratio": 0.2}}
+
+
+def test_handle_reloads_the_project(kedro_project, tmp_path):
+    project, sha = kedro_project
+    handle(request(project, tmp_path / ".kedro-diff", sha))
+    registry = project / "src" / "diff_demo" / "pipeline_registry.py"
+    registry.write_text(registry.read_text().replace('name="split"', 'name="cut"'))
+    handle(request(project, tmp_path / ".kedro-diff", sha))
+    assert node_names(tmp_path) == ["cut"]
+
+
+def test_handle_objects_checkout(kedro_project, tmp_path):
+    project, sha = kedro_project
+    # the working tree is ignored, the package is imported from sha
+    registry = project / "src" / "diff_demo" / "pipeline_registry.py"
+    registry.write_text(registry.read_text().replace('name="split"', 'name="cut"'))
+    with archive_checkout(project, sha, paths=CONF_PATHS) as conf_only:
+        assert not (conf_only / "src").exists()
+        response = handle(
+            request(conf_only, tmp_path / ".kedro-diff", sha, repo_path=str(project))
+        )
+    assert response["pipelines"] == ["__default__"]
+    assert node_names(tmp_path) == ["split"]
+    assert load_snapshot("key", tmp_path)["nodes"][0]["func_hash"] is not None
+
+
+def fake_handle(request):
+    print(f"extracting {request['commit']}")
+    if request["commit"] == "broken":
+        raise KedroDiffError("no pipelines")
+    return {"key": request["key"], "pipelines": ["__default__"]}
+
+
+def test_serve(monkeypatch):
+    monkeypatch.setattr(worker, "handle", fake_handle)
+    requests = io.StringIO(
+        "\n".join(
+            [
+                json.dumps({"commit": "main", "key": "a"}),
+                "",
+                json.dumps({"commit": "broken", "key": "b"}),
+                json.dumps({"commit": "dev", "key": "c"}),
+            ]
+        )
+    )
+    responses = io.StringIO()
+    serve(requests, responses)
+    assert [json.loads(line) for line in responses.getvalue().splitlines()] == [
+        {"key": "a", "pipelines": ["__default__"], "log": "extracting main\n"},
+        {"error": "KedroDiffError: no pipelines", "log": "extracting broken\n"},
+        {"key": "c", "pipelines": ["__default__"], "log": "extracting dev\n"},
+    ]
+
+
+def test_serve_reports_bad_requests():
+    responses = io.StringIO()
+    serve(io.StringIO("not json\n"), responses)
+    assert json.loads(responses.getvalue())["error"].startswith("JSONDecodeError")
+
+
+@pytest.fixture
+def extraction_worker():
+    with ExtractionWorker() as extraction_worker:
+        yield extraction_worker
+
+
+def extract(extraction_worker, project, root_dir, sha, **kwargs):
+    return extraction_worker.extract(
+        project,
+        root_dir / ".kedro-diff",
+        "HEAD",
+        sha,
+        "key",
+        SnapshotOptions(),
+        **kwargs,
+    )
+
+
+def test_worker_extracts(kedro_project, tmp_path, extraction_worker):
+    project, sha = kedro_project
+    response = extract(extraction_worker, project, tmp_path, sha)
+    assert response["pipelines"] == ["__default__"]
+    assert node_names(tmp_path) == ["split"]
+    error = extract(extraction_worker, tmp_path / "missing", tmp_path, sha)
+    assert "pyproject.toml" in error["error"]
+
+
+def test_worker_objects_checkout(kedro_project, tmp_path, extraction_worker):
+    project, sha = kedro_project
+    registry = project / "src" / "diff_demo" / "pipeline_registry.py"
+    registry.write_text(registry.read_text().replace('name="split"', 'name="cut"'))
+    with archive_checkout(project, sha, paths=CONF_PATHS) as conf_only:
+        response = extract(
+            extraction_worker, conf_only, tmp_path, sha, repo_path=project
+        )
+    assert "error" not in response, response["log"]
+    assert node_names(tmp_path) == ["split"]
+
+
+def test_worker_restarts_after_a_crash(kedro_project, tmp_path, extraction_worker):
+    project, sha = kedro_project
+    extraction_worker.proc.kill()
+    extraction_worker.proc.wait()
+    # a crash between requests is invisible to the next request
+    assert "error" not in extract(extraction_worker, project, tmp_path, sha)
+
+
+@pytest.mark.parametrize(
+    "crash",
+    [
+        # reads the request and exits without answering
+        "import sys; sys.stdin.readline()",
+        # stops reading requests while it keeps running
+        "import os, time; os.close(0); print('closed', flush=True); time.sleep(60)",
+    ],
+)
+def test_worker_crash_fails_the_request(
+    kedro_project, tmp_path, extraction_worker, crash
+):
+    project, sha = kedro_project
+    extraction_worker.close()
+    extraction_worker.proc = worker.subprocess.Popen(
+        [sys.executable, "-c", crash],
+        stdin=worker.subprocess.PIPE,
+        stdout=worker.subprocess.PIPE,
+        universal_newlines=True,
+    )
+    if "closed" in crash:
+        assert extraction_worker.proc.stdout.readline() == "closed\n"
+    with pytest.raises(KedroDiffError, match="exited while extracting HEAD"):
+        extract(extraction_worker, project, tmp_path, sha)
+    assert extraction_worker.proc.poll() is not None
+    assert "error" not in extract(extraction_worker, project, tmp_path, sha)
+
+
+def test_worker_preload(kedro_project, tmp_path):
+    project, sha = kedro_project
+    with ExtractionWorker(preload=["diff_demo_missing"], verbose=2) as failed:
+        with pytest.raises(KedroDiffError):
+            extract(failed, project, tmp_path, sha)
+    with ExtractionWorker(preload=["json"], verbose=2) as preloaded:
+        assert "error" not in extract(preloaded, project, tmp_path, sha)